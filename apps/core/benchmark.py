@@ -0,0 +1,296 @@
+"""Latency and query-count benchmarks for every routed API endpoint.
+
+``run_benchmark`` walks ``ROOT_URLCONF``, fills path converters from the
+seeded dataset and requests each endpoint through the test client, as a
+trainer or, where only mentors may read, as a mentor. Each request runs in
+a transaction that is rolled back, so endpoints that write on read (lazy
+materialization) see the same rows every iteration. Write endpoints are
+listed as skipped: timing them would need bodies that stay valid across
+repeated runs.
+
+``compare`` checks a report against a baseline. Query counts are exact and
+portable, so any increase is a regression, as is a status that turns into
+an error. Latency gates on p50 only; p95 over a few dozen samples is one or
+two requests and mostly measures machine noise, so it is reported but not
+compared. Baselines are first scaled by the median p50 ratio of the whole
+run, so a slower machine or a noisy neighbour does not flag every endpoint;
+an endpoint regresses when it is more than ``threshold`` and more than
+``MIN_DELTA_MS`` above that expectation. A change that slows every endpoint
+alike is therefore not caught by latency, only by query counts.
+"""
+
+import datetime
+import gc
+import logging
+import math
+import platform
+import statistics
+import time
+
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from apps.core.metrics import QueryTimer
+from apps.feedback.models import Feedback, ReviewCycle
+from apps.rotation.models import ApprenticeRotation, Department, Rotation
+from apps.tasks.models import Task
+from apps.user.models import User
+
+MIN_DELTA_MS = 5.0
+# URL prefixes outside the API
+EXCLUDED_PREFIXES = ("admin/",)
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def iter_routes(resolver=None, prefix=""):
+    """Yield ``(route, callback)`` for every URL pattern, includes flattened."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern, route)
+        elif isinstance(pattern, URLPattern):
+            yield route, pattern.callback
+
+
+def allowed_methods(callback):
+    view_class = getattr(callback, "view_class", None)
+    if view_class is None:
+        return ["get"]
+    return [m for m in view_class.http_method_names if m != "options" and hasattr(view_class, m)]
+
+
+class Fixtures:
+    """Ids from the seeded dataset used to fill URLs, queries and bodies.
+
+    Everything hangs off the first feedback row, so the mentor requesting
+    the mentor-only endpoints owns the apprentice, project and task they
+    name. Rows are picked by primary key, which the seed fixes.
+    """
+
+    # feedback reads are mentor-only apart from the trainer rollups
+    MENTOR_PREFIX = "api/v1/feedback/"
+    TRAINER_FEEDBACK = ("api/v1/feedback/analytics/", "api/v1/feedback/sentiment/")
+
+    def __init__(self, today):
+        feedback = Feedback.objects.order_by("pk").first()
+        self.trainer = User.objects.filter(is_trainer=True).order_by("pk").first()
+        self.mentor = User.objects.get(pk=feedback.mentor_id)
+        self.feedback = feedback.pk
+        self.apprentice = feedback.apprentice_id
+        self.project = feedback.project_id
+        self.task = first_pk(Task.objects.filter(assigned_to_id=self.apprentice))
+        self.review_cycle = first_pk(ReviewCycle.objects.filter(mentor_id=self.mentor.pk))
+        self.department = first_pk(Department.objects.all())
+        self.rotation = first_pk(Rotation.objects.all())
+        self.assignment = first_pk(ApprenticeRotation.objects.all())
+        self.today = today
+
+    def user(self, route):
+        if route.startswith(self.MENTOR_PREFIX) and route not in self.TRAINER_FEEDBACK:
+            return self.mentor
+        return self.trainer
+
+    def path_args(self):
+        """URL kwargs for routes with converters; others need none."""
+        return {
+            "api/v1/tasks/<uuid:pk>": {"pk": self.task},
+            "api/v1/projects/<uuid:id>/": {"id": self.project},
+            "api/v1/projects/<uuid:id>/members/": {"id": self.project},
+            "api/v1/feedback/<uuid:feedback_id>/": {"feedback_id": self.feedback},
+            "api/v1/feedback/review-cycles/<uuid:cycle_id>/": {
+                "cycle_id": self.review_cycle
+            },
+            "api/v1/feedback/project/<uuid:project_id>/": {"project_id": self.project},
+            "api/v1/feedback/apprentice/<uuid:apprentice_id>/": {
+                "apprentice_id": self.apprentice
+            },
+            "api/v1/rotation/departments/<uuid:pk>/": {"pk": self.department},
+            "api/v1/rotation/<uuid:pk>/": {"pk": self.rotation},
+            "api/v1/rotation/assignments/<uuid:pk>/": {"pk": self.assignment},
+            "api/v1/rotation/history/<uuid:apprentice_id>/": {
+                "apprentice_id": self.apprentice
+            },
+        }
+
+    def queries(self):
+        return {
+            "api/v1/tasks/board/": {"project": self.project},
+            "api/v1/tasks/graph/": {"project": self.project},
+            "api/v1/rotation/occupancy/": {"start": self.today.isoformat()},
+            "api/v1/rotation/history/": {"project": self.project},
+            "swagger/": {"format": "openapi"},
+        }
+
+    def bodies(self):
+        """POST endpoints that only read: a forecast and a dry-run schedule."""
+        return {
+            "api/v1/rotation/forecast/": {
+                "start": self.today.isoformat(),
+                "days": 180,
+                "intakes": [10, 50],
+            },
+            "api/v1/rotation/schedule/": {
+                "apprentices": [str(self.apprentice)],
+                "dry_run": True,
+            },
+        }
+
+    def plan(self, route, method):
+        """``(path, query, body)`` to request, or why the endpoint is skipped."""
+        if method == "get":
+            body = None
+        elif route in self.bodies():
+            body = self.bodies()[route]
+        else:
+            return "writes"
+        kwargs = self.path_args().get(route)
+        if kwargs is None:
+            if "<int:" in route:
+                # every primary key is a UUID, so no row can match the route
+                return "unreachable: <int:> converter but UUID primary keys"
+            if "<" in route:
+                return "no fixture for path"
+            kwargs = {}
+        return fill_route(route, kwargs), self.queries().get(route, {}), body
+
+
+def first_pk(queryset):
+    return queryset.order_by("pk").values_list("pk", flat=True).first()
+
+
+def fill_route(route, kwargs):
+    """Turn ``api/v1/tasks/<uuid:pk>`` into a concrete path."""
+    path = route
+    for name, value in kwargs.items():
+        start = path.index("<")
+        end = path.index(">", start)
+        if not path[start + 1 : end].endswith(name):
+            raise ValueError(f"{route}: expected <{name}> next")
+        path = path[:start] + str(value) + path[end + 1 :]
+    return "/" + path
+
+
+def measure(client, method, path, query, body):
+    timer = QueryTimer()
+    start = time.perf_counter()
+    with transaction.atomic(), connection.execute_wrapper(timer):
+        if method == "get":
+            response = client.get(path, query)
+        else:
+            response = getattr(client, method)(path, body, format="json")
+        if response.streaming:
+            b"".join(response.streaming_content)
+        transaction.set_rollback(True)
+    return response.status_code, time.perf_counter() - start, timer.queries
+
+
+def run_benchmark(fixtures, iterations=20, warmup=3, only=()):
+    """Benchmark every routed endpoint; returns ``(results, skipped)``.
+
+    ``results`` maps ``"GET /route"`` to status, p50/p95 latency and the
+    largest query count seen; ``skipped`` maps the rest to a reason.
+    ``only`` limits the run to routes containing one of the given strings.
+    """
+    results, skipped = {}, {}
+    request_logger = logging.getLogger("django.request")
+    level = request_logger.level
+    request_logger.setLevel(logging.CRITICAL)
+    try:
+        _run(fixtures, iterations, warmup, only, results, skipped)
+    finally:
+        request_logger.setLevel(level)
+    return results, skipped
+
+
+def _run(fixtures, iterations, warmup, only, results, skipped):
+    for route, callback in iter_routes():
+        if route.startswith(EXCLUDED_PREFIXES):
+            continue
+        if only and not any(part in route for part in only):
+            continue
+        for method in allowed_methods(callback):
+            key = f"{method.upper()} /{route}"
+            plan = fixtures.plan(route, method)
+            if isinstance(plan, str):
+                skipped[key] = plan
+                continue
+            path, query, body = plan
+            # broken endpoints are reported by status instead of aborting the run
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(fixtures.user(route))
+            for _ in range(warmup):
+                measure(client, method, path, query, body)
+            statuses, seconds, queries = set(), [], []
+            # as timeit does: collector pauses would land in random samples
+            gc.collect()
+            gc.disable()
+            try:
+                for _ in range(iterations):
+                    code, elapsed, count = measure(client, method, path, query, body)
+                    statuses.add(code)
+                    seconds.append(elapsed)
+                    queries.append(count)
+            finally:
+                gc.enable()
+            results[key] = {
+                "status": max(statuses),
+                "p50_ms": round(percentile(seconds, 0.5) * 1000, 3),
+                "p95_ms": round(percentile(seconds, 0.95) * 1000, 3),
+                "queries": max(queries),
+            }
+
+
+def environment(seed, scale, iterations):
+    return {
+        "seed": seed,
+        "scale": scale,
+        "iterations": iterations,
+        "date": datetime.date.today().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "debug": settings.DEBUG,
+    }
+
+
+def compare(report, baseline, threshold=0.5):
+    """Regression messages for ``report`` against ``baseline``; empty if none."""
+    regressions = []
+    previous = baseline.get("endpoints", {})
+    speed = run_speed(report["endpoints"], previous)
+    for key, current in sorted(report["endpoints"].items()):
+        before = previous.get(key)
+        if before is None:
+            continue
+        if current["status"] != before["status"] and current["status"] >= 400:
+            regressions.append(f"{key}: status {before['status']} -> {current['status']}")
+        if current["queries"] > before["queries"]:
+            regressions.append(f"{key}: queries {before['queries']} -> {current['queries']}")
+        expected = before["p50_ms"] * speed
+        if (
+            current["p50_ms"] - expected > MIN_DELTA_MS
+            and current["p50_ms"] > expected * (1 + threshold)
+        ):
+            regressions.append(
+                f"{key}: p50_ms {before['p50_ms']:.1f} -> {current['p50_ms']:.1f}"
+            )
+    return regressions
+
+
+def run_speed(current, previous):
+    """Median p50 ratio over shared endpoints: how much slower the whole run is."""
+    ratios = [
+        current[key]["p50_ms"] / previous[key]["p50_ms"]
+        for key in current.keys() & previous.keys()
+        if previous[key]["p50_ms"] > 0
+    ]
+    return statistics.median(ratios) if ratios else 1.0
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from apps.core.benchmark import Fixtures, compare, environment, run_benchmark
+from apps.core.seeding import Seeder
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+# a private cache, so runs neither see nor disturb the configured one
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmark",
+    }
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database, measure p50/p95 latency and query "
+        "counts for every endpoint and compare them with a baseline report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--scale", type=float, default=1.0)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            help="Only routes containing this text; repeat for several.",
+        )
+        parser.add_argument("--output", default="benchmark-report.json")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.5,
+            help="Allowed relative latency growth before a run fails.",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write this run's report over the baseline instead of comparing.",
+        )
+
+    def handle(self, *args, **options):
+        report = self.measure(options)
+        output = Path(options["output"])
+        output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        self.stdout.write(f"Wrote {len(report['endpoints'])} endpoint results to {output}.")
+
+        baseline_path = Path(options["baseline"])
+        if options["update_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(output.read_text())
+            self.stdout.write(self.style.SUCCESS(f"Updated baseline {baseline_path}."))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f"No baseline at {baseline_path}."))
+            return
+        baseline = json.loads(baseline_path.read_text())
+        if (baseline["environment"]["seed"], baseline["environment"]["scale"]) != (
+            options["seed"],
+            options["scale"],
+        ):
+            raise CommandError("The baseline was recorded with another --seed or --scale.")
+        regressions = compare(report, baseline, options["threshold"])
+        for line in regressions:
+            self.stdout.write(self.style.ERROR(f"  {line}"))
+        if regressions:
+            raise CommandError(f"{len(regressions)} regressions against {baseline_path}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
+
+    def measure(self, options):
+        old_name = connection.settings_dict["NAME"]
+        # as in production: DEBUG cursors would add SQL logging to every query
+        setup_test_environment(debug=False)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES):
+                seeder = Seeder(seed=options["seed"], scale=options["scale"])
+                counts = seeder.run()
+                self.stdout.write(f"Seeded {sum(counts.values())} rows.")
+                results, skipped = run_benchmark(
+                    Fixtures(seeder.today),
+                    iterations=options["iterations"],
+                    warmup=options["warmup"],
+                    only=options["only"],
+                )
+                # read while the test environment's DEBUG is still in effect
+                env = environment(
+                    options["seed"], options["scale"], options["iterations"]
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        return {
+            "environment": env,
+            "endpoints": results,
+            "skipped": skipped,
+        }
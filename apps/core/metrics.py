@@ -0,0 +1,198 @@
+"""Per-endpoint request metrics in Prometheus text format.
+
+Each thread records into its own accumulator, so the request path takes no
+lock; the lock is only taken when a thread registers its accumulator and
+when ``/metrics`` merges them. Accumulators of exited threads are folded
+into one retired total at those points, so thread-per-connection servers do
+not grow the list without bound. Counters are per process: scrape every
+worker (or aggregate in Prometheus) under multi-process servers.
+
+``/metrics`` answers only clients in ``METRICS_ALLOWED_IPS`` and staff users.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class EndpointStats:
+    __slots__ = ("count", "buckets", "seconds", "queries", "query_seconds", "bytes")
+
+    def __init__(self):
+        self.count = 0
+        # one slot per bucket plus +Inf; cumulated only when exported
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.seconds = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.bytes = 0
+
+    def merge(self, other):
+        self.count += other.count
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.seconds += other.seconds
+        self.queries += other.queries
+        self.query_seconds += other.query_seconds
+        self.bytes += other.bytes
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # ``(thread, stats)`` of live threads; exited ones go to ``_retired``
+        self._accumulators = []
+        self._retired = defaultdict(EndpointStats)
+
+    def accumulator(self):
+        stats = getattr(self._local, "stats", None)
+        if stats is None:
+            stats = self._local.stats = defaultdict(EndpointStats)
+            with self._lock:
+                self._retire_exited()
+                self._accumulators.append((threading.current_thread(), stats))
+        return stats
+
+    def _retire_exited(self):
+        """Fold exited threads' counts into ``_retired``; hold the lock."""
+        live = []
+        for thread, stats in self._accumulators:
+            if thread.is_alive():
+                live.append((thread, stats))
+                continue
+            # an exited thread no longer writes, so no copy is needed
+            for key, value in stats.items():
+                self._retired[key].merge(value)
+        self._accumulators = live
+
+    def record(self, route, method, status, seconds, queries, query_seconds, size):
+        stats = self.accumulator()[(route, method, status)]
+        stats.count += 1
+        stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.seconds += seconds
+        stats.queries += queries
+        stats.query_seconds += query_seconds
+        stats.bytes += size
+
+    def snapshot(self):
+        merged = defaultdict(EndpointStats)
+        with self._lock:
+            self._retire_exited()
+            accumulators = [stats for _, stats in self._accumulators]
+            for key, value in self._retired.items():
+                merged[key].merge(value)
+        for stats in accumulators:
+            # copy first: the owning thread may add keys meanwhile
+            for key, value in list(stats.items()):
+                merged[key].merge(value)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._retired.clear()
+            for _, stats in self._accumulators:
+                stats.clear()
+
+    def render(self):
+        lines = []
+        snapshot = sorted(self.snapshot().items())
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("http_request_duration_seconds", "histogram", "Request latency by route.")
+        for (route, method, status), stats in snapshot:
+            labels = _labels(route, method, status)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.seconds:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        for name, attribute, help_text in (
+            ("http_request_db_queries_total", "queries", "Database queries run by requests."),
+            ("http_request_db_seconds_total", "query_seconds", "Time spent in database queries."),
+            ("http_response_bytes_total", "bytes", "Response body bytes (streaming bodies excluded)."),
+        ):
+            family(name, "counter", help_text)
+            for (route, method, status), stats in snapshot:
+                value = getattr(stats, attribute)
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(f"{name}{{{_labels(route, method, status)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(route, method, status):
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'route="{route}",method="{method}",status="{status}"'
+
+
+registry = MetricsRegistry()
+
+
+class QueryTimer:
+    """``connection.execute_wrapper`` hook counting queries and their time."""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - start
+
+
+class RequestMetricsMiddleware:
+    """Record latency, DB usage and response size per route and method.
+
+    Routes are the URL pattern (``api/v1/tasks/<uuid:pk>``), not the path,
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "<unmatched>"
+        size = 0 if response.streaming else len(response.content)
+        registry.record(
+            route,
+            request.method,
+            response.status_code,
+            elapsed,
+            timer.queries,
+            timer.seconds,
+            size,
+        )
+        return response
+
+
+def metrics_view(request):
+    allowed = request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS
+    if not (allowed or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
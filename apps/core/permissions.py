@@ -21,7 +21,7 @@ class IsMentorOrApprentice(BasePermission):
         return request.user and (request.user.is_mentor or request.user.is_apprentice)
 
     def has_object_permission(self, request, view, obj):
-        return (obj.mentor.user == request.user) or (obj.apprentice.user == request.user)
+        return request.user.pk in (obj.mentor_id, obj.apprentice_id)
 
 
 class IsTrainerOrAdmin(BasePermission):
@@ -0,0 +1,459 @@
+"""Deterministic synthetic data for benchmarks and profiling.
+
+Every id, name, date and choice comes from one ``random.Random(seed)``, so
+the same ``seed``, counts and ``today`` always produce the same rows.
+
+Volume tables (tasks and their status transitions, feedback, requests,
+rotation assignments, review entries, memberships) are generated lazily and
+inserted ``batch_size`` rows at a time, so memory stays flat and time grows linearly with the row count.
+Only people, projects and departments are kept in memory, people as small
+tuples, because the volume rows point at them. All users share one
+password hash, computed once.
+
+``bulk_create`` skips model signals; the rollups and caches those signals
+maintain are rebuilt at the end instead.
+"""
+
+import datetime
+import math
+import random
+import uuid
+from collections import Counter, namedtuple
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+
+from apps.feedback.models import Feedback, ReviewCycle, ReviewCycleEntry
+from apps.feedback.services import rebuild_buckets, score_pending_feedback
+from apps.projects.models import Project, ProjectMembership
+from apps.request.models import (
+    ApprenticeRemovalRequest,
+    MentorLeaveRequest,
+    ProjectJoinRequest,
+    ProjectLeaveRequest,
+    RotationChangeRequest,
+)
+from apps.rotation.models import ApprenticeRotation, Department, Rotation
+from apps.rotation.occupancy import invalidate_occupancy
+from apps.tasks.graph import invalidate_task_graphs
+from apps.tasks.models import Task, TaskStatusTransition
+from apps.tasks.services import rebuild_cycle_stats, rebuild_workloads
+from apps.user.models import Apprentice, Mentor, Trainer, User
+
+# rows at scale 1; every count grows linearly with ``scale``
+BASE_COUNTS = {
+    "trainers": 5,
+    "projects": 20,
+    "mentors": 40,
+    "apprentices": 200,
+    "departments": 6,
+    "tasks": 4000,
+    "feedback": 1500,
+    "requests": 400,
+}
+ROTATION_DAYS = 28
+# rotation slots before and after ``today``
+ROTATION_SLOTS = (6, 6)
+REQUEST_MODELS = (
+    ProjectJoinRequest,
+    ProjectLeaveRequest,
+    RotationChangeRequest,
+    MentorLeaveRequest,
+    ApprenticeRemovalRequest,
+)
+WORDS = (
+    "api review tests refactor docs deploy schema cache report dashboard "
+    "migration fix onboarding design sprint query index release"
+).split()
+FEEDBACK_PHRASES = (
+    "great progress on the task",
+    "clear and helpful communication",
+    "needs more attention to detail",
+    "missed the deadline again",
+    "solid work, well tested",
+    "struggled with the review comments",
+    "excellent ownership of the feature",
+    "slow to ask for help",
+)
+
+# what volume rows need to know about the mentor or apprentice they name
+Member = namedtuple("Member", "pk trainer_id mentor_id project_id")
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+class Seeder:
+    """Builds one deterministic dataset; ``run`` inserts it and returns row counts.
+
+    ``counts`` overrides single entries of ``BASE_COUNTS`` times ``scale``.
+    Without a ``password`` users get an unusable one.
+    """
+
+    def __init__(
+        self, seed=0, scale=1.0, counts=None, today=None, password=None, batch_size=1000
+    ):
+        self.rng = random.Random(seed)
+        self.today = today or datetime.date.today()
+        self.batch_size = batch_size
+        self.counts = {
+            name: max(1, math.ceil(count * scale)) for name, count in BASE_COUNTS.items()
+        }
+        self.counts.update(counts or {})
+        # rotation change requests need two departments to move between
+        self.counts["departments"] = max(2, self.counts["departments"])
+        self.password = make_password(password)
+        self.now = datetime.datetime.combine(
+            self.today, datetime.time(9), tzinfo=datetime.timezone.utc
+        )
+        self.inserted = Counter()
+        self.sequence = 0
+
+    def uuid(self):
+        # a counter in the top 48 bits keeps ids increasing, so primary key
+        # indexes are appended to instead of split at random pages
+        self.sequence += 1
+        return uuid.UUID(int=self.sequence << 80 | self.rng.getrandbits(80), version=4)
+
+    def words(self, count):
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def day(self, low, high):
+        return self.today + datetime.timedelta(days=self.rng.randint(low, high))
+
+    def insert(self, model, rows):
+        """Insert ``rows``, any iterable, ``batch_size`` at a time."""
+        for chunk in chunked(rows, self.batch_size):
+            model.objects.bulk_create(chunk)
+            self.inserted[model._meta.label] += len(chunk)
+
+    def run(self):
+        self.create_trainers()
+        self.create_projects()
+        self.create_mentors()
+        self.create_apprentices()
+        self.insert(ProjectMembership, self.memberships())
+        self.create_rotations()
+        self.insert(Task, self.tasks())
+        self.insert(TaskStatusTransition, self.status_transitions())
+        self.insert(Feedback, self.feedback())
+        self.create_review_cycles()
+        self.create_requests()
+        self.rebuild()
+        return dict(self.inserted)
+
+    # ─── people and projects ──────────────────────────
+
+    def user(self, role, index, **flags):
+        return User(
+            id=self.uuid(),
+            email=f"{role}-{index}@seed.example.com",
+            first_name=role.title(),
+            last_name=str(index),
+            password=self.password,
+            **flags,
+        )
+
+    def create_trainers(self):
+        users = [
+            self.user("trainer", i, is_trainer=True) for i in range(self.counts["trainers"])
+        ]
+        self.insert(User, users)
+        self.insert(Trainer, (Trainer(user_id=user.pk) for user in users))
+        self.trainers = [user.pk for user in users]
+
+    def create_projects(self):
+        self.projects = [
+            Project(
+                id=self.uuid(),
+                name=f"Project {i} {self.words(2)}",
+                description=self.words(12),
+                start_date=self.day(-365, -30),
+                trainer_id=self.trainers[i % len(self.trainers)],
+                status=self.rng.choice(["at_halt", "in_progress", "completed"]),
+            )
+            for i in range(self.counts["projects"])
+        ]
+        self.insert(Project, self.projects)
+
+    def create_mentors(self):
+        # round-robin over projects, so every project with apprentices also
+        # has a mentor working for the project's trainer
+        self.mentors = []
+        for chunk in chunked(range(self.counts["mentors"]), self.batch_size):
+            users, mentors = [], []
+            for i in chunk:
+                project = self.projects[i % len(self.projects)]
+                user = self.user("mentor", i, is_mentor=True)
+                users.append(user)
+                mentors.append(
+                    Mentor(user_id=user.pk, trainer_id=project.trainer_id, project_id=project.pk)
+                )
+                self.mentors.append(Member(user.pk, project.trainer_id, None, project.pk))
+            self.insert(User, users)
+            self.insert(Mentor, mentors)
+
+    def create_apprentices(self):
+        self.apprentices = []
+        for chunk in chunked(range(self.counts["apprentices"]), self.batch_size):
+            users, apprentices = [], []
+            for i in chunk:
+                mentor = self.mentors[i % len(self.mentors)]
+                user = self.user("apprentice", i, is_apprentice=True)
+                users.append(user)
+                apprentices.append(
+                    Apprentice(
+                        user_id=user.pk,
+                        trainer_id=mentor.trainer_id,
+                        mentor_id=mentor.pk,
+                        project_id=mentor.project_id,
+                    )
+                )
+                self.apprentices.append(
+                    Member(user.pk, mentor.trainer_id, mentor.pk, mentor.project_id)
+                )
+            self.insert(User, users)
+            self.insert(Apprentice, apprentices)
+
+    def memberships(self):
+        """The open project interval the post_save signal would have opened."""
+        for role, members in (("mentor", self.mentors), ("apprentice", self.apprentices)):
+            for member in members:
+                yield ProjectMembership(
+                    id=self.uuid(),
+                    project_id=member.project_id,
+                    member_id=member.pk,
+                    role=role,
+                    started_at=self.now - datetime.timedelta(days=self.rng.randint(1, 365)),
+                )
+
+    # ─── rotations ────────────────────────────────────
+
+    def create_rotations(self):
+        count = self.counts["departments"]
+        per_department = math.ceil(len(self.apprentices) / count)
+        self.departments = [
+            Department(id=self.uuid(), name=f"Department {i}", capacity=per_department + 2)
+            for i in range(count)
+        ]
+        self.insert(Department, self.departments)
+        before, after = ROTATION_SLOTS
+        first = self.today - datetime.timedelta(days=before * ROTATION_DAYS)
+        # slots[s][d]: the rotation department d runs in time slot s
+        slots = [
+            [
+                Rotation(
+                    id=self.uuid(),
+                    name=f"{department.name} slot {slot}",
+                    duration=ROTATION_DAYS,
+                    department=department,
+                    start_date=first + datetime.timedelta(days=slot * ROTATION_DAYS),
+                    end_date=first
+                    + datetime.timedelta(days=(slot + 1) * ROTATION_DAYS - 1),
+                )
+                for department in self.departments
+            ]
+            for slot in range(before + after)
+        ]
+        self.insert(Rotation, (rotation for row in slots for rotation in row))
+        self.insert(ApprenticeRotation, self.assignments(slots))
+
+    def assignments(self, slots):
+        # each apprentice starts in its own department and moves one on per
+        # slot, which keeps every department within its capacity; slot
+        # ``ROTATION_SLOTS[0]`` is the one running today
+        for i, apprentice in enumerate(self.apprentices):
+            for slot, row in enumerate(slots):
+                rotation = row[(i + slot) % len(row)]
+                yield ApprenticeRotation(
+                    id=self.uuid(),
+                    rotation_id=rotation.pk,
+                    apprentice_id=apprentice.pk,
+                    status=rotation.status_on(self.today),
+                )
+
+    # ─── tasks and feedback ───────────────────────────
+
+    def tasks(self):
+        for i in range(self.counts["tasks"]):
+            apprentice = self.rng.choice(self.apprentices)
+            status = self.rng.choices(
+                ["pending", "in_progress", "completed"], weights=[4, 3, 5]
+            )[0]
+            task = Task(
+                id=self.uuid(),
+                title=f"Task {i}: {self.words(3)}",
+                description=self.words(10),
+                assigned_by_id=apprentice.mentor_id,
+                assigned_to_id=apprentice.pk,
+                project_id=apprentice.project_id,
+                due_date=self.day(-60, 90),
+                status=status,
+                completed_at=self.day(-30, 0) if status == "completed" else None,
+            )
+            task.sync_derived_fields(self.today)
+            yield task
+
+    def status_transitions(self):
+        """Created, started and completed events as far as each task's status goes.
+
+        Tasks are read back in id order rather than kept in memory from ``tasks``.
+        """
+        rows = Task.objects.order_by("id").values_list("id", "status", "completed_at")
+        for task_id, status, completed_on in rows.iterator(chunk_size=self.batch_size):
+            end = self.now - datetime.timedelta(
+                days=(self.today - (completed_on or self.today)).days
+            )
+            created = end - datetime.timedelta(hours=self.rng.randint(24, 30 * 24))
+            started = created + (end - created) * self.rng.uniform(0.2, 0.8)
+            moments = (created, started, end)
+            steps = ["pending", "in_progress", "completed"]
+            previous = ""
+            for to_status, moment in zip(steps[: steps.index(status) + 1], moments):
+                yield TaskStatusTransition(
+                    task_id=task_id,
+                    from_status=previous,
+                    to_status=to_status,
+                    changed_at=moment,
+                )
+                previous = to_status
+
+    def feedback(self):
+        for _ in range(self.counts["feedback"]):
+            apprentice = self.rng.choice(self.apprentices)
+            yield Feedback(
+                id=self.uuid(),
+                description=", ".join(self.rng.sample(FEEDBACK_PHRASES, 2)),
+                mentor_id=apprentice.mentor_id,
+                apprentice_id=apprentice.pk,
+                project_id=apprentice.project_id,
+                satisfied=self.rng.random() < 0.7,
+            )
+
+    def create_review_cycles(self):
+        """One draft cycle per mentor with an entry for each of its apprentices."""
+        period_end = self.today - datetime.timedelta(days=self.today.day)
+        cycles = {mentor.pk: self.uuid() for mentor in self.mentors}
+        self.insert(
+            ReviewCycle,
+            (
+                ReviewCycle(
+                    id=cycle_id,
+                    mentor_id=mentor_id,
+                    name=f"Review {period_end:%Y-%m}",
+                    period_start=period_end.replace(day=1),
+                    period_end=period_end,
+                )
+                for mentor_id, cycle_id in cycles.items()
+            ),
+        )
+        self.insert(
+            ReviewCycleEntry,
+            (
+                ReviewCycleEntry(
+                    id=self.uuid(),
+                    cycle_id=cycles[apprentice.mentor_id],
+                    apprentice_id=apprentice.pk,
+                    project_id=apprentice.project_id,
+                    description=", ".join(self.rng.sample(FEEDBACK_PHRASES, 2)),
+                    satisfied=self.rng.random() < 0.7,
+                )
+                for apprentice in self.apprentices
+            ),
+        )
+
+    # ─── requests ─────────────────────────────────────
+
+    def create_requests(self):
+        """An even split over the five request types, a third of them reviewed."""
+        per_type, extra = divmod(self.counts["requests"], len(REQUEST_MODELS))
+        for index, model in enumerate(REQUEST_MODELS):
+            self.insert(model, self.requests(model, per_type + (index < extra)))
+
+    def requests(self, model, count):
+        build = {
+            ProjectJoinRequest: self.project_join,
+            ProjectLeaveRequest: self.project_leave,
+            RotationChangeRequest: self.rotation_change,
+            MentorLeaveRequest: self.mentor_leave,
+            ApprenticeRemovalRequest: self.apprentice_removal,
+        }[model]
+        # join requests are unique per (apprentice, project, status)
+        joins = set()
+        for _ in range(count):
+            row = build()
+            row.id = self.uuid()
+            row.reason = self.words(6)
+            if self.rng.random() < 1 / 3:
+                row.status = self.rng.choice(["approved", "rejected"])
+                row.reviewed_by_id = self.rng.choice(self.trainers)
+                row.admin_notes = self.words(4)
+            if model is ProjectJoinRequest:
+                key = (row.apprentice_id, row.project_id, row.status)
+                if key in joins:
+                    continue
+                joins.add(key)
+            yield row
+
+    def project_join(self):
+        apprentice = self.rng.choice(self.apprentices)
+        index = self.rng.randrange(len(self.projects))
+        if self.projects[index].pk == apprentice.project_id:
+            # the next project instead, so the number of draws stays fixed
+            index = (index + 1) % len(self.projects)
+        return ProjectJoinRequest(
+            requester_id=apprentice.pk,
+            apprentice_id=apprentice.pk,
+            project_id=self.projects[index].pk,
+        )
+
+    def project_leave(self):
+        apprentice = self.rng.choice(self.apprentices)
+        return ProjectLeaveRequest(
+            requester_id=apprentice.pk,
+            apprentice_id=apprentice.pk,
+            project_id=apprentice.project_id,
+        )
+
+    def rotation_change(self):
+        # from the department the apprentice is in today, as validation requires
+        index = self.rng.randrange(len(self.apprentices))
+        apprentice = self.apprentices[index]
+        position = index + ROTATION_SLOTS[0]
+        offset = self.rng.randrange(1, len(self.departments))
+        current = self.departments[position % len(self.departments)]
+        requested = self.departments[(position + offset) % len(self.departments)]
+        return RotationChangeRequest(
+            requester_id=apprentice.pk,
+            apprentice_id=apprentice.pk,
+            current_department_id=current.pk,
+            requested_department_id=requested.pk,
+        )
+
+    def mentor_leave(self):
+        mentor = self.rng.choice(self.mentors)
+        return MentorLeaveRequest(
+            requester_id=mentor.pk, mentor_id=mentor.pk, project_id=mentor.project_id
+        )
+
+    def apprentice_removal(self):
+        apprentice = self.rng.choice(self.apprentices)
+        return ApprenticeRemovalRequest(
+            requester_id=apprentice.mentor_id,
+            mentor_id=apprentice.mentor_id,
+            apprentice_id=apprentice.pk,
+            project_id=apprentice.project_id,
+        )
+
+    # ─── derived state ────────────────────────────────
+
+    def rebuild(self):
+        rebuild_workloads(batch_size=self.batch_size)
+        rebuild_cycle_stats(batch_size=self.batch_size)
+        rebuild_buckets(batch_size=self.batch_size)
+        score_pending_feedback(batch_size=self.batch_size)
+        invalidate_task_graphs(project.pk for project in self.projects)
+        invalidate_occupancy()
@@ -0,0 +1,125 @@
+"""Test helpers that keep N+1 queries from shipping.
+
+``constant_queries`` runs a test body against seeded data at two sizes and
+fails when the number of queries grows with the number of rows::
+
+    @constant_queries(seed="create_feedback")
+    def test_list_is_constant(self):
+        self.client.get("/api/v1/feedback/")
+
+The failure names the SQL fingerprint whose count grew and the project
+call stack that ran it, which is usually the serializer field to fix.
+"""
+
+import functools
+import re
+import traceback
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+_PATTERNS = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\b[0-9a-f]{32}\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint(sql):
+    """SQL with literals and IN lists folded, so repeated lookups compare equal."""
+    for pattern, replacement in _PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+class QueryRecorder:
+    """``execute_wrapper`` hook keeping each query's fingerprint and caller."""
+
+    def __init__(self):
+        self.fingerprints = Counter()
+        self.stacks = {}
+        self._root = str(Path(settings.BASE_DIR))
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        self.fingerprints[key] += 1
+        if key not in self.stacks:
+            self.stacks[key] = self._project_stack()
+        return execute(sql, params, many, context)
+
+    def _project_stack(self):
+        frames = [
+            frame
+            for frame in traceback.extract_stack()[:-2]
+            if frame.filename.startswith(self._root)
+            and "site-packages" not in frame.filename
+            and not frame.filename.endswith(
+                ("manage.py", "testing.py", "tests.py", "metrics.py")
+            )
+        ]
+        return "".join(traceback.format_list(frames[-6:]))
+
+    @property
+    def count(self):
+        return sum(self.fingerprints.values())
+
+
+def record_queries(func, *args, **kwargs):
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        func(*args, **kwargs)
+    return recorder
+
+
+def query_growth_report(small, large, sizes):
+    """Explain why ``large`` ran more queries than ``small``, or ``None``."""
+    if large.count <= small.count:
+        return None
+    lines = [
+        f"Query count grew with rows: {small.count} queries at size {sizes[0]}, "
+        f"{large.count} at size {sizes[1]}."
+    ]
+    grown = sorted(
+        (
+            (large.fingerprints[key] - small.fingerprints[key], key)
+            for key in large.fingerprints
+            if large.fingerprints[key] > small.fingerprints[key]
+        ),
+        reverse=True,
+    )
+    for extra, key in grown:
+        lines.append(
+            f"\n+{extra} x {key}\n(ran {small.fingerprints[key]} then "
+            f"{large.fingerprints[key]} times; first called from)\n{large.stacks[key]}"
+        )
+    return "\n".join(lines)
+
+
+def constant_queries(seed, sizes=(1, 5)):
+    """Fail the decorated test if its queries grow between two seed sizes.
+
+    ``seed`` names a test-case method taking a row count; it is called so
+    that ``sizes[0]`` and then ``sizes[1]`` rows exist when the test body
+    runs. The body runs once per size and must be safe to repeat.
+    """
+
+    def decorator(test):
+        @functools.wraps(test)
+        def wrapper(self, *args, **kwargs):
+            create = getattr(self, seed)
+            create(sizes[0])
+            small = record_queries(test, self, *args, **kwargs)
+            create(sizes[1] - sizes[0])
+            large = record_queries(test, self, *args, **kwargs)
+            report = query_growth_report(small, large, sizes)
+            if report:
+                self.fail(report)
+
+        return wrapper
+
+    return decorator
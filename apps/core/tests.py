@@ -0,0 +1,267 @@
+import datetime
+import threading
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F, OuterRef, Sum
+from django.db import transaction
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core.benchmark import Fixtures, compare, fill_route, percentile, run_benchmark
+from apps.core.metrics import registry
+from apps.core.seeding import Seeder
+from apps.core.testing import constant_queries, fingerprint
+from apps.feedback.models import Feedback
+from apps.request.models import (
+    ApprenticeRemovalRequest,
+    MentorLeaveRequest,
+    ProjectJoinRequest,
+    ProjectLeaveRequest,
+    RotationChangeRequest,
+)
+from apps.rotation.models import ApprenticeRotation
+from apps.tasks.models import ApprenticeWorkload, Task, TaskCycleStats
+from apps.user.models import User
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.trainer = User.objects.create_user(
+            email="trainer@example.com", first_name="T", last_name="User", is_trainer=True
+        )
+
+    def test_requests_are_recorded_per_route(self):
+        self.client.force_authenticate(self.trainer)
+        for _ in range(2):
+            self.client.get("/api/v1/rotation/departments/")
+        self.client.get("/no/such/path/")
+
+        body = self.client.get("/metrics").content.decode()
+        labels = 'route="api/v1/rotation/departments/",method="GET",status="200"'
+        self.assertIn(f"http_request_duration_seconds_count{{{labels}}} 2", body)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', body)
+        self.assertIn(f"http_request_db_queries_total{{{labels}}} 2", body)
+        self.assertIn('route="<unmatched>",method="GET",status="404"', body)
+        self.assertRegex(body, r"http_response_bytes_total\{" + labels + r"\} [1-9]")
+
+    def test_metrics_are_limited_to_allowed_ips_and_staff(self):
+        response = self.client.get("/metrics", REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 403)
+
+        staff = User.objects.create_user(
+            email="staff@example.com", first_name="S", last_name="User", is_staff=True
+        )
+        self.client.force_login(staff)
+        response = self.client.get("/metrics", REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, 200)
+
+    def test_exited_threads_are_folded_into_one_total(self):
+        def serve():
+            registry.record("api/v1/x/", "GET", 200, 0.01, 1, 0.001, 10)
+
+        threads = [threading.Thread(target=serve) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        stats = registry.snapshot()[("api/v1/x/", "GET", 200)]
+        self.assertEqual(stats.count, 20)
+        self.assertFalse(any(thread in threads for thread, _ in registry._accumulators))
+
+
+class ConstantQueriesTests(TestCase):
+    def create_users(self, count):
+        for _ in range(count):
+            User.objects.create_user(
+                email=f"user-{User.objects.count()}@example.com",
+                first_name="U",
+                last_name="User",
+            )
+
+    def test_fingerprint_folds_literals(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s) AND "n" = 3'),
+            'SELECT * FROM "t" WHERE "id" IN (...) AND "n" = ?',
+        )
+
+    def test_reports_the_repeated_query(self):
+        def touch_each_user(self):
+            for user in User.objects.all():
+                User.objects.filter(pk=user.pk).exists()
+
+        test = constant_queries(seed="create_users")(touch_each_user)
+        with self.assertRaises(AssertionError) as failure:
+            test(self)
+        report = str(failure.exception)
+        self.assertIn("2 queries at size 1, 6 at size 5", report)
+        self.assertIn('+4 x SELECT ? AS "a" FROM "user_user"', report)
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_percentile_and_routes(self):
+        samples = [5, 1, 4, 2, 3, 6, 7, 8, 9, 10]
+        self.assertEqual(percentile(samples, 0.5), 5)
+        self.assertEqual(percentile(samples, 0.95), 10)
+        self.assertEqual(
+            fill_route("api/v1/tasks/<uuid:pk>", {"pk": "abc"}), "/api/v1/tasks/abc"
+        )
+
+    def test_compare_flags_queries_errors_and_slowdowns(self):
+        baseline = {
+            "endpoints": {
+                "GET /a/": {"status": 200, "p50_ms": 10.0, "p95_ms": 12.0, "queries": 2},
+                "GET /b/": {"status": 200, "p50_ms": 10.0, "p95_ms": 12.0, "queries": 2},
+            }
+        }
+        report = {
+            "endpoints": {
+                "GET /a/": {"status": 500, "p50_ms": 30.0, "p95_ms": 90.0, "queries": 3},
+                "GET /b/": {"status": 200, "p50_ms": 1.0, "p95_ms": 2.0, "queries": 1},
+                "GET /new/": {"status": 200, "p50_ms": 1.0, "p95_ms": 2.0, "queries": 9},
+            }
+        }
+        self.assertEqual(
+            compare(report, baseline, threshold=0.5),
+            [
+                "GET /a/: status 200 -> 500",
+                "GET /a/: queries 2 -> 3",
+                "GET /a/: p50_ms 10.0 -> 30.0",
+            ],
+        )
+
+    def test_compare_scales_latency_by_run_speed(self):
+        baseline = {
+            "endpoints": {
+                f"GET /{name}/": {"status": 200, "p50_ms": 10.0, "p95_ms": 12.0, "queries": 2}
+                for name in "abc"
+            }
+        }
+        # a machine twice as slow: only the endpoint slower than that regresses
+        report = {
+            "endpoints": {
+                key: dict(row, p50_ms=20.0) for key, row in baseline["endpoints"].items()
+            }
+        }
+        report["endpoints"]["GET /c/"]["p50_ms"] = 40.0
+        self.assertEqual(
+            compare(report, baseline, threshold=0.5), ["GET /c/: p50_ms 10.0 -> 40.0"]
+        )
+
+    def test_seeded_run_is_deterministic(self):
+        today = datetime.date(2026, 3, 10)
+
+        def seed():
+            with transaction.atomic():
+                seeder = Seeder(seed=7, scale=0.05, today=today)
+                seeder.run()
+                rows = list(Task.objects.order_by("pk").values_list("pk", "status", "due_date"))
+                transaction.set_rollback(True)
+            return rows
+
+        first = seed()
+        self.assertEqual(len(first), 200)
+        self.assertEqual(seed(), first)
+
+    def test_run_benchmark_over_seeded_data(self):
+        seeder = Seeder(seed=7, scale=0.05)
+        seeder.run()
+        results, skipped = run_benchmark(
+            Fixtures(seeder.today), iterations=2, warmup=0, only=["rotation/departments"]
+        )
+        self.assertEqual(
+            sorted(results),
+            [
+                "GET /api/v1/rotation/departments/",
+                "GET /api/v1/rotation/departments/<uuid:pk>/",
+            ],
+        )
+        self.assertEqual(results["GET /api/v1/rotation/departments/"]["status"], 200)
+        self.assertEqual(results["GET /api/v1/rotation/departments/"]["queries"], 1)
+        self.assertEqual(skipped["POST /api/v1/rotation/departments/"], "writes")
+
+    def test_int_id_routes_are_skipped_with_reason(self):
+        seeder = Seeder(seed=7, scale=0.05)
+        seeder.run()
+        _, skipped = run_benchmark(
+            Fixtures(seeder.today), iterations=1, warmup=0, only=["user/mentors"]
+        )
+        self.assertIn("UUID primary keys", skipped["GET /api/v1/user/mentors/<int:id>/"])
+
+
+class SeedScaleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def seed(self, *args):
+        out = StringIO()
+        call_command("seed_scale", "--scale=0.05", "--date=2026-03-10", *args, stdout=out)
+        return out.getvalue()
+
+    def test_seeds_consistent_rows_of_every_kind(self):
+        output = self.seed("--count=tasks=300", "--count=requests=50", "--batch-size=64")
+        self.assertIn("tasks.Task: 300", output)
+
+        # tasks and feedback stay within the apprentice's mentor and project
+        for model, mentor in ((Task, "assigned_by"), (Feedback, "mentor")):
+            apprentice = "assigned_to" if model is Task else "apprentice"
+            self.assertFalse(
+                model.objects.exclude(**{mentor: F(f"{apprentice}__mentor")}).exists()
+            )
+            self.assertFalse(
+                model.objects.exclude(project=F(f"{apprentice}__project")).exists()
+            )
+        self.assertFalse(User.objects.filter(is_apprentice=True, apprentice_profile=None).exists())
+        for model in (
+            ProjectLeaveRequest,
+            RotationChangeRequest,
+            MentorLeaveRequest,
+            ApprenticeRemovalRequest,
+        ):
+            self.assertEqual(model.objects.count(), 10)
+        # every rotation change starts from the apprentice's department today
+        today = datetime.date(2026, 3, 10)
+        self.assertFalse(
+            RotationChangeRequest.objects.exclude(
+                current_department__in=ApprenticeRotation.objects.filter(
+                    apprentice=OuterRef("apprentice"),
+                    rotation__start_date__lte=today,
+                    rotation__end_date__gte=today,
+                ).values("rotation__department")
+            ).exists()
+        )
+        # repeats of a unique (apprentice, project, status) join are dropped
+        self.assertTrue(0 < ProjectJoinRequest.objects.count() <= 10)
+        self.assertEqual(
+            ApprenticeWorkload.objects.filter(open_count__gt=0).count(),
+            Task.objects.exclude(status="completed")
+            .values("assigned_to", "project")
+            .distinct()
+            .count(),
+        )
+        # cycle-time totals come from the seeded transition log
+        completed = Task.objects.filter(status="completed").count()
+        self.assertEqual(
+            TaskCycleStats.objects.aggregate(
+                completed=Sum("completed_count"), started=Sum("cycle_count")
+            ),
+            {"completed": completed, "started": completed},
+        )
+        # no department hosts more apprentices than its capacity at once
+        busiest = (
+            ApprenticeRotation.objects.values("rotation", "rotation__department__capacity")
+            .annotate(size=Count("id"))
+            .order_by("-size")
+            .first()
+        )
+        self.assertLessEqual(busiest["size"], busiest["rotation__department__capacity"])
+
+    def test_refuses_to_seed_twice(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
@@ -1,6 +1,14 @@
 # feedback/serializers.py
+from django.db import transaction
 from rest_framework import serializers
-from apps.feedback.models import Feedback
+from apps.feedback.models import (
+    Feedback,
+    FeedbackSentiment,
+    ReviewCycle,
+    ReviewCycleEntry,
+)
+from apps.feedback.services import save_review_entries, submit_review_cycle
+from apps.user.models import Apprentice
 # from apps.user.api.v1.serializers import MentorReadSerializer, ApprenticeReadSerializer
 # from apps.projects.api.v1.serializers import ProjectReadSerializer
 
@@ -26,3 +34,190 @@ class FeedbackWriteSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['mentor'] = self.context['request'].user.mentor_profile
         return Feedback.objects.create(**validated_data)
+
+
+class FeedbackAnalyticsQuerySerializer(serializers.Serializer):
+    GROUP_BY_CHOICES = [
+        ("apprentice", "Apprentice"),
+        ("mentor", "Mentor"),
+        ("project", "Project"),
+        ("trainer", "Trainer"),
+    ]
+    PERIOD_CHOICES = [("week", "Week"), ("month", "Month")]
+
+    group_by = serializers.ChoiceField(choices=GROUP_BY_CHOICES, default="apprentice")
+    period = serializers.ChoiceField(choices=PERIOD_CHOICES, default="week")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    apprentice = serializers.UUIDField(required=False)
+    mentor = serializers.UUIDField(required=False)
+    project = serializers.UUIDField(required=False)
+    trainer = serializers.UUIDField(required=False)
+
+    def filter(self, queryset):
+        for field in ("apprentice", "mentor", "project", "trainer"):
+            if field in self.validated_data:
+                queryset = queryset.filter(**{f"{field}_id": self.validated_data[field]})
+        return queryset
+
+
+class FeedbackAnalyticsSerializer(serializers.Serializer):
+    key = serializers.CharField(allow_null=True)
+    period = serializers.DateField()
+    total = serializers.IntegerField()
+    satisfied = serializers.IntegerField()
+    satisfaction_rate = serializers.FloatField()
+
+
+class FeedbackSentimentQuerySerializer(serializers.Serializer):
+    max_score = serializers.FloatField(default=-0.2, min_value=-1, max_value=1)
+    apprentice = serializers.UUIDField(required=False)
+    mentor = serializers.UUIDField(required=False)
+    project = serializers.UUIDField(required=False)
+    satisfied = serializers.BooleanField(required=False, default=None, allow_null=True)
+
+    def filter(self, queryset):
+        queryset = queryset.filter(score__lte=self.validated_data["max_score"])
+        for field in ("apprentice", "mentor", "project"):
+            if field in self.validated_data:
+                queryset = queryset.filter(
+                    **{f"feedback__{field}_id": self.validated_data[field]}
+                )
+        if self.validated_data["satisfied"] is not None:
+            queryset = queryset.filter(feedback__satisfied=self.validated_data["satisfied"])
+        return queryset
+
+
+class FeedbackSentimentSerializer(serializers.ModelSerializer):
+    feedback = FeedbackReadSerializer(read_only=True)
+
+    class Meta:
+        model = FeedbackSentiment
+        fields = [
+            "feedback",
+            "score",
+            "positive_terms",
+            "negative_terms",
+            "top_terms",
+            "scored_at",
+        ]
+
+
+class ReviewCycleEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ReviewCycleEntry
+        fields = ["apprentice", "project", "description", "satisfied", "feedback", "updated_at"]
+
+
+class ReviewCycleReadSerializer(serializers.ModelSerializer):
+    entries = ReviewCycleEntrySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ReviewCycle
+        fields = [
+            "id",
+            "mentor",
+            "name",
+            "period_start",
+            "period_end",
+            "status",
+            "created_at",
+            "updated_at",
+            "submitted_at",
+            "entries",
+        ]
+
+
+class ReviewEntryWriteSerializer(serializers.Serializer):
+    """Plain ids: the whole batch is checked against the roster in validate()."""
+
+    apprentice = serializers.UUIDField()
+    project = serializers.UUIDField()
+    description = serializers.CharField(allow_blank=True, default="")
+    satisfied = serializers.BooleanField(default=True)
+
+
+class ReviewCycleWriteSerializer(serializers.ModelSerializer):
+    """Create or extend a draft cycle; ``submit`` turns it into Feedback."""
+
+    entries = ReviewEntryWriteSerializer(many=True, required=False)
+    submit = serializers.BooleanField(default=False, write_only=True)
+
+    class Meta:
+        model = ReviewCycle
+        fields = ["name", "period_start", "period_end", "entries", "submit"]
+
+    def validate(self, data):
+        if self.instance is not None and self.instance.status != "draft":
+            raise serializers.ValidationError("Submitted review cycles are read-only.")
+        start = data.get("period_start", getattr(self.instance, "period_start", None))
+        end = data.get("period_end", getattr(self.instance, "period_end", None))
+        if start and end and end < start:
+            raise serializers.ValidationError(
+                {"period_end": "The period must not end before it starts."}
+            )
+
+        entries = data.get("entries", [])
+        pairs = [(entry["apprentice"], entry["project"]) for entry in entries]
+        if len(pairs) != len(set(pairs)):
+            raise serializers.ValidationError(
+                {"entries": "Each apprentice and project may appear only once."}
+            )
+        mentor = self.context["request"].user.mentor_profile
+        roster = set(
+            Apprentice.objects.filter(
+                mentor=mentor, user_id__in={apprentice for apprentice, _ in pairs}
+            ).values_list("user_id", "project_id")
+        )
+        invalid = [pair for pair in pairs if pair not in roster]
+        if invalid:
+            raise serializers.ValidationError(
+                {
+                    "entries": [
+                        f"Apprentice {apprentice} is not on your roster for project {project}."
+                        for apprentice, project in invalid
+                    ]
+                }
+            )
+        if data.get("submit"):
+            descriptions = {}
+            if self.instance is not None:
+                descriptions = {
+                    (apprentice, project): description
+                    for apprentice, project, description in self.instance.entries.values_list(
+                        "apprentice_id", "project_id", "description"
+                    )
+                }
+            for entry in entries:
+                key = (entry["apprentice"], entry["project"])
+                descriptions[key] = entry.get("description", descriptions.get(key, ""))
+            if not descriptions or not all(descriptions.values()):
+                raise serializers.ValidationError(
+                    {"submit": "Every entry needs a description before submitting."}
+                )
+        data["mentor"] = mentor
+        return data
+
+    def save_cycle(self, cycle, validated_data):
+        save_review_entries(cycle, validated_data.get("entries", []))
+        if validated_data.get("submit"):
+            submit_review_cycle(cycle)
+        return cycle
+
+    @transaction.atomic
+    def create(self, validated_data):
+        cycle = ReviewCycle.objects.create(
+            mentor=validated_data["mentor"],
+            name=validated_data["name"],
+            period_start=validated_data["period_start"],
+            period_end=validated_data["period_end"],
+        )
+        return self.save_cycle(cycle, validated_data)
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        for field in ("name", "period_start", "period_end"):
+            if field in validated_data:
+                setattr(instance, field, validated_data[field])
+        instance.save()
+        return self.save_cycle(instance, validated_data)
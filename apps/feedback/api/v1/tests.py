@@ -1,3 +1,282 @@
+import datetime
+import io
+
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.testing import constant_queries
+from apps.feedback.models import (
+    Feedback,
+    FeedbackDailyBucket,
+    FeedbackSentiment,
+    ReviewCycle,
+)
+from apps.feedback.sentiment import score_text
+from apps.projects.models import Project
+from apps.user.models import Apprentice, Mentor, Trainer, User
+
+
+class FeedbackAPITestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer_user = self.create_user("trainer", is_trainer=True)
+        self.trainer = Trainer.objects.create(user=self.trainer_user)
+        self.project = Project.objects.create(
+            name="Project", description="Project", trainer=self.trainer
+        )
+        self.mentor = self.create_mentor("mentor")
+        self.other_mentor = self.create_mentor("other-mentor")
+        self.apprentice = Apprentice.objects.create(
+            user=self.create_user("apprentice", is_apprentice=True),
+            trainer=self.trainer,
+            mentor=self.mentor,
+            project=self.project,
+        )
+
+    def create_user(self, name, **flags):
+        return User.objects.create_user(
+            email=f"{name}@example.com", first_name=name, last_name="User", **flags
+        )
+
+    def create_mentor(self, name):
+        return Mentor.objects.create(
+            user=self.create_user(name, is_mentor=True),
+            trainer=self.trainer,
+            project=self.project,
+        )
+
+    def create_feedback(self, mentor=None, satisfied=True, description="Good work"):
+        return Feedback.objects.create(
+            description=description,
+            mentor=mentor or self.mentor,
+            apprentice=self.apprentice,
+            project=self.project,
+            satisfied=satisfied,
+        )
+
+
+class ApprenticeFeedbackViewTests(FeedbackAPITestCase):
+    def url(self):
+        return f"/api/v1/feedback/apprentice/{self.apprentice.pk}/"
+
+    def test_visibility_is_filtered_in_sql(self):
+        own = self.create_feedback()
+        foreign = self.create_feedback(mentor=self.other_mentor)
+
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.data], [str(own.id)])
+
+        self.client.force_authenticate(self.apprentice.user)
+        response = self.client.get(self.url())
+        self.assertEqual(
+            {row["id"] for row in response.data}, {str(own.id), str(foreign.id)}
+        )
+
+    def create_foreign_feedback(self, count):
+        for _ in range(count):
+            self.create_feedback(mentor=self.other_mentor)
+
+    @constant_queries(seed="create_foreign_feedback")
+    def test_query_count_is_constant(self):
+        self.client.force_authenticate(self.apprentice.user)
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the apprentice sees every seeded row, all from another mentor
+        self.assertEqual(
+            {row["id"] for row in response.data},
+            {str(pk) for pk in Feedback.objects.values_list("pk", flat=True)},
+        )
+
+
+class FeedbackAnalyticsTests(FeedbackAPITestCase):
+    def test_buckets_follow_writes_and_serve_trends(self):
+        first = self.create_feedback(satisfied=True)
+        self.create_feedback(satisfied=False)
+        self.create_feedback(mentor=self.other_mentor, satisfied=True)
+        first.satisfied = False
+        first.save()
+
+        bucket = FeedbackDailyBucket.objects.get(mentor=self.mentor)
+        self.assertEqual((bucket.total_count, bucket.satisfied_count), (2, 0))
+        self.assertEqual(bucket.trainer_id, self.trainer.pk)
+
+        self.client.force_authenticate(self.trainer_user)
+        response = self.client.get(
+            "/api/v1/feedback/analytics/", {"group_by": "trainer", "period": "month"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        row = response.data[0]
+        self.assertEqual((row["total"], row["satisfied"]), (3, 1))
+        self.assertEqual(
+            row["period"], str(datetime.date.today().replace(day=1))
+        )
+
+        self.client.force_authenticate(self.other_mentor.user)
+        response = self.client.get("/api/v1/feedback/analytics/", {"group_by": "mentor"})
+        self.assertEqual([row["key"] for row in response.data], [str(self.other_mentor.pk)])
+
+    def test_rebuild_matches_incremental(self):
+        self.create_feedback(satisfied=True)
+        doomed = self.create_feedback(satisfied=False)
+        doomed.delete()
+        incremental = list(
+            FeedbackDailyBucket.objects.values_list("total_count", "satisfied_count")
+        )
+        call_command("rebuild_feedback_buckets", stdout=io.StringIO())
+        self.assertEqual(
+            list(FeedbackDailyBucket.objects.values_list("total_count", "satisfied_count")),
+            incremental,
+        )
+
+    def test_deleting_a_mentor_drops_its_buckets(self):
+        self.create_feedback()
+        self.create_feedback(mentor=self.other_mentor)
+        self.mentor.user.delete()
+        self.assertEqual(
+            list(FeedbackDailyBucket.objects.values_list("mentor_id", flat=True)),
+            [self.other_mentor.pk],
+        )
+
+    def test_deleting_an_apprentice_drops_its_buckets(self):
+        self.create_feedback()
+        self.create_feedback(mentor=self.other_mentor, satisfied=False)
+        self.apprentice.user.delete()
+        self.assertFalse(FeedbackDailyBucket.objects.exists())
+        self.assertFalse(Feedback.objects.exists())
+
+    def test_deleting_a_project_drops_its_buckets(self):
+        self.create_feedback()
+        self.project.delete()
+        self.assertFalse(FeedbackDailyBucket.objects.exists())
+
+
+class ReviewCycleTests(FeedbackAPITestCase):
+    url = "/api/v1/feedback/review-cycles/"
+
+    def payload(self, description="", **extra):
+        return {
+            "name": "Q3 review",
+            "period_start": "2026-07-01",
+            "period_end": "2026-09-30",
+            "entries": [
+                {
+                    "apprentice": str(self.apprentice.pk),
+                    "project": str(self.project.pk),
+                    "description": description,
+                }
+            ],
+            **extra,
+        }
+
+    def test_draft_then_submit_creates_feedback(self):
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.post(self.url, self.payload(), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], "draft")
+        self.assertFalse(Feedback.objects.exists())
+
+        detail = f"{self.url}{response.data['id']}/"
+        response = self.client.put(detail, {"submit": True}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.put(
+            detail, self.payload("Solid quarter", submit=True), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "submitted")
+        feedback = Feedback.objects.get()
+        self.assertEqual(feedback.description, "Solid quarter")
+        self.assertEqual(response.data["entries"][0]["feedback"], feedback.pk)
+        self.assertEqual(FeedbackDailyBucket.objects.get().total_count, 1)
+
+        response = self.client.put(detail, {"name": "Renamed"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_entries_added_while_submitting_get_feedback(self):
+        second = Apprentice.objects.create(
+            user=self.create_user("second-apprentice", is_apprentice=True),
+            trainer=self.trainer,
+            mentor=self.mentor,
+            project=self.project,
+        )
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.post(self.url, self.payload("First"), format="json")
+        payload = self.payload("First", submit=True)
+        payload["entries"].append(
+            {
+                "apprentice": str(second.pk),
+                "project": str(self.project.pk),
+                "description": "Second",
+            }
+        )
+        response = self.client.put(
+            f"{self.url}{response.data['id']}/", payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Feedback.objects.count(), 2)
+        self.assertTrue(all(entry["feedback"] for entry in response.data["entries"]))
+
+    def test_foreign_apprentice_is_rejected(self):
+        self.client.force_authenticate(self.other_mentor.user)
+        response = self.client.post(self.url, self.payload("Hi"), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ReviewCycle.objects.exists())
+
+
+class FeedbackSentimentTests(FeedbackAPITestCase):
+    def score(self):
+        out = io.StringIO()
+        call_command("score_feedback_sentiment", stdout=out)
+        return out.getvalue()
+
+    def test_lexicon_handles_negation(self):
+        self.assertGreater(score_text("Great, very thorough work")[0], 0.5)
+        self.assertLess(score_text("Not reliable, struggling with tests")[0], -0.5)
+        self.assertEqual(score_text("Struggling with tests")[3][0], "struggling")
+
+    def test_scoring_is_incremental(self):
+        low = self.create_feedback(description="Sloppy and late, often stuck")
+        self.create_feedback(description="Excellent progress")
+        self.assertIn("Scored 2 of 2", self.score())
+        # edits later on the day of a check may still come, so today's rows stay
+        self.assertIn("Scored 0 of 2", self.score())
+
+        # the next day they are checked once more, then no longer read
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        Feedback.objects.update(updated_at=yesterday)
+        FeedbackSentiment.objects.update(checked_on=yesterday)
+        self.assertIn("Scored 0 of 2", self.score())
+        self.assertIn("Scored 0 of 0", self.score())
+
+        low.description = "Excellent progress"
+        low.save()
+        self.assertIn("Scored 1 of 1", self.score())
+        self.assertGreater(FeedbackSentiment.objects.get(pk=low.pk).score, 0)
+
+    def test_low_scores_are_listed_most_negative_first(self):
+        worst = self.create_feedback(description="Unacceptable, failed again")
+        bad = self.create_feedback(description="Slightly slow")
+        self.create_feedback(description="Good work")
+        foreign = self.create_feedback(
+            mentor=self.other_mentor, description="Poor and careless"
+        )
+        self.score()
+
+        self.client.force_authenticate(self.trainer_user)
+        response = self.client.get("/api/v1/feedback/sentiment/?max_score=0")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["feedback"]["id"] for row in response.data["results"]],
+            [str(worst.pk), str(foreign.pk), str(bad.pk)],
+        )
 
-# Create your tests here.
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.get("/api/v1/feedback/sentiment/?max_score=0")
+        self.assertNotIn(
+            str(foreign.pk), [row["feedback"]["id"] for row in response.data["results"]]
+        )
@@ -5,10 +5,18 @@ from .views import (
     ProjectFeedbackView,
     FeedbackDetailView,
     ApprenticeFeedbackView,
+    FeedbackAnalyticsView,
+    ReviewCycleListCreateView,
+    ReviewCycleDetailView,
+    FeedbackSentimentView,
 )
 
 urlpatterns = [
     path("", FeedbackListCreateView.as_view(), name="feedback-list-create"),
+    path("analytics/", FeedbackAnalyticsView.as_view(), name="feedback-analytics"),
+    path("sentiment/", FeedbackSentimentView.as_view(), name="feedback-sentiment"),
+    path("review-cycles/", ReviewCycleListCreateView.as_view(), name="review-cycle-list-create"),
+    path("review-cycles/<uuid:cycle_id>/", ReviewCycleDetailView.as_view(), name="review-cycle-detail"),
     path("<uuid:feedback_id>/", FeedbackDetailView.as_view(), name="feedback-detail"),
     path("project/<uuid:project_id>/", ProjectFeedbackView.as_view(), name="project-feedback"),
     path("apprentice/<uuid:apprentice_id>/", ApprenticeFeedbackView.as_view(), name="apprentice-feedback"),
@@ -1,12 +1,31 @@
 # feedback/views.py
+import datetime
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
 from django.shortcuts import get_object_or_404
 from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.feedback.models import Feedback
-from .serializers import FeedbackReadSerializer, FeedbackWriteSerializer
-from apps.core.permissions import IsMentor, IsMentorOrApprentice
+from apps.core.pagination import KeysetPagination
+from apps.feedback.models import (
+    Feedback,
+    FeedbackDailyBucket,
+    FeedbackSentiment,
+    ReviewCycle,
+)
+from .serializers import (
+    FeedbackReadSerializer,
+    FeedbackWriteSerializer,
+    FeedbackAnalyticsQuerySerializer,
+    FeedbackAnalyticsSerializer,
+    FeedbackSentimentQuerySerializer,
+    FeedbackSentimentSerializer,
+    ReviewCycleReadSerializer,
+    ReviewCycleWriteSerializer,
+)
+from apps.core.permissions import IsMentor, IsMentorOrApprentice, IsMentorOrTrainerOrAdmin
 from drf_yasg.utils import swagger_auto_schema
 
 # ─────────────────────────────────────────────
@@ -28,6 +47,7 @@ class FeedbackListCreateView(APIView):
         request_body=FeedbackWriteSerializer,
         responses={201: FeedbackReadSerializer},
     )
+    @transaction.atomic
     def post(self, request):
         ser = FeedbackWriteSerializer(data=request.data, context={"request": request})
         if ser.is_valid():
@@ -57,6 +77,7 @@ class FeedbackDetailView(APIView):
         request_body=FeedbackWriteSerializer,
         responses={200: FeedbackReadSerializer},
     )
+    @transaction.atomic
     def put(self, request, feedback_id):
         feedback = self.get_object(feedback_id)
         ser = FeedbackWriteSerializer(feedback, data=request.data, partial=True)
@@ -76,16 +97,14 @@ class ApprenticeFeedbackView(APIView):
         responses={200: FeedbackReadSerializer(many=True)},
     )
     def get(self, request, apprentice_id):
-        qs = Feedback.objects.filter(apprentice_id=apprentice_id).select_related(
-            "mentor__user", "project"
+        # visibility is part of the query: the mentor's own feedback or the
+        # apprentice's own, mirroring IsMentorOrApprentice per object
+        qs = (
+            Feedback.objects.filter(apprentice_id=apprentice_id)
+            .filter(Q(mentor_id=request.user.pk) | Q(apprentice_id=request.user.pk))
+            .select_related("mentor__user", "apprentice__user", "project")
         )
-        # object‑level perms checked row by row
-        result = [
-            FeedbackReadSerializer(fb).data
-            for fb in qs
-            if self.check_object_permissions(request, fb) is None
-        ]
-        return Response(result)
+        return Response(FeedbackReadSerializer(qs, many=True).data)
 
 
 # ─────────────────────────────────────────────
@@ -102,3 +121,134 @@ class ProjectFeedbackView(APIView):
             "mentor__user", "apprentice__user"
         )
         return Response(FeedbackReadSerializer(qs, many=True).data)
+
+
+# ─────────────────────────────────────────────
+# 5. Satisfaction Analytics (weekly / monthly trends)
+# ─────────────────────────────────────────────
+class FeedbackAnalyticsView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsMentorOrTrainerOrAdmin]
+    truncators = {"week": TruncWeek, "month": TruncMonth}
+
+    @swagger_auto_schema(
+        query_serializer=FeedbackAnalyticsQuerySerializer,
+        responses={200: FeedbackAnalyticsSerializer(many=True)},
+    )
+    def get(self, request):
+        query = FeedbackAnalyticsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        end = params.get("end", datetime.date.today())
+        start = params.get("start", end - datetime.timedelta(days=365))
+
+        # read from the daily buckets, never from the feedback table
+        buckets = query.filter(
+            FeedbackDailyBucket.objects.filter(day__gte=start, day__lte=end)
+        )
+        if not (request.user.is_trainer or request.user.is_staff):
+            buckets = buckets.filter(mentor_id=request.user.pk)
+        group_field = params["group_by"] + "_id"
+        rows = (
+            buckets.annotate(period=self.truncators[params["period"]]("day"))
+            .values(group_field, "period")
+            .annotate(total=Sum("total_count"), satisfied=Sum("satisfied_count"))
+            .order_by(group_field, "period")
+        )
+        data = [
+            {
+                "key": row[group_field],
+                "period": row["period"],
+                "total": row["total"],
+                "satisfied": row["satisfied"],
+                "satisfaction_rate": round(row["satisfied"] / row["total"], 4),
+            }
+            for row in rows
+            if row["total"]
+        ]
+        return Response(FeedbackAnalyticsSerializer(data, many=True).data)
+
+
+# ─────────────────────────────────────────────
+# 6. Review Cycles (bulk feedback with drafts, Mentors only)
+# ─────────────────────────────────────────────
+class ReviewCycleListCreateView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsMentor]
+
+    @swagger_auto_schema(
+        responses={200: ReviewCycleReadSerializer(many=True)},
+    )
+    def get(self, request):
+        qs = ReviewCycle.objects.filter(mentor_id=request.user.pk).prefetch_related(
+            "entries"
+        )
+        return Response(ReviewCycleReadSerializer(qs, many=True).data)
+
+    @swagger_auto_schema(
+        request_body=ReviewCycleWriteSerializer,
+        responses={201: ReviewCycleReadSerializer},
+    )
+    def post(self, request):
+        ser = ReviewCycleWriteSerializer(data=request.data, context={"request": request})
+        if ser.is_valid():
+            cycle = ser.save()
+            return Response(
+                ReviewCycleReadSerializer(cycle).data, status=status.HTTP_201_CREATED
+            )
+        return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ReviewCycleDetailView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsMentor]
+
+    def get_object(self, cycle_id):
+        return get_object_or_404(
+            ReviewCycle.objects.prefetch_related("entries"),
+            id=cycle_id,
+            mentor_id=self.request.user.pk,
+        )
+
+    @swagger_auto_schema(
+        responses={200: ReviewCycleReadSerializer},
+    )
+    def get(self, request, cycle_id):
+        return Response(ReviewCycleReadSerializer(self.get_object(cycle_id)).data)
+
+    @swagger_auto_schema(
+        request_body=ReviewCycleWriteSerializer,
+        responses={200: ReviewCycleReadSerializer},
+    )
+    def put(self, request, cycle_id):
+        cycle = self.get_object(cycle_id)
+        ser = ReviewCycleWriteSerializer(
+            cycle, data=request.data, partial=True, context={"request": request}
+        )
+        if ser.is_valid():
+            ser.save()
+            return Response(ReviewCycleReadSerializer(self.get_object(cycle_id)).data)
+        return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+# ─────────────────────────────────────────────
+# 7. Low Sentiment Feedback (scored offline by score_feedback_sentiment)
+# ─────────────────────────────────────────────
+class FeedbackSentimentView(APIView):
+    permission_classes = [permissions.IsAuthenticated, IsMentorOrTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        query_serializer=FeedbackSentimentQuerySerializer,
+        responses={200: FeedbackSentimentSerializer(many=True)},
+    )
+    def get(self, request):
+        query = FeedbackSentimentQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        qs = query.filter(FeedbackSentiment.objects.select_related("feedback"))
+        if not (request.user.is_trainer or request.user.is_staff):
+            qs = qs.filter(feedback__mentor_id=request.user.pk)
+        # most negative first; walks sentiment_score_idx
+        paginator = KeysetPagination(ordering=("score", "feedback_id"))
+        page = paginator.paginate_queryset(qs, request, view=self)
+        return paginator.get_paginated_response(
+            FeedbackSentimentSerializer(page, many=True).data
+        )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FeedbackConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.feedback"
+
+    def ready(self):
+        from apps.feedback import signals  # noqa: F401
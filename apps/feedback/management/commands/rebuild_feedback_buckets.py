@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.feedback.services import rebuild_buckets
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily feedback satisfaction buckets from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_buckets(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} feedback buckets."))
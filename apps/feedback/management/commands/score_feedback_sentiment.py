@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.feedback.services import score_pending_feedback
+
+
+class Command(BaseCommand):
+    help = "Score new and edited feedback descriptions with the sentiment lexicon."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--rescore",
+            action="store_true",
+            help="Score every row again, e.g. after the lexicon changed.",
+        )
+
+    def handle(self, *args, **options):
+        scanned, scored = score_pending_feedback(
+            batch_size=options["batch_size"], rescore=options["rescore"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Scored {scored} of {scanned} candidate feedback rows.")
+        )
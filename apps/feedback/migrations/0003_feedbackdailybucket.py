@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0002_initial'),
+        ('projects', '0006_projectmembership'),
+        ('user', '0003_remove_apprentice_project_remove_mentor_project_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackDailyBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('total_count', models.IntegerField(default=0)),
+                ('satisfied_count', models.IntegerField(default=0)),
+                ('apprentice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedback_buckets', to='user.apprentice')),
+                ('mentor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedback_buckets', to='user.mentor')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feedback_buckets', to='projects.project')),
+                ('trainer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='feedback_buckets', to='user.trainer')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['apprentice', 'day'], name='bucket_apprentice_day_idx'), models.Index(fields=['mentor', 'day'], name='bucket_mentor_day_idx'), models.Index(fields=['project', 'day'], name='bucket_project_day_idx'), models.Index(fields=['trainer', 'day'], name='bucket_trainer_day_idx')],
+                'unique_together': {('day', 'apprentice', 'mentor', 'project')},
+            },
+        ),
+    ]
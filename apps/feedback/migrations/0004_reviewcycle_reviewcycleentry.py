@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:58
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0003_feedbackdailybucket'),
+        ('projects', '0006_projectmembership'),
+        ('user', '0003_remove_apprentice_project_remove_mentor_project_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewCycle',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('submitted', 'Submitted')], default='draft', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('mentor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_cycles', to='user.mentor')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReviewCycleEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('description', models.TextField(blank=True)),
+                ('satisfied', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('apprentice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_entries', to='user.apprentice')),
+                ('cycle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='feedback.reviewcycle')),
+                ('feedback', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_entry', to='feedback.feedback')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_entries', to='projects.project')),
+            ],
+            options={
+                'unique_together': {('cycle', 'apprentice', 'project')},
+            },
+        ),
+    ]
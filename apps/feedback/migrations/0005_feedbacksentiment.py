@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0004_reviewcycle_reviewcycleentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackSentiment',
+            fields=[
+                ('feedback', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='sentiment', serialize=False, to='feedback.feedback')),
+                ('score', models.FloatField()),
+                ('positive_terms', models.PositiveIntegerField(default=0)),
+                ('negative_terms', models.PositiveIntegerField(default=0)),
+                ('top_terms', models.JSONField(default=list)),
+                ('text_hash', models.CharField(max_length=40)),
+                ('source_updated_at', models.DateField()),
+                ('scored_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['score', 'feedback'], name='sentiment_score_idx')],
+            },
+        ),
+    ]
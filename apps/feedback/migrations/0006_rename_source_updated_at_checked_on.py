@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0005_feedbacksentiment'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='feedbacksentiment',
+            old_name='source_updated_at',
+            new_name='checked_on',
+        ),
+    ]
@@ -31,3 +31,117 @@ class Feedback(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+
+
+class FeedbackDailyBucket(models.Model):
+    """Feedback counts per day and apprentice/mentor/project, kept on write.
+
+    ``trainer`` is the project's trainer when the bucket was first written,
+    so trainer trends do not need a join back to projects.
+    """
+
+    day = models.DateField()
+    apprentice = models.ForeignKey(
+        Apprentice, on_delete=models.CASCADE, related_name="feedback_buckets"
+    )
+    mentor = models.ForeignKey(
+        Mentor, on_delete=models.CASCADE, related_name="feedback_buckets"
+    )
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="feedback_buckets"
+    )
+    trainer = models.ForeignKey(
+        "user.Trainer",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="feedback_buckets",
+    )
+    total_count = models.IntegerField(default=0)
+    satisfied_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ["day", "apprentice", "mentor", "project"]
+        indexes = [
+            models.Index(fields=["apprentice", "day"], name="bucket_apprentice_day_idx"),
+            models.Index(fields=["mentor", "day"], name="bucket_mentor_day_idx"),
+            models.Index(fields=["project", "day"], name="bucket_project_day_idx"),
+            models.Index(fields=["trainer", "day"], name="bucket_trainer_day_idx"),
+        ]
+
+
+class ReviewCycle(models.Model):
+    """A mentor's batch of end-of-period feedback, saved as drafts until submitted."""
+
+    STATUS_CHOICES = [
+        ("draft", "Draft"),
+        ("submitted", "Submitted"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    mentor = models.ForeignKey(
+        Mentor, on_delete=models.CASCADE, related_name="review_cycles"
+    )
+    name = models.CharField(max_length=100)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="draft")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    class Meta:
+        ordering = ["-created_at"]
+
+
+class ReviewCycleEntry(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cycle = models.ForeignKey(
+        ReviewCycle, on_delete=models.CASCADE, related_name="entries"
+    )
+    apprentice = models.ForeignKey(
+        Apprentice, on_delete=models.CASCADE, related_name="review_entries"
+    )
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="review_entries"
+    )
+    description = models.TextField(blank=True)
+    satisfied = models.BooleanField(default=True)
+    feedback = models.OneToOneField(
+        Feedback,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="review_entry",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ["cycle", "apprentice", "project"]
+
+
+class FeedbackSentiment(models.Model):
+    """Lexicon sentiment of a feedback description, filled by a batch job.
+
+    ``checked_on`` is the day the description was last compared with
+    ``text_hash``; the job only reads feedback edited on or after it.
+    """
+
+    feedback = models.OneToOneField(
+        Feedback, on_delete=models.CASCADE, primary_key=True, related_name="sentiment"
+    )
+    score = models.FloatField()
+    positive_terms = models.PositiveIntegerField(default=0)
+    negative_terms = models.PositiveIntegerField(default=0)
+    top_terms = models.JSONField(default=list)
+    text_hash = models.CharField(max_length=40)
+    checked_on = models.DateField()
+    scored_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["score", "feedback"], name="sentiment_score_idx"),
+        ]
@@ -0,0 +1,118 @@
+"""Lexicon-based sentiment and keyword scoring for feedback text.
+
+Scoring is offline and deterministic: the same text always yields the same
+score, so rows only need rescoring when their description changes.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+
+# words, plus clause punctuation that ends a negation's reach
+TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,;:!?]")
+
+# weights in [-3, 3]; kept small on purpose, extend as trainers report misses
+LEXICON = {
+    # positive
+    "good": 1.5, "great": 2.5, "excellent": 3.0, "outstanding": 3.0,
+    "impressive": 2.5, "solid": 1.5, "strong": 1.5, "clean": 1.0,
+    "clear": 1.0, "helpful": 1.5, "improved": 1.5, "improving": 1.5,
+    "improvement": 1.0, "progress": 1.0, "proactive": 2.0, "reliable": 2.0,
+    "thorough": 2.0, "quick": 1.0, "fast": 1.0, "creative": 1.5,
+    "confident": 1.5, "motivated": 2.0, "well": 1.0, "nice": 1.5,
+    "happy": 2.0, "pleased": 2.0, "independent": 1.5, "consistent": 1.5,
+    "accurate": 1.5, "efficient": 1.5, "organized": 1.5, "engaged": 1.5,
+    # negative
+    "bad": -1.5, "poor": -2.0, "weak": -1.5, "late": -1.5, "missed": -1.5,
+    "missing": -1.0, "struggle": -2.0, "struggles": -2.0, "struggling": -2.0,
+    "stuck": -1.5, "confused": -1.5, "confusing": -1.5, "sloppy": -2.0,
+    "slow": -1.0, "careless": -2.0, "unreliable": -2.0, "incomplete": -1.5,
+    "buggy": -2.0, "bugs": -1.0, "error": -1.0, "errors": -1.0,
+    "problem": -1.0, "problems": -1.0, "issue": -0.5, "issues": -0.5,
+    "absent": -1.5, "unprepared": -2.0, "frustrated": -2.0, "worried": -1.5,
+    "concern": -1.5, "concerns": -1.5, "disappointing": -2.5,
+    "disappointed": -2.5, "unacceptable": -3.0, "fail": -2.0,
+    "failed": -2.0, "failing": -2.0, "lacks": -1.5, "lacking": -1.5,
+}
+
+NEGATIONS = frozenset(
+    {"not", "no", "never", "neither", "nor", "without", "hardly",
+     "isn't", "wasn't", "aren't", "don't", "doesn't", "didn't", "can't",
+     "cannot", "won't", "shouldn't", "couldn't"}
+)
+INTENSIFIERS = {"very": 1.5, "really": 1.3, "extremely": 1.8, "quite": 1.2,
+                "slightly": 0.6, "somewhat": 0.7, "too": 1.3}
+STOPWORDS = frozenset(
+    {"a", "an", "and", "are", "as", "at", "be", "been", "but", "by", "for",
+     "from", "has", "have", "he", "her", "his", "i", "in", "is", "it", "its",
+     "of", "on", "or", "she", "so", "that", "the", "their", "they", "this",
+     "to", "was", "we", "were", "with", "you", "your", "them", "also",
+     "will", "would", "should", "could", "can", "more", "some", "all",
+     "just", "than", "then", "there", "what", "when", "which", "who"}
+    | NEGATIONS
+    | set(INTENSIFIERS)
+)
+NEGATION_WINDOW = 3
+TOP_TERMS = 5
+# normalisation constant: score = raw / sqrt(raw² + ALPHA) lands in (-1, 1)
+ALPHA = 15
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def score_text(text):
+    """Return ``(score, positive, negative, top_terms)`` for one text."""
+    tokens = TOKEN_RE.findall(text.lower())
+    raw = 0.0
+    positive = negative = 0
+    last_negation = -NEGATION_WINDOW - 1
+    boost = 1.0
+    terms = Counter()
+    for position, token in enumerate(tokens):
+        if not token[0].isalpha():
+            last_negation = -NEGATION_WINDOW - 1
+            boost = 1.0
+            continue
+        if token in NEGATIONS:
+            last_negation = position
+            continue
+        if token in INTENSIFIERS:
+            boost = INTENSIFIERS[token]
+            continue
+        weight = LEXICON.get(token)
+        if weight is not None:
+            if position - last_negation <= NEGATION_WINDOW:
+                weight = -weight * 0.75
+            weight *= boost
+            raw += weight
+            if weight > 0:
+                positive += 1
+            else:
+                negative += 1
+        boost = 1.0
+        if token not in STOPWORDS and len(token) > 2:
+            terms[token] += 1
+    score = raw / math.sqrt(raw * raw + ALPHA) if raw else 0.0
+    top_terms = [term for term, _ in sorted(terms.items(), key=_term_rank)[:TOP_TERMS]]
+    return round(score, 4), positive, negative, top_terms
+
+
+def score_texts(texts):
+    """Score a batch of texts; one result tuple per input, in order.
+
+    Identical texts (templated feedback is common) are scored once.
+    """
+    scored = {}
+    return [
+        scored[text] if text in scored else scored.setdefault(text, score_text(text))
+        for text in texts
+    ]
+
+
+def _term_rank(item):
+    # sentiment-bearing terms first, then by frequency, then alphabetically
+    term, count = item
+    return (-abs(LEXICON.get(term, 0.0)), -count, term)
@@ -0,0 +1,236 @@
+import datetime
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from apps.feedback.models import (
+    Feedback,
+    FeedbackDailyBucket,
+    FeedbackSentiment,
+    ReviewCycleEntry,
+)
+from apps.feedback.sentiment import score_texts, text_hash
+from apps.projects.models import Project
+
+
+def bucket_state(feedback):
+    """``(bucket key, satisfied)`` of a feedback row, as counted in buckets."""
+    return (
+        (
+            feedback.created_at,
+            feedback.apprentice_id,
+            feedback.mentor_id,
+            feedback.project_id,
+        ),
+        feedback.satisfied,
+    )
+
+
+def apply_bucket_changes(changes):
+    """Move FeedbackDailyBucket counts for ``(before, after)`` feedback states.
+
+    States come from ``bucket_state``; ``None`` marks a row that did not
+    exist before or was deleted. Call inside the writing transaction. Only
+    keys that gain feedback get a new bucket; a key that only loses feedback
+    already has one, or is being deleted along with its mentor, apprentice or
+    project.
+    """
+    deltas = defaultdict(Counter)
+    for before, after in changes:
+        if before == after:
+            continue
+        for state, sign in ((before, -1), (after, 1)):
+            if state is None:
+                continue
+            key, satisfied = state
+            deltas[key]["total"] += sign
+            deltas[key]["satisfied"] += sign if satisfied else 0
+    deltas = {key: counts for key, counts in deltas.items() if any(counts.values())}
+    if not deltas:
+        return
+    gained = [key for key, counts in deltas.items() if counts["total"] > 0]
+    trainers = (
+        dict(
+            Project.objects.filter(pk__in={key[3] for key in gained}).values_list(
+                "pk", "trainer_id"
+            )
+        )
+        if gained
+        else {}
+    )
+    with transaction.atomic():
+        FeedbackDailyBucket.objects.bulk_create(
+            [
+                FeedbackDailyBucket(
+                    day=day,
+                    apprentice_id=apprentice,
+                    mentor_id=mentor,
+                    project_id=project,
+                    trainer_id=trainers.get(project),
+                )
+                for day, apprentice, mentor, project in gained
+            ],
+            ignore_conflicts=True,
+        )
+        for (day, apprentice, mentor, project), counts in deltas.items():
+            FeedbackDailyBucket.objects.filter(
+                day=day, apprentice_id=apprentice, mentor_id=mentor, project_id=project
+            ).update(
+                total_count=F("total_count") + counts["total"],
+                satisfied_count=F("satisfied_count") + counts["satisfied"],
+            )
+
+
+def rebuild_buckets(batch_size=1000):
+    """Recompute FeedbackDailyBucket from the feedback table."""
+    rows = (
+        Feedback.objects.values(
+            "created_at", "apprentice_id", "mentor_id", "project_id", "project__trainer_id"
+        )
+        .annotate(total=Count("id"), satisfied=Count("id", filter=Q(satisfied=True)))
+        .order_by()
+    )
+    buckets = [
+        FeedbackDailyBucket(
+            day=row["created_at"],
+            apprentice_id=row["apprentice_id"],
+            mentor_id=row["mentor_id"],
+            project_id=row["project_id"],
+            trainer_id=row["project__trainer_id"],
+            total_count=row["total"],
+            satisfied_count=row["satisfied"],
+        )
+        for row in rows.iterator()
+    ]
+    with transaction.atomic():
+        FeedbackDailyBucket.objects.all().delete()
+        FeedbackDailyBucket.objects.bulk_create(buckets, batch_size=batch_size)
+    return len(buckets)
+
+
+def save_review_entries(cycle, entries):
+    """Insert or update draft entries of ``cycle``, keyed by apprentice and project."""
+    existing = {
+        (entry.apprentice_id, entry.project_id): entry for entry in cycle.entries.all()
+    }
+    new, changed = [], []
+    for data in entries:
+        key = (data["apprentice"], data["project"])
+        entry = existing.get(key)
+        if entry is None:
+            new.append(
+                ReviewCycleEntry(
+                    cycle=cycle,
+                    apprentice_id=key[0],
+                    project_id=key[1],
+                    description=data.get("description", ""),
+                    satisfied=data.get("satisfied", True),
+                )
+            )
+            continue
+        entry.description = data.get("description", entry.description)
+        entry.satisfied = data.get("satisfied", entry.satisfied)
+        entry.updated_at = timezone.now()
+        changed.append(entry)
+    ReviewCycleEntry.objects.bulk_create(new)
+    ReviewCycleEntry.objects.bulk_update(
+        changed, ["description", "satisfied", "updated_at"]
+    )
+
+
+def submit_review_cycle(cycle):
+    """Turn every entry of a draft cycle into Feedback with one bulk insert."""
+    with transaction.atomic():
+        # not cycle.entries: a prefetch taken before this request's edits
+        # would miss entries it just added
+        entries = list(ReviewCycleEntry.objects.filter(cycle=cycle))
+        feedback = [
+            Feedback(
+                description=entry.description,
+                mentor_id=cycle.mentor_id,
+                apprentice_id=entry.apprentice_id,
+                project_id=entry.project_id,
+                satisfied=entry.satisfied,
+            )
+            for entry in entries
+        ]
+        Feedback.objects.bulk_create(feedback)
+        for entry, created in zip(entries, feedback):
+            entry.feedback = created
+        ReviewCycleEntry.objects.bulk_update(entries, ["feedback"])
+        apply_bucket_changes([(None, bucket_state(row)) for row in feedback])
+        cycle.status = "submitted"
+        cycle.submitted_at = timezone.now()
+        cycle.save(update_fields=["status", "submitted_at", "updated_at"])
+    return feedback
+
+
+def score_pending_feedback(batch_size=2000, rescore=False, today=None):
+    """Score feedback that is new or edited since it was last checked.
+
+    ``Feedback.updated_at`` is a date, so the sentiment row keeps a
+    ``checked_on`` watermark: the day its description was last compared.
+    Candidates are rows without sentiment or edited on or after that day; a
+    text hash then drops candidates whose description did not change. Those
+    are stamped with ``today``, so a row is looked at again only if it was
+    edited on the day it was last checked, and only once after that day.
+    Returns ``(scanned, scored)``.
+    """
+    today = today or datetime.date.today()
+    pending = Feedback.objects.order_by("pk")
+    if not rescore:
+        pending = pending.filter(
+            Q(sentiment__isnull=True) | Q(updated_at__gte=F("sentiment__checked_on"))
+        )
+    pending = pending.values_list(
+        "pk", "description", "updated_at", "sentiment__text_hash"
+    )
+    scanned = scored = 0
+    last_pk = None
+    while True:
+        chunk = pending.filter(pk__gt=last_pk) if last_pk else pending
+        rows = list(chunk[:batch_size])
+        if not rows:
+            return scanned, scored
+        last_pk = rows[-1][0]
+        scanned += len(rows)
+        changed, unchanged = [], []
+        for pk, description, updated_at, known_hash in rows:
+            digest = text_hash(description)
+            if rescore or digest != known_hash:
+                changed.append((pk, description, digest))
+            elif updated_at < today:
+                unchanged.append(pk)
+        results = score_texts([description for _, description, _ in changed])
+        FeedbackSentiment.objects.bulk_create(
+            [
+                FeedbackSentiment(
+                    feedback_id=pk,
+                    score=score,
+                    positive_terms=positive,
+                    negative_terms=negative,
+                    top_terms=top_terms,
+                    text_hash=digest,
+                    checked_on=today,
+                )
+                for (pk, _, digest), (score, positive, negative, top_terms)
+                in zip(changed, results)
+            ],
+            update_conflicts=True,
+            unique_fields=["feedback"],
+            update_fields=[
+                "score",
+                "positive_terms",
+                "negative_terms",
+                "top_terms",
+                "text_hash",
+                "checked_on",
+                "scored_at",
+            ],
+        )
+        FeedbackSentiment.objects.filter(feedback_id__in=unchanged).update(
+            checked_on=today
+        )
+        scored += len(changed)
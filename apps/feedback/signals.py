@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.feedback.models import Feedback
+from apps.feedback.services import apply_bucket_changes, bucket_state
+
+
+@receiver(post_init, sender=Feedback)
+def remember_loaded_state(sender, instance, **kwargs):
+    # Read __dict__ directly so deferred fields are not fetched one by one.
+    loaded = instance.__dict__
+    instance._loaded_state = (
+        (
+            loaded.get("created_at"),
+            loaded.get("apprentice_id"),
+            loaded.get("mentor_id"),
+            loaded.get("project_id"),
+        ),
+        loaded.get("satisfied"),
+    )
+
+
+@receiver(post_save, sender=Feedback)
+def track_feedback_save(sender, instance, created, **kwargs):
+    before = None if created else instance._loaded_state
+    after = bucket_state(instance)
+    apply_bucket_changes([(before, after)])
+    instance._loaded_state = after
+
+
+@receiver(post_delete, sender=Feedback)
+def track_feedback_delete(sender, instance, **kwargs):
+    apply_bucket_changes([(instance._loaded_state, None)])
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from apps.projects.models import Project
+from apps.projects.models import Project, ProjectMembership
 import datetime
 
 
@@ -48,3 +48,18 @@ class ProjectWriteSerializer(serializers.ModelSerializer):
         instance.updated_at = datetime.datetime.now()
         instance.save()
         return instance
+
+
+class ProjectMembershipReadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectMembership
+        fields = ("member", "role", "project", "started_at", "ended_at")
+
+
+class ProjectMembershipQuerySerializer(serializers.Serializer):
+    """Query parameters for the as-of membership lookup."""
+
+    as_of = serializers.DateTimeField(required=False)
+    role = serializers.ChoiceField(
+        choices=ProjectMembership.ROLE_CHOICES, required=False
+    )
@@ -1,3 +1,99 @@
+import datetime
+import io
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project, ProjectMembership
+from apps.request.models import ProjectJoinRequest
+from apps.user.models import Apprentice, Mentor, Trainer, User
+
+
+class ProjectMembershipTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer_user = User.objects.create_user(
+            email="trainer@example.com",
+            first_name="Trainer",
+            last_name="User",
+            password="password123",
+            is_trainer=True,
+        )
+        self.trainer = Trainer.objects.create(user=self.trainer_user)
+        self.project_a = Project.objects.create(name="A", description="A")
+        self.project_b = Project.objects.create(name="B", description="B")
+        mentor_user = User.objects.create_user(
+            email="mentor@example.com",
+            first_name="Mentor",
+            last_name="User",
+            password="password123",
+            is_mentor=True,
+        )
+        self.mentor = Mentor.objects.create(
+            user=mentor_user, trainer=self.trainer, project=self.project_a
+        )
+        apprentice_user = User.objects.create_user(
+            email="apprentice@example.com",
+            first_name="Apprentice",
+            last_name="User",
+            password="password123",
+            is_apprentice=True,
+        )
+        self.apprentice = Apprentice.objects.create(
+            user=apprentice_user, mentor=self.mentor, project=self.project_a
+        )
+
+    def test_project_change_closes_and_opens_intervals(self):
+        self.apprentice.project = self.project_b
+        self.apprentice.save()
+
+        intervals = ProjectMembership.objects.filter(
+            member=self.apprentice.user
+        ).order_by("started_at")
+        self.assertEqual(
+            [(m.project_id, m.ended_at is None) for m in intervals],
+            [(self.project_a.id, False), (self.project_b.id, True)],
+        )
+
+    def test_members_as_of(self):
+        before_move = timezone.now()
+        self.apprentice.project = self.project_b
+        self.apprentice.save()
+
+        self.client.force_authenticate(self.trainer_user)
+        url = f"/api/v1/projects/{self.project_a.id}/members/"
+        response = self.client.get(url, {"as_of": before_move.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {(m["member"], m["role"]) for m in response.data},
+            {(self.mentor.pk, "mentor"), (self.apprentice.pk, "apprentice")},
+        )
+
+        response = self.client.get(url)
+        self.assertEqual([m["role"] for m in response.data], ["mentor"])
+
+    def test_backfill_from_approved_requests(self):
+        ProjectMembership.objects.all().delete()
+        join = ProjectJoinRequest.objects.create(
+            requester=self.apprentice.user,
+            apprentice=self.apprentice,
+            project=self.project_b,
+            reason="join",
+            status="approved",
+        )
+        ProjectJoinRequest.objects.filter(pk=join.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(days=30)
+        )
+
+        call_command("backfill_project_memberships", stdout=io.StringIO())
 
-# Create your tests here.
+        intervals = ProjectMembership.objects.filter(
+            member=self.apprentice.user
+        ).order_by("started_at")
+        self.assertEqual(
+            [(m.project_id, m.ended_at is None) for m in intervals],
+            [(self.project_b.id, False), (self.project_a.id, True)],
+        )
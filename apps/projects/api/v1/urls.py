@@ -1,7 +1,16 @@
 from django.urls import path
-from .views import ProjectListCreateAPIView, ProjectDetailAPIView
+from .views import (
+    ProjectListCreateAPIView,
+    ProjectDetailAPIView,
+    ProjectMembersAsOfAPIView,
+)
 
 urlpatterns = [
     path("", ProjectListCreateAPIView.as_view(), name="project-list-create"),
     path("<uuid:id>/", ProjectDetailAPIView.as_view(), name="project-detail"),
+    path(
+        "<uuid:id>/members/",
+        ProjectMembersAsOfAPIView.as_view(),
+        name="project-members-as-of",
+    ),
 ]
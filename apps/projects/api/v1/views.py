@@ -1,10 +1,17 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from apps.projects.models import Project
-from .serializers import ProjectReadSerializer, ProjectWriteSerializer
+from django.utils import timezone
+from apps.projects.models import Project, ProjectMembership
+from .serializers import (
+    ProjectReadSerializer,
+    ProjectWriteSerializer,
+    ProjectMembershipReadSerializer,
+    ProjectMembershipQuerySerializer,
+)
 from apps.core.permissions import IsTrainerOrAdmin
 from rest_framework.permissions import IsAuthenticated
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 
 
@@ -100,3 +107,28 @@ class ProjectDetailAPIView(APIView):
             return Response(status=status.HTTP_404_NOT_FOUND)
         project.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProjectMembersAsOfAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="List project members at a point in time",
+        operation_description="List the mentors and apprentices assigned to a project at `as_of` (defaults to now) (Trainer only).",
+        manual_parameters=[
+            openapi.Parameter("as_of", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("role", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={200: ProjectMembershipReadSerializer(many=True)},
+    )
+    def get(self, request, id):
+        query = ProjectMembershipQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        memberships = ProjectMembership.objects.filter(project_id=id).as_of(
+            query.validated_data.get("as_of", timezone.now())
+        )
+        if "role" in query.validated_data:
+            memberships = memberships.filter(role=query.validated_data["role"])
+        serializer = ProjectMembershipReadSerializer(memberships, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,131 @@
+import datetime
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.projects.models import Project, ProjectMembership
+from apps.request.models import (
+    ApprenticeRemovalRequest,
+    MentorLeaveRequest,
+    ProjectJoinRequest,
+    ProjectLeaveRequest,
+)
+from apps.user.models import Apprentice, Mentor
+
+
+class Command(BaseCommand):
+    help = (
+        "Derive project membership history from approved join, leave and "
+        "removal requests plus the current Apprentice/Mentor project."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Delete existing membership rows before backfilling.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if ProjectMembership.objects.exists() and not options["replace"]:
+            raise CommandError(
+                "Membership history already exists; pass --replace to rebuild it."
+            )
+
+        now = timezone.now()
+        project_starts = {
+            pk: self._start_of(start_date)
+            for pk, start_date in Project.objects.values_list("id", "start_date")
+        }
+
+        # (member_id, role) -> [(moment, action, project_id)], joins sort first
+        events = defaultdict(list)
+        for model, role, action in (
+            (ProjectJoinRequest, "apprentice", "join"),
+            (ProjectLeaveRequest, "apprentice", "leave"),
+            (ApprenticeRemovalRequest, "apprentice", "leave"),
+            (MentorLeaveRequest, "mentor", "leave"),
+        ):
+            member_field = "mentor_id" if role == "mentor" else "apprentice_id"
+            rows = model.objects.filter(status="approved").values_list(
+                member_field, "project_id", "updated_at"
+            )
+            for member_id, project_id, moment in rows:
+                events[(member_id, role)].append((moment, action, project_id))
+
+        current = {}
+        for model, role in ((Apprentice, "apprentice"), (Mentor, "mentor")):
+            for member_id, project_id in model.objects.values_list("pk", "project_id"):
+                current[(member_id, role)] = project_id
+
+        memberships = []
+        for key in events.keys() | current.keys():
+            memberships.extend(
+                self._intervals(
+                    key,
+                    sorted(events.get(key, []), key=lambda e: (e[0], e[1] != "join")),
+                    current.get(key),
+                    project_starts,
+                    now,
+                )
+            )
+
+        with transaction.atomic():
+            if options["replace"]:
+                ProjectMembership.objects.all().delete()
+            ProjectMembership.objects.bulk_create(
+                memberships, batch_size=options["batch_size"]
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled {len(memberships)} membership intervals.")
+        )
+
+    def _start_of(self, date):
+        return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+    def _intervals(self, key, events, current_project_id, project_starts, now):
+        member_id, role = key
+        intervals = []
+        open_interval = None
+
+        def open_on(project_id, moment):
+            return ProjectMembership(
+                member_id=member_id, role=role, project_id=project_id, started_at=moment
+            )
+
+        for moment, action, project_id in events:
+            if action == "join":
+                if open_interval and open_interval.project_id == project_id:
+                    continue
+                if open_interval:
+                    open_interval.ended_at = moment
+                    intervals.append(open_interval)
+                open_interval = open_on(project_id, moment)
+            elif open_interval and open_interval.project_id == project_id:
+                open_interval.ended_at = moment
+                intervals.append(open_interval)
+                open_interval = None
+            else:
+                # Leave without a recorded join: assume membership since project start.
+                started_at = min(project_starts.get(project_id, moment), moment)
+                if intervals and intervals[-1].ended_at:
+                    started_at = max(started_at, intervals[-1].ended_at)
+                interval = open_on(project_id, started_at)
+                interval.ended_at = moment
+                intervals.append(interval)
+
+        if open_interval and open_interval.project_id != current_project_id:
+            open_interval.ended_at = now
+            intervals.append(open_interval)
+            open_interval = None
+        if open_interval is None and current_project_id is not None:
+            started_at = project_starts.get(current_project_id, now)
+            if intervals:
+                started_at = max(started_at, intervals[-1].ended_at)
+            open_interval = open_on(current_project_id, started_at)
+        if open_interval:
+            intervals.append(open_interval)
+        return intervals
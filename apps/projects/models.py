@@ -34,3 +34,71 @@ class Project(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+
+
+class ProjectMembershipQuerySet(models.QuerySet):
+    def as_of(self, moment):
+        return self.filter(started_at__lte=moment).filter(
+            models.Q(ended_at__isnull=True) | models.Q(ended_at__gt=moment)
+        )
+
+    def move(self, member_id, role, old_project_id, new_project_id, moment):
+        """Close the open interval on the old project and open one on the new."""
+        if old_project_id == new_project_id:
+            return None
+        if old_project_id is not None:
+            self.filter(
+                member_id=member_id,
+                role=role,
+                project_id=old_project_id,
+                ended_at__isnull=True,
+            ).update(ended_at=moment)
+        if new_project_id is None:
+            return None
+        return self.create(
+            member_id=member_id,
+            role=role,
+            project_id=new_project_id,
+            started_at=moment,
+        )
+
+
+class ProjectMembership(models.Model):
+    """One interval of a mentor or apprentice being assigned to a project.
+
+    Rows are appended whenever ``Apprentice.project`` or ``Mentor.project``
+    changes; the only mutation afterwards is closing ``ended_at``.
+    """
+
+    ROLE_CHOICES = [
+        ("apprentice", "Apprentice"),
+        ("mentor", "Mentor"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="memberships"
+    )
+    member = models.ForeignKey(
+        "user.User", on_delete=models.CASCADE, related_name="project_memberships"
+    )
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ProjectMembershipQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.member_id} {self.role} {self.project_id}"
+
+    class Meta:
+        ordering = ["started_at"]
+        indexes = [
+            models.Index(
+                fields=["project", "started_at", "ended_at"],
+                name="membership_project_span_idx",
+            ),
+            models.Index(
+                fields=["member", "started_at"], name="membership_member_start_idx"
+            ),
+        ]
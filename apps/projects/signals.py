@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.projects.models import ProjectMembership
+from apps.user.models import Apprentice, Mentor
+
+# ───────────────────────────────────
+# Membership history for Apprentice.project / Mentor.project
+# ───────────────────────────────────
+
+ROLES = {Apprentice: "apprentice", Mentor: "mentor"}
+
+
+@receiver(post_init, sender=Apprentice)
+@receiver(post_init, sender=Mentor)
+def remember_loaded_project(sender, instance, **kwargs):
+    instance._loaded_project_id = instance.project_id
+
+
+@receiver(post_save, sender=Apprentice)
+@receiver(post_save, sender=Mentor)
+def record_project_change(sender, instance, created, **kwargs):
+    old_project_id = None if created else instance._loaded_project_id
+    ProjectMembership.objects.move(
+        instance.pk, ROLES[sender], old_project_id, instance.project_id, timezone.now()
+    )
+    instance._loaded_project_id = instance.project_id
+
+
+@receiver(post_delete, sender=Apprentice)
+@receiver(post_delete, sender=Mentor)
+def close_membership_on_delete(sender, instance, **kwargs):
+    ProjectMembership.objects.filter(
+        member_id=instance.pk, role=ROLES[sender], ended_at__isnull=True
+    ).update(ended_at=timezone.now())
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from apps.request.models import ProjectJoinRequest, ProjectLeaveRequest, RotationChangeRequest, MentorLeaveRequest, ApprenticeRemovalRequest
+from apps.rotation.occupancy import placement_counts
 from apps.user.models import Mentor
 
 class ProjectJoinRequestSerializer(serializers.ModelSerializer):
@@ -18,6 +19,30 @@ class RotationChangeRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = RotationChangeRequest
         fields = '__all__'
+        read_only_fields = ['requester', 'status', 'admin_notes', 'reviewed_by']
+
+    def validate(self, data):
+        apprentice = data.get('apprentice')
+        current = data.get('current_department')
+        requested = data.get('requested_department')
+
+        if current == requested:
+            raise serializers.ValidationError(
+                {'requested_department': "Pick a department other than the current one."}
+            )
+
+        # One query over today's assignments of both departments
+        counts = placement_counts(apprentice.pk, current.pk, requested.pk)
+        if not counts['current']:
+            raise serializers.ValidationError(
+                {'current_department': "The apprentice is not rotating in this department today."}
+            )
+        if requested.capacity is not None and counts['requested'] >= requested.capacity:
+            raise serializers.ValidationError(
+                {'requested_department': "The requested department has no free places."}
+            )
+
+        return data
 
 
 class MentorLeaveRequestSerializer(serializers.ModelSerializer):
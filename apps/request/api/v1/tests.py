@@ -1,3 +1,127 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.core.testing import constant_queries
+from apps.projects.models import Project
+from apps.request.models import ProjectJoinRequest, RotationChangeRequest
+from apps.rotation.models import ApprenticeRotation, Department, Rotation
+from apps.user.models import Apprentice, Trainer, User
+
+
+class RotationChangeRequestTests(TestCase):
+    url = "/api/v1/requests/rotation/change/"
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.trainer = Trainer.objects.create(user=self.create_user("trainer", is_trainer=True))
+        self.apprentice = self.create_apprentice("apprentice")
+        self.backend = Department.objects.create(name="Backend")
+        self.frontend = Department.objects.create(name="Frontend", capacity=1)
+        self.assign(self.apprentice, self.backend)
+        self.client.force_authenticate(self.apprentice.user)
+
+    def create_user(self, name, **flags):
+        return User.objects.create_user(
+            email=f"{name}@example.com", first_name=name, last_name="User", **flags
+        )
+
+    def create_apprentice(self, name):
+        return Apprentice.objects.create(
+            user=self.create_user(name, is_apprentice=True), trainer=self.trainer
+        )
+
+    def assign(self, apprentice, department):
+        today = datetime.date.today()
+        rotation = Rotation.objects.create(
+            name=department.name,
+            duration=30,
+            department=department,
+            start_date=today - datetime.timedelta(days=5),
+            end_date=today + datetime.timedelta(days=25),
+        )
+        return ApprenticeRotation.objects.create(rotation=rotation, apprentice=apprentice)
+
+    def request_change(self, current, requested):
+        return self.client.post(
+            self.url,
+            {
+                "apprentice": str(self.apprentice.pk),
+                "current_department": str(current.pk),
+                "requested_department": str(requested.pk),
+                "reason": "Interested in UI work",
+            },
+            format="json",
+        )
+
+    def test_valid_request_is_checked_with_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.request_change(self.backend, self.frontend)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sum("rotation_apprenticerotation" in q["sql"] for q in queries.captured_queries),
+            1,
+        )
+        self.assertEqual(RotationChangeRequest.objects.get().requester, self.apprentice.user)
+
+    def test_wrong_current_department_is_rejected(self):
+        response = self.request_change(self.frontend, self.backend)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("current_department", response.data)
+
+    def test_new_assignments_are_seen_at_once(self):
+        self.assign(self.create_apprentice("other"), self.frontend)
+        response = self.request_change(self.backend, self.frontend)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("requested_department", response.data)
+
+        self.frontend.capacity = 2
+        self.frontend.save()
+        response = self.request_change(self.backend, self.frontend)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class RequestListQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer_user = User.objects.create_user(
+            email="trainer@example.com", first_name="T", last_name="User", is_trainer=True
+        )
+        self.trainer = Trainer.objects.create(user=self.trainer_user)
+        self.project = Project.objects.create(name="Project", description="Project")
+        self.backend = Department.objects.create(name="Backend")
+        self.frontend = Department.objects.create(name="Frontend")
+        self.client.force_authenticate(self.trainer_user)
+        self.created = 0
+
+    def create_requests(self, count):
+        for _ in range(count):
+            self.created += 1
+            user = User.objects.create_user(
+                email=f"apprentice-{self.created}@example.com",
+                first_name="A",
+                last_name="User",
+                is_apprentice=True,
+            )
+            apprentice = Apprentice.objects.create(user=user, trainer=self.trainer)
+            ProjectJoinRequest.objects.create(
+                requester=user, reason="Join", apprentice=apprentice, project=self.project
+            )
+            RotationChangeRequest.objects.create(
+                requester=user,
+                reason="Move",
+                apprentice=apprentice,
+                current_department=self.backend,
+                requested_department=self.frontend,
+            )
 
-# Create your tests here.
+    @constant_queries(seed="create_requests")
+    def test_list_requests_is_constant(self):
+        response = self.client.get("/api/v1/requests/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
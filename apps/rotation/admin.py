@@ -1,6 +1,24 @@
 from django.contrib import admin
 from .models import Department, Rotation, ApprenticeRotation
 
-admin.site.register(Department)
-admin.site.register(Rotation)
-admin.site.register(ApprenticeRotation)
+
+@admin.register(Department)
+class DepartmentAdmin(admin.ModelAdmin):
+    list_display = ("name", "created_at")
+    search_fields = ("name",)
+
+
+@admin.register(Rotation)
+class RotationAdmin(admin.ModelAdmin):
+    # __str__ reads the department; join it instead of a query per row
+    list_display = ("name", "department", "start_date", "end_date")
+    list_filter = ("department",)
+    list_select_related = ("department",)
+
+
+@admin.register(ApprenticeRotation)
+class ApprenticeRotationAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "rotation", "status")
+    list_filter = ("status",)
+    list_select_related = ("rotation__department", "apprentice__user")
+    raw_id_fields = ("rotation", "apprentice")
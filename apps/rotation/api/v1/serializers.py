@@ -0,0 +1,298 @@
+import datetime
+
+from rest_framework import serializers
+from apps.rotation.models import Department, Rotation, ApprenticeRotation
+from apps.user.models import Apprentice
+
+
+class DepartmentSerializer(serializers.ModelSerializer):
+    # annotated by the views, absent right after a create
+    rotation_count = serializers.IntegerField(read_only=True, default=0)
+
+    class Meta:
+        model = Department
+        fields = ("id", "name", "capacity", "rotation_count", "created_at", "updated_at")
+        read_only_fields = ("created_at", "updated_at")
+
+
+class ApprenticeRotationReadSerializer(serializers.ModelSerializer):
+    apprentice_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ApprenticeRotation
+        fields = ("id", "rotation", "apprentice", "apprentice_name", "status")
+
+    def get_apprentice_name(self, obj):
+        user = obj.apprentice.user
+        return f"{user.first_name} {user.last_name}"
+
+
+class ApprenticeRotationWriteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApprenticeRotation
+        fields = ("id", "rotation", "apprentice", "status")
+
+    def validate(self, data):
+        rotation = data.get("rotation", getattr(self.instance, "rotation", None))
+        apprentice = data.get("apprentice", getattr(self.instance, "apprentice", None))
+        duplicate = ApprenticeRotation.objects.filter(
+            rotation=rotation, apprentice=apprentice
+        )
+        if self.instance is not None:
+            duplicate = duplicate.exclude(pk=self.instance.pk)
+        if duplicate.exists():
+            raise serializers.ValidationError(
+                "This apprentice is already assigned to the rotation."
+            )
+        return data
+
+
+class RotationReadSerializer(serializers.ModelSerializer):
+    department_name = serializers.CharField(source="department.name", read_only=True)
+    assignments = ApprenticeRotationReadSerializer(
+        source="apprentice_rotations", many=True, read_only=True
+    )
+
+    class Meta:
+        model = Rotation
+        fields = (
+            "id",
+            "name",
+            "duration",
+            "department",
+            "department_name",
+            "start_date",
+            "end_date",
+            "assignments",
+            "created_at",
+            "updated_at",
+        )
+
+
+class RotationWriteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Rotation
+        fields = ("id", "name", "duration", "department", "start_date", "end_date")
+
+    def validate(self, data):
+        start = data.get("start_date", getattr(self.instance, "start_date", None))
+        end = data.get("end_date", getattr(self.instance, "end_date", None))
+        if start and end and end < start:
+            raise serializers.ValidationError(
+                {"end_date": "A rotation must not end before it starts."}
+            )
+        return data
+
+
+class RotationFilterSerializer(serializers.Serializer):
+    department = serializers.UUIDField(required=False)
+    active_on = serializers.DateField(required=False)
+
+    def filter(self, queryset):
+        params = self.validated_data
+        if "department" in params:
+            queryset = queryset.filter(department_id=params["department"])
+        if "active_on" in params:
+            queryset = queryset.filter(
+                start_date__lte=params["active_on"], end_date__gte=params["active_on"]
+            )
+        return queryset
+
+
+class ApprenticeRotationFilterSerializer(serializers.Serializer):
+    rotation = serializers.UUIDField(required=False)
+    apprentice = serializers.UUIDField(required=False)
+    department = serializers.UUIDField(required=False)
+    status = serializers.ChoiceField(
+        choices=ApprenticeRotation._meta.get_field("status").choices, required=False
+    )
+
+    def filter(self, queryset):
+        params = self.validated_data
+        if "rotation" in params:
+            queryset = queryset.filter(rotation_id=params["rotation"])
+        if "apprentice" in params:
+            queryset = queryset.filter(apprentice_id=params["apprentice"])
+        if "department" in params:
+            queryset = queryset.filter(rotation__department_id=params["department"])
+        if "status" in params:
+            queryset = queryset.filter(status=params["status"])
+        return queryset
+
+
+class ScheduleRequestSerializer(serializers.Serializer):
+    """A cohort (explicit apprentices or a whole project) and the slots to fill."""
+
+    apprentices = serializers.ListField(child=serializers.UUIDField(), required=False)
+    project = serializers.UUIDField(required=False)
+    rotations = serializers.ListField(child=serializers.UUIDField(), required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    preferences = serializers.DictField(
+        child=serializers.ListField(child=serializers.UUIDField()), required=False
+    )
+    per_apprentice = serializers.IntegerField(min_value=1, required=False)
+    dry_run = serializers.BooleanField(default=True)
+
+    def validate(self, data):
+        if "apprentices" not in data and "project" not in data:
+            raise serializers.ValidationError("Give either apprentices or a project.")
+        cohort = Apprentice.objects.all()
+        if "project" in data:
+            cohort = cohort.filter(project_id=data["project"])
+        if "apprentices" in data:
+            cohort = cohort.filter(pk__in=data["apprentices"])
+        found = list(cohort.order_by("pk").values_list("pk", flat=True))
+        missing = set(data.get("apprentices", ())) - set(found)
+        if missing:
+            raise serializers.ValidationError(
+                {"apprentices": [f"Unknown apprentice {pk}." for pk in sorted(map(str, missing))]}
+            )
+        data["cohort"] = data.get("apprentices") or found
+        # preference keys arrive as strings
+        data["preferences"] = {
+            serializers.UUIDField().to_internal_value(key): value
+            for key, value in data.get("preferences", {}).items()
+        }
+        return data
+
+    def slots(self):
+        params = self.validated_data
+        qs = Rotation.objects.select_related("department")
+        if "rotations" in params:
+            qs = qs.filter(pk__in=params["rotations"])
+        if "start" in params:
+            qs = qs.filter(start_date__gte=params["start"])
+        if "end" in params:
+            qs = qs.filter(end_date__lte=params["end"])
+        return qs
+
+
+class PlannedAssignmentSerializer(serializers.Serializer):
+    apprentice = serializers.UUIDField(source="apprentice_id")
+    rotation = serializers.UUIDField(source="rotation.id")
+    department = serializers.UUIDField(source="rotation.department_id")
+    start_date = serializers.DateField(source="rotation.start_date")
+    end_date = serializers.DateField(source="rotation.end_date")
+
+
+class SchedulePlanSerializer(serializers.Serializer):
+    dry_run = serializers.BooleanField()
+    assignments = PlannedAssignmentSerializer(many=True)
+    shortfall = serializers.ListField(child=serializers.UUIDField())
+
+
+class OccupancyQuerySerializer(serializers.Serializer):
+    MAX_DAYS = 366
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    department = serializers.UUIDField(required=False)
+
+    def validate(self, data):
+        start = data.setdefault("start", datetime.date.today())
+        end = data.setdefault("end", start + datetime.timedelta(days=90))
+        if end < start:
+            raise serializers.ValidationError({"end": "Must not be before start."})
+        if (end - start).days >= self.MAX_DAYS:
+            raise serializers.ValidationError(
+                {"end": f"The window may span at most {self.MAX_DAYS} days."}
+            )
+        return data
+
+
+class DepartmentOccupancySerializer(serializers.Serializer):
+    department = serializers.UUIDField()
+    name = serializers.CharField()
+    capacity = serializers.IntegerField(allow_null=True)
+    peak = serializers.IntegerField()
+    over_capacity_days = serializers.IntegerField()
+    headcount = serializers.ListField(child=serializers.IntegerField())
+
+
+class OccupancySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    departments = DepartmentOccupancySerializer(many=True)
+
+
+class TimelineSegmentSerializer(serializers.Serializer):
+    department = serializers.UUIDField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+    rotations = serializers.IntegerField()
+    status = serializers.CharField()
+
+
+class RotationHistorySerializer(serializers.Serializer):
+    apprentice = serializers.UUIDField()
+    departments = serializers.DictField(child=serializers.CharField())
+    segments = TimelineSegmentSerializer(many=True)
+
+
+class CohortHistoryQuerySerializer(serializers.Serializer):
+    project = serializers.UUIDField(required=False)
+    mentor = serializers.UUIDField(required=False)
+    trainer = serializers.UUIDField(required=False)
+
+    def filter(self, queryset):
+        for field in ("project", "mentor", "trainer"):
+            if field in self.validated_data:
+                queryset = queryset.filter(
+                    **{f"apprentice__{field}_id": self.validated_data[field]}
+                )
+        return queryset
+
+
+class ForecastRequestSerializer(serializers.Serializer):
+    MAX_DAYS = 366
+
+    start = serializers.DateField(required=False)
+    days = serializers.IntegerField(min_value=1, max_value=MAX_DAYS, default=365)
+    intake_date = serializers.DateField(required=False)
+    intakes = serializers.ListField(
+        child=serializers.IntegerField(min_value=0), min_length=1, max_length=20
+    )
+    rotation_days = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=MAX_DAYS),
+        required=False,
+        max_length=10,
+        help_text="Fixed rotation lengths to compare; by default each department's average Rotation.duration.",
+    )
+
+    def validate(self, data):
+        start = data.setdefault("start", datetime.date.today())
+        intake_date = data.get("intake_date", start)
+        if intake_date < start:
+            raise serializers.ValidationError({"intake_date": "Must not be before start."})
+        data["offset"] = (intake_date - start).days
+        return data
+
+
+class BottleneckRangeSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    peak = serializers.IntegerField()
+
+
+class BottleneckSerializer(serializers.Serializer):
+    department = serializers.UUIDField()
+    name = serializers.CharField()
+    capacity = serializers.IntegerField()
+    peak = serializers.IntegerField()
+    first_date = serializers.DateField()
+    ranges = BottleneckRangeSerializer(many=True)
+
+
+class ForecastScenarioSerializer(serializers.Serializer):
+    intake = serializers.IntegerField()
+    rotation_days = serializers.IntegerField(allow_null=True)
+    fits = serializers.BooleanField()
+    bottlenecks = BottleneckSerializer(many=True)
+
+
+class ForecastSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    days = serializers.IntegerField()
+    max_intake = serializers.DictField(child=serializers.IntegerField(allow_null=True))
+    scenarios = ForecastScenarioSerializer(many=True)
@@ -0,0 +1,384 @@
+import datetime
+import io
+import json
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.rotation.models import ApprenticeRotation, Department, Rotation
+from apps.rotation.occupancy import daily_headcount
+from apps.rotation.signals import rotation_status_changed
+from apps.user.models import Apprentice, Mentor, Trainer, User
+
+
+class RotationAPITestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer_user = self.create_user("trainer", is_trainer=True)
+        self.trainer = Trainer.objects.create(user=self.trainer_user)
+        self.project = Project.objects.create(name="Project", description="Project")
+        self.mentor = Mentor.objects.create(
+            user=self.create_user("mentor", is_mentor=True),
+            trainer=self.trainer,
+            project=self.project,
+        )
+        self.department = Department.objects.create(name="Backend")
+        self.apprentice = self.create_apprentice("apprentice")
+        self.other_apprentice = self.create_apprentice("other-apprentice", mentor=None)
+
+    def create_user(self, name, **flags):
+        return User.objects.create_user(
+            email=f"{name}@example.com", first_name=name, last_name="User", **flags
+        )
+
+    def create_apprentice(self, name, mentor=True):
+        return Apprentice.objects.create(
+            user=self.create_user(name, is_apprentice=True),
+            trainer=self.trainer,
+            mentor=self.mentor if mentor else None,
+            project=self.project,
+        )
+
+    def create_rotation(self, name="Rotation", department=None, start=None, days=30):
+        start = start or datetime.date(2026, 1, 5)
+        return Rotation.objects.create(
+            name=name,
+            duration=days,
+            department=department or self.department,
+            start_date=start,
+            end_date=start + datetime.timedelta(days=days),
+        )
+
+
+class RotationListTests(RotationAPITestCase):
+    def add_rotation(self, index):
+        rotation = self.create_rotation(
+            f"Rotation {index}",
+            department=Department.objects.create(name=f"Department {index}"),
+        )
+        for apprentice in (self.apprentice, self.other_apprentice):
+            ApprenticeRotation.objects.create(rotation=rotation, apprentice=apprentice)
+
+    def test_query_count_is_constant(self):
+        self.client.force_authenticate(self.trainer_user)
+        self.add_rotation(0)
+        with CaptureQueriesContext(connection) as one:
+            response = self.client.get("/api/v1/rotation/")
+        self.assertEqual(len(response.data["results"][0]["assignments"]), 2)
+        for index in range(1, 6):
+            self.add_rotation(index)
+        with CaptureQueriesContext(connection) as six:
+            response = self.client.get("/api/v1/rotation/")
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(len(one), len(six))
+
+        with CaptureQueriesContext(connection) as departments:
+            response = self.client.get("/api/v1/rotation/departments/")
+        self.assertEqual(len(departments), len(one) - 1)
+        counts = {row["name"]: row["rotation_count"] for row in response.data["results"]}
+        self.assertEqual((counts["Backend"], counts["Department 0"]), (0, 1))
+
+    def test_assignments_are_scoped_to_the_caller(self):
+        rotation = self.create_rotation()
+        own = ApprenticeRotation.objects.create(rotation=rotation, apprentice=self.apprentice)
+        ApprenticeRotation.objects.create(rotation=rotation, apprentice=self.other_apprentice)
+
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.get("/api/v1/rotation/assignments/")
+        self.assertEqual([row["id"] for row in response.data["results"]], [str(own.pk)])
+
+        response = self.client.get(f"/api/v1/rotation/{rotation.pk}/")
+        self.assertEqual([row["id"] for row in response.data["assignments"]], [str(own.pk)])
+
+    def test_only_trainers_write(self):
+        payload = {
+            "name": "Ops",
+            "duration": 14,
+            "department": str(self.department.pk),
+            "start_date": "2026-03-01",
+            "end_date": "2026-02-01",
+        }
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.post("/api/v1/rotation/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.trainer_user)
+        response = self.client.post("/api/v1/rotation/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        payload["end_date"] = "2026-03-15"
+        response = self.client.post("/api/v1/rotation/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class RotationScheduleTests(RotationAPITestCase):
+    url = "/api/v1/rotation/schedule/"
+
+    def setUp(self):
+        super().setUp()
+        self.department.capacity = 1
+        self.department.save()
+        self.frontend = Department.objects.create(name="Frontend")
+        self.january = self.create_rotation("Backend Jan", days=27)
+        self.march = self.create_rotation(
+            "Backend Mar", start=datetime.date(2026, 3, 2), days=27
+        )
+        self.frontend_january = self.create_rotation(
+            "Frontend Jan", department=self.frontend, days=27
+        )
+        self.client.force_authenticate(self.trainer_user)
+
+    def plan(self, **payload):
+        payload.setdefault("project", str(self.project.pk))
+        return self.client.post(self.url, payload, format="json")
+
+    def test_plan_respects_capacity_and_overlaps(self):
+        first, second = str(self.apprentice.pk), str(self.other_apprentice.pk)
+        response = self.plan(
+            apprentices=[first, second],
+            preferences={first: [str(self.department.pk)]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(ApprenticeRotation.objects.exists())
+        planned = {
+            (row["apprentice"], row["rotation"]) for row in response.data["assignments"]
+        }
+        self.assertEqual(
+            planned,
+            {
+                (first, str(self.january.pk)),
+                (second, str(self.frontend_january.pk)),
+                (second, str(self.march.pk)),
+            },
+        )
+        # the first apprentice cannot take Frontend Jan: it overlaps Backend Jan
+        self.assertEqual(response.data["shortfall"], [first])
+
+    def test_nested_existing_assignments_block_their_whole_span(self):
+        ops = Department.objects.create(name="Ops")
+        for name, start, days in (
+            ("Ops long", datetime.date(2026, 1, 1), 120),
+            ("Ops short", datetime.date(2026, 1, 2), 1),
+        ):
+            ApprenticeRotation.objects.create(
+                apprentice=self.apprentice,
+                rotation=self.create_rotation(name, department=ops, start=start, days=days),
+            )
+        response = self.plan(apprentices=[str(self.apprentice.pk)])
+        self.assertEqual(response.data["assignments"], [])
+        self.assertEqual(response.data["shortfall"], [str(self.apprentice.pk)])
+
+    def test_apply_writes_the_plan(self):
+        response = self.plan(dry_run=False, per_apprentice=1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ApprenticeRotation.objects.count(), 2)
+        self.assertEqual(response.data["shortfall"], [])
+
+        # existing assignments fill Backend Jan, so a rerun cannot reuse it
+        response = self.plan(apprentices=[str(self.create_apprentice("late").pk)])
+        self.assertNotIn(
+            str(self.january.pk),
+            [row["rotation"] for row in response.data["assignments"]],
+        )
+
+    def test_unknown_apprentice_is_rejected(self):
+        response = self.plan(apprentices=[str(self.department.pk)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DepartmentOccupancyTests(RotationAPITestCase):
+    url = "/api/v1/rotation/occupancy/?start=2026-01-01&end=2026-01-10"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_authenticate(self.trainer_user)
+
+    def test_sweep_clips_to_the_window(self):
+        day = datetime.date(2026, 1, 1)
+        counts = daily_headcount(
+            [
+                ("a", day - datetime.timedelta(days=3), day + datetime.timedelta(days=1)),
+                ("a", day + datetime.timedelta(days=1), day + datetime.timedelta(days=2)),
+                ("b", day + datetime.timedelta(days=4), day + datetime.timedelta(days=9)),
+            ],
+            day,
+            day + datetime.timedelta(days=4),
+        )
+        self.assertEqual(counts, {"a": [1, 2, 1, 0, 0], "b": [0, 0, 0, 0, 1]})
+
+    def test_cached_until_assignments_change(self):
+        rotation = self.create_rotation(days=3)
+        ApprenticeRotation.objects.create(rotation=rotation, apprentice=self.apprentice)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        row = response.data["departments"][0]
+        self.assertEqual(row["headcount"], [0, 0, 0, 0, 1, 1, 1, 1, 0, 0])
+
+        with CaptureQueriesContext(connection) as cached:
+            self.client.get(self.url)
+        self.assertFalse(
+            any("rotation_apprenticerotation" in q["sql"] for q in cached.captured_queries)
+        )
+
+        # counts are dropped once the change commits, not before
+        with self.captureOnCommitCallbacks(execute=True):
+            ApprenticeRotation.objects.create(
+                rotation=rotation, apprentice=self.other_apprentice
+            )
+            response = self.client.get(self.url)
+            self.assertEqual(response.data["departments"][0]["peak"], 1)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["departments"][0]["peak"], 2)
+
+
+class ProgressRotationsTests(RotationAPITestCase):
+    def progress(self, day):
+        out = io.StringIO()
+        call_command(
+            "progress_rotations", f"--date={day.isoformat()}", "--batch-size=1", stdout=out
+        )
+        return out.getvalue()
+
+    def test_statuses_follow_rotation_dates(self):
+        rotation = self.create_rotation(days=10)
+        later = self.create_rotation(start=datetime.date(2026, 2, 1), days=10)
+        current = ApprenticeRotation.objects.create(rotation=rotation, apprentice=self.apprentice)
+        upcoming = ApprenticeRotation.objects.create(rotation=later, apprentice=self.apprentice)
+        events = []
+
+        def collect(sender, assignment_id, old_status, new_status, **kwargs):
+            events.append((assignment_id, old_status, new_status))
+
+        rotation_status_changed.connect(collect)
+        self.addCleanup(rotation_status_changed.disconnect, collect)
+
+        self.assertIn("Progressed 1", self.progress(datetime.date(2026, 1, 6)))
+        self.assertIn("Progressed 0", self.progress(datetime.date(2026, 1, 6)))
+        self.assertIn("Progressed 2", self.progress(datetime.date(2026, 3, 1)))
+        current.refresh_from_db()
+        upcoming.refresh_from_db()
+        self.assertEqual((current.status, upcoming.status), ("completed", "completed"))
+        self.assertCountEqual(
+            events,
+            [
+                (current.pk, "at_halt", "in_progress"),
+                (current.pk, "in_progress", "completed"),
+                (upcoming.pk, "at_halt", "completed"),
+            ],
+        )
+
+
+class RotationHistoryTests(RotationAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.frontend = Department.objects.create(name="Frontend")
+        first = self.create_rotation("Backend 1", days=13)
+        second = self.create_rotation("Backend 2", start=datetime.date(2026, 1, 19), days=13)
+        third = self.create_rotation(
+            "Frontend", department=self.frontend, start=datetime.date(2026, 2, 2), days=13
+        )
+        for rotation in (first, second, third):
+            ApprenticeRotation.objects.create(rotation=rotation, apprentice=self.apprentice)
+        ApprenticeRotation.objects.create(rotation=third, apprentice=self.other_apprentice)
+
+    def test_back_to_back_rotations_collapse(self):
+        self.client.force_authenticate(self.apprentice.user)
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/v1/rotation/history/{self.apprentice.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        segments = response.data["segments"]
+        self.assertEqual(
+            [(s["department"], s["start"], s["end"], s["rotations"]) for s in segments],
+            [
+                (str(self.department.pk), "2026-01-05", "2026-02-01", 2),
+                (str(self.frontend.pk), "2026-02-02", "2026-02-15", 1),
+            ],
+        )
+        self.assertEqual(response.data["departments"][str(self.frontend.pk)], "Frontend")
+
+    def test_hidden_apprentice_is_not_found(self):
+        for user, apprentice in (
+            (self.apprentice.user, self.other_apprentice),
+            (self.mentor.user, self.other_apprentice),
+        ):
+            self.client.force_authenticate(user)
+            response = self.client.get(f"/api/v1/rotation/history/{apprentice.pk}/")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.trainer_user)
+        response = self.client.get(f"/api/v1/rotation/history/{self.other_apprentice.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cohort_history_streams(self):
+        self.client.force_authenticate(self.trainer_user)
+        response = self.client.get(f"/api/v1/rotation/history/?project={self.project.pk}")
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content))
+        lengths = {row["apprentice"]: len(row["segments"]) for row in data["apprentices"]}
+        self.assertEqual(
+            lengths, {str(self.apprentice.pk): 2, str(self.other_apprentice.pk): 1}
+        )
+        self.assertEqual(len(data["departments"]), 2)
+
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.get("/api/v1/rotation/history/")
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            [row["apprentice"] for row in data["apprentices"]], [str(self.apprentice.pk)]
+        )
+
+
+class CapacityForecastTests(RotationAPITestCase):
+    url = "/api/v1/rotation/forecast/"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.department.capacity = 2
+        self.department.save()
+        self.frontend = Department.objects.create(name="Frontend", capacity=3)
+        rotation = self.create_rotation(days=20)
+        self.create_rotation(department=self.frontend, days=20)
+        ApprenticeRotation.objects.create(rotation=rotation, apprentice=self.apprentice)
+        self.client.force_authenticate(self.trainer_user)
+
+    def forecast(self, **payload):
+        payload.setdefault("start", "2026-01-05")
+        payload.setdefault("days", 60)
+        return self.client.post(self.url, payload, format="json")
+
+    def test_reports_bottleneck_dates(self):
+        response = self.forecast(intakes=[2, 4])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        small, large = response.data["scenarios"]
+        self.assertTrue(small["fits"])
+        # two of four start in Backend next to the apprentice already there
+        self.assertFalse(large["fits"])
+        backend = large["bottlenecks"][0]
+        self.assertEqual(backend["name"], "Backend")
+        self.assertEqual(
+            [(row["start"], row["end"], row["peak"]) for row in backend["ranges"]],
+            [("2026-01-05", "2026-01-25", 3)],
+        )
+        self.assertEqual(response.data["max_intake"], {"default": 2})
+
+    def test_rotation_length_and_intake_date(self):
+        response = self.forecast(
+            intakes=[4], rotation_days=[10], intake_date="2026-01-26"
+        )
+        self.assertTrue(response.data["scenarios"][0]["fits"])
+        self.assertEqual(response.data["max_intake"], {"10": 4})
+
+    def test_command_lists_bottlenecks(self):
+        out = io.StringIO()
+        call_command(
+            "forecast_rotation_capacity", "4", "--start=2026-01-05", "--days=60", stdout=out
+        )
+        self.assertIn("largest intake that fits is 2", out.getvalue())
+        self.assertIn("Backend: 2026-01-05 to 2026-01-25 (peak 3 / 2)", out.getvalue())
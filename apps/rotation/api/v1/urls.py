@@ -0,0 +1,29 @@
+from django.urls import path
+
+from .views import (
+    DepartmentListCreateAPIView,
+    DepartmentDetailAPIView,
+    RotationListCreateAPIView,
+    RotationDetailAPIView,
+    ApprenticeRotationListCreateAPIView,
+    ApprenticeRotationDetailAPIView,
+    RotationScheduleAPIView,
+    DepartmentOccupancyAPIView,
+    ApprenticeRotationHistoryAPIView,
+    CohortRotationHistoryAPIView,
+    CapacityForecastAPIView,
+)
+
+urlpatterns = [
+    path("departments/", DepartmentListCreateAPIView.as_view(), name="department-list-create"),
+    path("departments/<uuid:pk>/", DepartmentDetailAPIView.as_view(), name="department-detail"),
+    path("", RotationListCreateAPIView.as_view(), name="rotation-list-create"),
+    path("assignments/", ApprenticeRotationListCreateAPIView.as_view(), name="assignment-list-create"),
+    path("assignments/<uuid:pk>/", ApprenticeRotationDetailAPIView.as_view(), name="assignment-detail"),
+    path("occupancy/", DepartmentOccupancyAPIView.as_view(), name="department-occupancy"),
+    path("forecast/", CapacityForecastAPIView.as_view(), name="capacity-forecast"),
+    path("history/", CohortRotationHistoryAPIView.as_view(), name="cohort-rotation-history"),
+    path("history/<uuid:apprentice_id>/", ApprenticeRotationHistoryAPIView.as_view(), name="apprentice-rotation-history"),
+    path("schedule/", RotationScheduleAPIView.as_view(), name="rotation-schedule"),
+    path("<uuid:pk>/", RotationDetailAPIView.as_view(), name="rotation-detail"),
+]
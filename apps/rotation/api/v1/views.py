@@ -0,0 +1,493 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+
+from apps.core.pagination import KeysetPagination
+from apps.core.permissions import IsMentorOrTrainerOrAdmin, IsTrainerOrAdmin
+from apps.rotation.models import Department, Rotation, ApprenticeRotation
+from apps.user.models import Apprentice
+from apps.rotation.forecast import load_forecast
+from apps.rotation.history import history_rows, iter_timelines
+from apps.rotation.occupancy import department_occupancy
+from apps.rotation.scheduler import schedule
+from .serializers import (
+    DepartmentSerializer,
+    RotationReadSerializer,
+    RotationWriteSerializer,
+    RotationFilterSerializer,
+    ApprenticeRotationReadSerializer,
+    ApprenticeRotationWriteSerializer,
+    ApprenticeRotationFilterSerializer,
+    ScheduleRequestSerializer,
+    SchedulePlanSerializer,
+    OccupancyQuerySerializer,
+    OccupancySerializer,
+    RotationHistorySerializer,
+    CohortHistoryQuerySerializer,
+    ForecastRequestSerializer,
+    ForecastSerializer,
+)
+
+
+def can_manage(user):
+    return user.is_trainer or user.is_staff
+
+
+def departments():
+    return Department.objects.annotate(rotation_count=Count("rotations"))
+
+
+def rotations(user):
+    # one query for the page, one for every assignment on it
+    assignments = ApprenticeRotation.objects.visible_to(user).select_related(
+        "apprentice__user"
+    )
+    return Rotation.objects.select_related("department").prefetch_related(
+        Prefetch("apprentice_rotations", queryset=assignments)
+    )
+
+
+def assignments(user):
+    return ApprenticeRotation.objects.visible_to(user).select_related(
+        "apprentice__user"
+    )
+
+
+def visible_apprentices(user):
+    """Apprentices whose assignments ``ApprenticeRotation.visible_to`` shows."""
+    if can_manage(user):
+        return Apprentice.objects.all()
+    if user.is_mentor:
+        return Apprentice.objects.filter(mentor_id=user.pk)
+    if user.is_apprentice:
+        return Apprentice.objects.filter(pk=user.pk)
+    return Apprentice.objects.none()
+
+
+# ─────────────────────────────────────────────
+# 1. Departments
+# ─────────────────────────────────────────────
+class DepartmentListCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="List departments",
+        operation_description="List departments with their number of rotations.",
+        responses={200: DepartmentSerializer(many=True)},
+    )
+    def get(self, request):
+        paginator = KeysetPagination(ordering=("name", "id"))
+        page = paginator.paginate_queryset(departments(), request, view=self)
+        return paginator.get_paginated_response(DepartmentSerializer(page, many=True).data)
+
+    @swagger_auto_schema(
+        operation_summary="Create a department",
+        operation_description="Create a department (Trainer only).",
+        request_body=DepartmentSerializer,
+        responses={201: DepartmentSerializer, 400: "Bad Request"},
+    )
+    def post(self, request):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        serializer = DepartmentSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class DepartmentDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Retrieve a department",
+        responses={200: DepartmentSerializer},
+    )
+    def get(self, request, pk):
+        department = get_object_or_404(departments(), pk=pk)
+        return Response(DepartmentSerializer(department).data)
+
+    @swagger_auto_schema(
+        operation_summary="Update a department",
+        operation_description="Update a department (Trainer only).",
+        request_body=DepartmentSerializer,
+        responses={200: DepartmentSerializer, 400: "Bad Request"},
+    )
+    def put(self, request, pk):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        department = get_object_or_404(departments(), pk=pk)
+        serializer = DepartmentSerializer(department, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        operation_summary="Delete a department",
+        operation_description="Delete a department and its rotations (Trainer only).",
+    )
+    def delete(self, request, pk):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        get_object_or_404(Department, pk=pk).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# ─────────────────────────────────────────────
+# 2. Rotations (with their apprentice assignments)
+# ─────────────────────────────────────────────
+class RotationListCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="List rotations",
+        operation_description="List rotations with the assignments visible to the caller.",
+        query_serializer=RotationFilterSerializer,
+        responses={200: RotationReadSerializer(many=True)},
+    )
+    def get(self, request):
+        filters = RotationFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        paginator = KeysetPagination(ordering=("start_date", "id"))
+        page = paginator.paginate_queryset(
+            filters.filter(rotations(request.user)), request, view=self
+        )
+        return paginator.get_paginated_response(
+            RotationReadSerializer(page, many=True).data
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Create a rotation",
+        operation_description="Create a rotation (Trainer only).",
+        request_body=RotationWriteSerializer,
+        responses={201: RotationWriteSerializer, 400: "Bad Request"},
+    )
+    def post(self, request):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        serializer = RotationWriteSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RotationDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Retrieve a rotation",
+        responses={200: RotationReadSerializer},
+    )
+    def get(self, request, pk):
+        rotation = get_object_or_404(rotations(request.user), pk=pk)
+        return Response(RotationReadSerializer(rotation).data)
+
+    @swagger_auto_schema(
+        operation_summary="Update a rotation",
+        operation_description="Update a rotation (Trainer only).",
+        request_body=RotationWriteSerializer,
+        responses={200: RotationWriteSerializer, 400: "Bad Request"},
+    )
+    @transaction.atomic
+    def put(self, request, pk):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        rotation = get_object_or_404(Rotation, pk=pk)
+        serializer = RotationWriteSerializer(rotation, data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        operation_summary="Delete a rotation",
+        operation_description="Delete a rotation and its assignments (Trainer only).",
+    )
+    def delete(self, request, pk):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        get_object_or_404(Rotation, pk=pk).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# ─────────────────────────────────────────────
+# 3. Apprentice Assignments
+# ─────────────────────────────────────────────
+class ApprenticeRotationListCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="List rotation assignments",
+        operation_description="Trainers see every assignment, mentors their apprentices', apprentices their own.",
+        query_serializer=ApprenticeRotationFilterSerializer,
+        responses={200: ApprenticeRotationReadSerializer(many=True)},
+    )
+    def get(self, request):
+        filters = ApprenticeRotationFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(
+            filters.filter(assignments(request.user)), request, view=self
+        )
+        return paginator.get_paginated_response(
+            ApprenticeRotationReadSerializer(page, many=True).data
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Assign an apprentice to a rotation",
+        operation_description="Assign an apprentice to a rotation (Trainer only).",
+        request_body=ApprenticeRotationWriteSerializer,
+        responses={201: ApprenticeRotationWriteSerializer, 400: "Bad Request"},
+    )
+    def post(self, request):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        serializer = ApprenticeRotationWriteSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ApprenticeRotationDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Retrieve a rotation assignment",
+        responses={200: ApprenticeRotationReadSerializer},
+    )
+    def get(self, request, pk):
+        assignment = get_object_or_404(assignments(request.user), pk=pk)
+        return Response(ApprenticeRotationReadSerializer(assignment).data)
+
+    @swagger_auto_schema(
+        operation_summary="Update a rotation assignment",
+        operation_description="Update an assignment, e.g. its status (Trainer only).",
+        request_body=ApprenticeRotationWriteSerializer,
+        responses={200: ApprenticeRotationWriteSerializer, 400: "Bad Request"},
+    )
+    @transaction.atomic
+    def put(self, request, pk):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        assignment = get_object_or_404(ApprenticeRotation, pk=pk)
+        serializer = ApprenticeRotationWriteSerializer(
+            assignment, data=request.data, partial=True
+        )
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        operation_summary="Remove a rotation assignment",
+        operation_description="Remove an apprentice from a rotation (Trainer only).",
+    )
+    def delete(self, request, pk):
+        if not can_manage(request.user):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        get_object_or_404(ApprenticeRotation, pk=pk).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# ─────────────────────────────────────────────
+# 4. Scheduling
+# ─────────────────────────────────────────────
+class RotationScheduleAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Plan rotations for a cohort",
+        operation_description="Assign a cohort to rotation slots without overlaps or exceeding department capacity. With `dry_run` (the default) the plan is returned but not saved (Trainer only).",
+        request_body=ScheduleRequestSerializer,
+        responses={200: SchedulePlanSerializer, 201: SchedulePlanSerializer},
+    )
+    def post(self, request):
+        serializer = ScheduleRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        with transaction.atomic():
+            # serialize concurrent runs over the same departments
+            rotations = list(serializer.slots().select_for_update())
+            plan = schedule(
+                params["cohort"],
+                rotations,
+                preferences=params["preferences"],
+                per_apprentice=params.get("per_apprentice"),
+            )
+            if not params["dry_run"]:
+                plan.apply()
+        data = SchedulePlanSerializer(
+            {
+                "dry_run": params["dry_run"],
+                "assignments": plan.assignments,
+                "shortfall": plan.shortfall,
+            }
+        ).data
+        code = status.HTTP_200_OK if params["dry_run"] else status.HTTP_201_CREATED
+        return Response(data, status=code)
+
+
+# ─────────────────────────────────────────────
+# 5. Department Occupancy
+# ─────────────────────────────────────────────
+class DepartmentOccupancyAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Daily headcount per department",
+        operation_description="Apprentices in each department for every day from `start` (default today) to `end` (default 90 days later); `headcount[i]` is day `start + i` (Trainer only).",
+        query_serializer=OccupancyQuerySerializer,
+        responses={200: OccupancySerializer},
+    )
+    def get(self, request):
+        query = OccupancyQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        start, end = query.validated_data["start"], query.validated_data["end"]
+        headcount = department_occupancy(start, end)
+        empty = [0] * ((end - start).days + 1)
+        rows = Department.objects.order_by("name", "id")
+        if "department" in query.validated_data:
+            rows = rows.filter(pk=query.validated_data["department"])
+        result = []
+        for department in rows:
+            counts = headcount.get(department.pk, empty)
+            over = (
+                sum(1 for count in counts if count > department.capacity)
+                if department.capacity is not None
+                else 0
+            )
+            result.append(
+                {
+                    "department": department.pk,
+                    "name": department.name,
+                    "capacity": department.capacity,
+                    "peak": max(counts),
+                    "over_capacity_days": over,
+                    "headcount": counts,
+                }
+            )
+        return Response(
+            OccupancySerializer({"start": start, "end": end, "departments": result}).data
+        )
+
+
+# ─────────────────────────────────────────────
+# 6. Rotation History (run-length timelines)
+# ─────────────────────────────────────────────
+class ApprenticeRotationHistoryAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Rotation history of one apprentice",
+        operation_description="Department segments in date order; back-to-back rotations in one department are merged and counted.",
+        responses={200: RotationHistorySerializer},
+    )
+    def get(self, request, apprentice_id):
+        apprentice = get_object_or_404(visible_apprentices(request.user), pk=apprentice_id)
+        departments = {}
+        rows = history_rows(
+            ApprenticeRotation.objects.visible_to(request.user).filter(
+                apprentice_id=apprentice.pk
+            )
+        )
+        segments = next(iter_timelines(rows, departments), (None, []))[1]
+        return Response(
+            RotationHistorySerializer(
+                {
+                    "apprentice": apprentice.pk,
+                    "departments": departments,
+                    "segments": segments,
+                }
+            ).data
+        )
+
+
+class CohortRotationHistoryAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsMentorOrTrainerOrAdmin]
+    chunk_size = 2000
+
+    @swagger_auto_schema(
+        operation_summary="Rotation history of a cohort",
+        operation_description="Streams `{\"apprentices\": [{apprentice, segments}, ...], \"departments\": {id: name}}` for every visible apprentice, optionally limited to a project, mentor or trainer.",
+        query_serializer=CohortHistoryQuerySerializer,
+    )
+    def get(self, request):
+        query = CohortHistoryQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        rows = history_rows(
+            query.filter(ApprenticeRotation.objects.visible_to(request.user))
+        ).iterator(chunk_size=self.chunk_size)
+        return StreamingHttpResponse(
+            self.stream(rows), content_type="application/json"
+        )
+
+    def stream(self, rows):
+        # one apprentice per chunk; only the current group is held in memory
+        departments = {}
+        yield '{"apprentices": ['
+        separator = ""
+        for apprentice_id, segments in iter_timelines(rows, departments):
+            yield separator + json.dumps(
+                {"apprentice": apprentice_id, "segments": segments},
+                cls=DjangoJSONEncoder,
+            )
+            separator = ", "
+        names = {str(pk): name for pk, name in departments.items()}
+        yield '], "departments": ' + json.dumps(names) + "}"
+
+
+# ─────────────────────────────────────────────
+# 7. Capacity Forecast
+# ─────────────────────────────────────────────
+class CapacityForecastAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Forecast department capacity for new intakes",
+        operation_description="Project department occupancy for each intake size and rotation length on top of the current plan, listing the dates where capacity is exceeded. `max_intake` is keyed by rotation length (`default` for each department's average) (Trainer only).",
+        request_body=ForecastRequestSerializer,
+        responses={200: ForecastSerializer},
+    )
+    def post(self, request):
+        serializer = ForecastRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        forecast = load_forecast(params["start"], params["days"])
+        lengths = params.get("rotation_days") or [None]
+        scenarios = [
+            forecast.run(intake, length, params["offset"])
+            for length in lengths
+            for intake in params["intakes"]
+        ]
+        max_intake = {
+            str(length or "default"): forecast.max_intake(length, params["offset"])
+            for length in lengths
+        }
+        return Response(
+            ForecastSerializer(
+                {
+                    "start": params["start"],
+                    "days": params["days"],
+                    "max_intake": max_intake,
+                    "scenarios": scenarios,
+                }
+            ).data
+        )
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RotationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.rotation"
+
+    def ready(self):
+        from apps.rotation import signals  # noqa: F401
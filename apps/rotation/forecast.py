@@ -0,0 +1,144 @@
+"""Capacity forecasting for new cohorts.
+
+An intake of N apprentices is modelled as a rotation wheel: the cohort is
+split into one group per department, each group starts in a different
+department and then moves through all of them in turn, spending the
+department's typical rotation length (or a fixed length) in each. Every
+stint is added to per-department difference arrays, and one prefix sum per
+department turns them into daily headcounts on top of today's plan.
+"""
+
+import datetime
+
+from django.db.models import Avg
+
+from apps.rotation.models import Department
+from apps.rotation.occupancy import department_occupancy
+
+DEFAULT_ROTATION_DAYS = 28
+# upper bound for max_intake searches; far beyond any real cohort
+INTAKE_LIMIT = 100_000
+
+
+class CapacityForecast:
+    """Daily department headcounts for ``days`` days from ``start``."""
+
+    def __init__(self, start, days, departments, baseline):
+        self.start = start
+        self.days = days
+        # [(pk, name, capacity, typical rotation days)] in wheel order
+        self.departments = departments
+        self.baseline = baseline
+
+    def intake_load(self, intake, rotation_days=None, offset=0):
+        """Extra headcount per department from an intake ``offset`` days in."""
+        count = len(self.departments)
+        diffs = [[0] * (self.days + 1) for _ in range(count)]
+        for group in range(count):
+            size = intake // count + (1 if group < intake % count else 0)
+            if not size:
+                continue
+            day = offset
+            for step in range(count):
+                slot = (group + step) % count
+                if day >= self.days:
+                    break
+                length = rotation_days or self.departments[slot][3]
+                diffs[slot][day] += size
+                diffs[slot][min(day + length, self.days)] -= size
+                day += length
+        loads = {}
+        for slot, diff in enumerate(diffs):
+            running = 0
+            counts = []
+            for delta in diff[: self.days]:
+                running += delta
+                counts.append(running)
+            loads[self.departments[slot][0]] = counts
+        return loads
+
+    def run(self, intake, rotation_days=None, offset=0):
+        """Projected occupancy and the date ranges where capacity is exceeded."""
+        extra = self.intake_load(intake, rotation_days, offset)
+        empty = [0] * self.days
+        bottlenecks = []
+        for pk, name, capacity, _ in self.departments:
+            if capacity is None:
+                continue
+            base = self.baseline.get(pk, empty)
+            totals = [b + e for b, e in zip(base, extra[pk])]
+            ranges = self.over_capacity(totals, capacity)
+            if ranges:
+                bottlenecks.append(
+                    {
+                        "department": pk,
+                        "name": name,
+                        "capacity": capacity,
+                        "peak": max(totals),
+                        "first_date": ranges[0]["start"],
+                        "ranges": ranges,
+                    }
+                )
+        bottlenecks.sort(key=lambda row: (row["first_date"], row["name"]))
+        return {
+            "intake": intake,
+            "rotation_days": rotation_days,
+            "fits": not bottlenecks,
+            "bottlenecks": bottlenecks,
+        }
+
+    def over_capacity(self, totals, capacity):
+        """Run-length ``[start, end]`` ranges of days above ``capacity``."""
+        ranges = []
+        current = None
+        for offset, total in enumerate(totals):
+            if total > capacity:
+                if current is None:
+                    current = {"start": offset, "end": offset, "peak": total}
+                    ranges.append(current)
+                current["end"] = offset
+                current["peak"] = max(current["peak"], total)
+            else:
+                current = None
+        for row in ranges:
+            row["start"] = self.start + datetime.timedelta(days=row["start"])
+            row["end"] = self.start + datetime.timedelta(days=row["end"])
+        return ranges
+
+    def max_intake(self, rotation_days=None, offset=0):
+        """Largest intake that fits everywhere, or ``None`` if unbounded."""
+        if all(capacity is None for _, _, capacity, _ in self.departments):
+            return None
+
+        def fits(intake):
+            return self.run(intake, rotation_days, offset)["fits"]
+
+        if not fits(0):
+            return 0
+        low, high = 0, 1
+        while fits(high):
+            low, high = high, high * 2
+            if high > INTAKE_LIMIT:
+                return None
+        while high - low > 1:
+            middle = (low + high) // 2
+            if fits(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+
+
+def load_forecast(start, days):
+    """Forecast over the current plan: two queries, the occupancy one cached."""
+    departments = [
+        (pk, name, capacity, round(typical) if typical else DEFAULT_ROTATION_DAYS)
+        for pk, name, capacity, typical in Department.objects.filter(
+            rotations__isnull=False
+        )
+        .annotate(typical=Avg("rotations__duration"))
+        .order_by("name", "pk")
+        .values_list("pk", "name", "capacity", "typical")
+    ]
+    end = start + datetime.timedelta(days=days - 1)
+    return CapacityForecast(start, days, departments, department_occupancy(start, end))
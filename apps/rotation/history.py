@@ -0,0 +1,60 @@
+import datetime
+from itertools import groupby
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def history_rows(assignments):
+    """One joined query over ``assignments``, in timeline order per apprentice."""
+    return assignments.order_by(
+        "apprentice_id", "rotation__start_date", "rotation__end_date", "id"
+    ).values_list(
+        "apprentice_id",
+        "rotation__department_id",
+        "rotation__department__name",
+        "rotation__start_date",
+        "rotation__end_date",
+        "status",
+    )
+
+
+def timeline(rows):
+    """Run-length encode one apprentice's rotations into department segments.
+
+    ``rows`` are ``(department_id, name, start, end, status)`` sorted by
+    start. Back-to-back (or overlapping) rotations in the same department
+    collapse into one segment that counts them and keeps the latest status.
+    """
+    segments = []
+    for department_id, _, start, end, status in rows:
+        last = segments[-1] if segments else None
+        if (
+            last is not None
+            and last["department"] == department_id
+            and start <= last["end"] + ONE_DAY
+        ):
+            last["end"] = max(last["end"], end)
+            last["rotations"] += 1
+            last["status"] = status
+            continue
+        segments.append(
+            {
+                "department": department_id,
+                "start": start,
+                "end": end,
+                "rotations": 1,
+                "status": status,
+            }
+        )
+    return segments
+
+
+def iter_timelines(rows, departments):
+    """Yield ``(apprentice_id, segments)`` from ``history_rows`` output.
+
+    Department names seen on the way are collected into ``departments``.
+    """
+    for apprentice_id, group in groupby(rows, key=lambda row: row[0]):
+        group = list(group)
+        departments.update((row[1], row[2]) for row in group)
+        yield apprentice_id, timeline(row[1:] for row in group)
@@ -0,0 +1,47 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.rotation.forecast import load_forecast
+
+
+class Command(BaseCommand):
+    help = (
+        "Project department occupancy for one or more intake sizes on top of "
+        "the current rotation plan and list the bottleneck dates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("intakes", nargs="+", type=int)
+        parser.add_argument("--start", type=datetime.date.fromisoformat, default=None)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument(
+            "--rotation-days",
+            type=int,
+            action="append",
+            default=None,
+            help="Fixed rotation length; repeat to compare several.",
+        )
+
+    def handle(self, *args, **options):
+        start = options["start"] or datetime.date.today()
+        forecast = load_forecast(start, options["days"])
+        for length in options["rotation_days"] or [None]:
+            label = f"{length}-day rotations" if length else "current rotation lengths"
+            limit = forecast.max_intake(length)
+            self.stdout.write(
+                f"{label}: largest intake that fits is "
+                + ("unlimited" if limit is None else str(limit))
+            )
+            for intake in options["intakes"]:
+                result = forecast.run(intake, length)
+                if result["fits"]:
+                    self.stdout.write(self.style.SUCCESS(f"  +{intake}: fits"))
+                    continue
+                self.stdout.write(self.style.WARNING(f"  +{intake}: over capacity"))
+                for row in result["bottlenecks"]:
+                    for span in row["ranges"]:
+                        self.stdout.write(
+                            f"    {row['name']}: {span['start']} to {span['end']} "
+                            f"(peak {span['peak']} / {row['capacity']})"
+                        )
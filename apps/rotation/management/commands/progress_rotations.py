@@ -0,0 +1,64 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from apps.rotation.models import ApprenticeRotation
+from apps.rotation.signals import rotation_status_changed
+
+
+class Command(BaseCommand):
+    help = (
+        "Move rotation assignments to in_progress or completed as their "
+        "rotation's dates pass. Meant to be run periodically (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--date",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Progress as of this day (YYYY-MM-DD) instead of today.",
+        )
+
+    def handle(self, *args, **options):
+        today = options["date"] or datetime.date.today()
+        batch_size = options["batch_size"]
+
+        # Only forward moves; both branches use the rotation date indexes.
+        due = ApprenticeRotation.objects.filter(
+            Q(status="at_halt", rotation__start_date__lte=today)
+            | Q(status__in=["at_halt", "in_progress"], rotation__end_date__lt=today)
+        )
+        progressed = 0
+        while True:
+            with transaction.atomic():
+                # skip rows a concurrent run is already moving
+                batch = list(
+                    due.select_related("rotation")
+                    .select_for_update(skip_locked=True, of=("self",))
+                    .order_by("id")[:batch_size]
+                )
+                if not batch:
+                    break
+                transitions = []
+                for assignment in batch:
+                    status = assignment.rotation.status_on(today)
+                    transitions.append((assignment.pk, assignment.status, status))
+                    assignment.status = status
+                ApprenticeRotation.objects.bulk_update(batch, ["status"])
+            # one event per transition, once its chunk has committed
+            for assignment_id, old_status, new_status in transitions:
+                rotation_status_changed.send(
+                    sender=ApprenticeRotation,
+                    assignment_id=assignment_id,
+                    old_status=old_status,
+                    new_status=new_status,
+                )
+            progressed += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Progressed {progressed} rotation assignments.")
+        )
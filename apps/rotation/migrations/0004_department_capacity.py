@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rotation', '0003_remove_apprenticerotation_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rotation', '0004_department_capacity'),
+        ('user', '0003_remove_apprentice_project_remove_mentor_project_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apprenticerotation',
+            index=models.Index(fields=['status', 'rotation'], name='assignment_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rotation',
+            index=models.Index(fields=['start_date'], name='rotation_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rotation',
+            index=models.Index(fields=['end_date'], name='rotation_end_idx'),
+        ),
+    ]
@@ -7,6 +7,8 @@ from apps.user.models import Apprentice
 class Department(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
+    # apprentices the department can host at once; None means unlimited
+    capacity = models.PositiveIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -29,6 +31,32 @@ class Rotation(models.Model):
     def __str__(self):
         return self.name + " " + self.department.name + " " + str(self.id)
 
+    def status_on(self, day):
+        """Assignment status the rotation's dates imply on ``day``."""
+        if day > self.end_date:
+            return "completed"
+        if day >= self.start_date:
+            return "in_progress"
+        return "at_halt"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_date"], name="rotation_start_idx"),
+            models.Index(fields=["end_date"], name="rotation_end_idx"),
+        ]
+
+
+class ApprenticeRotationQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Trainers and staff see every assignment; mentors their apprentices'."""
+        if user.is_trainer or user.is_staff:
+            return self
+        if user.is_mentor:
+            return self.filter(apprentice__mentor_id=user.pk)
+        if user.is_apprentice:
+            return self.filter(apprentice_id=user.pk)
+        return self.none()
+
 
 class ApprenticeRotation(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -48,6 +76,13 @@ class ApprenticeRotation(models.Model):
         default="at_halt",
     )
 
+    objects = ApprenticeRotationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "rotation"], name="assignment_status_idx"),
+        ]
+
     def __str__(self):
         return (
             self.rotation.name
@@ -0,0 +1,105 @@
+import datetime
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from apps.rotation.models import ApprenticeRotation
+
+CACHE_KEY = "rotation:occupancy:{}:{}:{}"
+VERSION_KEY = "rotation:occupancy:version"
+# The default cache is per process, so a version bump only reaches the
+# worker that made the change; other workers serve a window for at most
+# this long before recounting.
+OCCUPANCY_TIMEOUT = 60
+
+
+def daily_headcount(intervals, start, end):
+    """Headcount per department for every day of ``[start, end]``.
+
+    ``intervals`` are ``(department_id, first_day, last_day)``. Each one
+    becomes a +1 event on its (clipped) first day and a -1 event the day
+    after its last, and one sweep over the sorted events yields the counts.
+    """
+    events = defaultdict(lambda: defaultdict(int))
+    for department_id, first_day, last_day in intervals:
+        first_day = max(first_day, start)
+        last_day = min(last_day, end)
+        if first_day > last_day:
+            continue
+        events[department_id][(first_day - start).days] += 1
+        events[department_id][(last_day - start).days + 1] -= 1
+
+    days = (end - start).days + 1
+    headcount = {}
+    for department_id, deltas in events.items():
+        counts = [0] * days
+        current = 0
+        previous = 0
+        for offset in sorted(deltas):
+            if offset >= days:
+                break
+            counts[previous:offset] = [current] * (offset - previous)
+            current += deltas[offset]
+            previous = offset
+        counts[previous:] = [current] * (days - previous)
+        headcount[department_id] = counts
+    return headcount
+
+
+def department_occupancy(start, end):
+    """Cached ``daily_headcount`` of all assignments overlapping the window.
+
+    Entries live ``OCCUPANCY_TIMEOUT`` seconds in the per-process cache, so
+    another worker's changes show up within that time.
+    """
+    version = cache.get_or_set(VERSION_KEY, 1, timeout=None)
+    key = CACHE_KEY.format(version, start.isoformat(), end.isoformat())
+    headcount = cache.get(key)
+    if headcount is None:
+        intervals = ApprenticeRotation.objects.filter(
+            rotation__start_date__lte=end, rotation__end_date__gte=start
+        ).values_list(
+            "rotation__department_id", "rotation__start_date", "rotation__end_date"
+        )
+        headcount = daily_headcount(intervals, start, end)
+        cache.set(key, headcount, timeout=OCCUPANCY_TIMEOUT)
+    return headcount
+
+
+def invalidate_occupancy():
+    """Drop every cached window at once by moving to a new key version.
+
+    The bump waits for the current transaction to commit: done earlier, a
+    concurrent read could cache the pre-commit counts under the new version.
+    """
+    transaction.on_commit(_bump_occupancy_version)
+
+
+def _bump_occupancy_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # nothing cached yet
+        pass
+
+
+def placement_counts(apprentice_id, current_id, requested_id, day=None):
+    """Assignments on ``day`` that validate a rotation change, in one query.
+
+    ``current`` counts the apprentice's assignments in ``current_id`` and
+    ``requested`` all assignments in ``requested_id``. Read straight from
+    the database, so every worker sees committed changes at once.
+    """
+    day = day or datetime.date.today()
+    return ApprenticeRotation.objects.filter(
+        rotation__department_id__in=[current_id, requested_id],
+        rotation__start_date__lte=day,
+        rotation__end_date__gte=day,
+    ).aggregate(
+        current=Count(
+            "pk", filter=Q(apprentice_id=apprentice_id, rotation__department_id=current_id)
+        ),
+        requested=Count("pk", filter=Q(rotation__department_id=requested_id)),
+    )
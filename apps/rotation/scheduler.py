@@ -0,0 +1,180 @@
+"""Greedy rotation scheduler.
+
+Apprentices are placed round by round: in each round every apprentice of
+the cohort gets at most one more rotation, so nobody is starved by an
+apprentice earlier in the list. Within a round an apprentice takes the first
+slot that fits in their preferred departments, otherwise the earliest
+fitting slot in any department they have not visited yet.
+
+A slot fits when it does not overlap the apprentice's other rotations and
+its department is under capacity for the slot's dates. Both checks are
+answered from sorted interval lists with ``bisect``, so a cohort of
+thousands is planned in memory from a single query of existing assignments.
+"""
+
+import bisect
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+
+from apps.rotation.models import ApprenticeRotation
+from apps.rotation.occupancy import invalidate_occupancy
+
+
+class ApprenticeTimeline:
+    """Busy ``[start, end]`` date intervals of one apprentice.
+
+    Existing assignments may overlap or nest, so ``add`` merges every
+    interval it touches; the stored intervals stay disjoint and sorted.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def overlaps(self, start, end):
+        # only the last interval starting on or before ``end`` can overlap
+        index = bisect.bisect_right(self.starts, end) - 1
+        return index >= 0 and self.ends[index] >= start
+
+    def add(self, start, end):
+        # disjoint and sorted, so ``ends`` is sorted too
+        first = bisect.bisect_left(self.ends, start)
+        last = bisect.bisect_right(self.starts, end)
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+
+
+class DepartmentLoad:
+    """Assignments of one department, counted per date window.
+
+    Every interval touching the window counts, whether or not they overlap
+    each other, so the count never underestimates occupancy.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def count(self, start, end):
+        ended_before = bisect.bisect_left(self.ends, start)
+        started_after = len(self.starts) - bisect.bisect_right(self.starts, end)
+        return len(self.starts) - ended_before - started_after
+
+    def add(self, start, end):
+        bisect.insort(self.starts, start)
+        bisect.insort(self.ends, end)
+
+
+class SchedulePlan:
+    """Unsaved assignments plus the apprentices that got fewer than asked."""
+
+    def __init__(self, assignments, shortfall):
+        self.assignments = assignments
+        self.shortfall = shortfall
+
+    def apply(self, batch_size=500):
+        with transaction.atomic():
+            created = ApprenticeRotation.objects.bulk_create(
+                self.assignments, batch_size=batch_size
+            )
+        # bulk_create sends no post_save
+        invalidate_occupancy()
+        return created
+
+
+def schedule(apprentice_ids, rotations, preferences=None, per_apprentice=None):
+    """Plan rotations for ``apprentice_ids`` over the ``rotations`` slots.
+
+    ``rotations`` should come with ``select_related("department")``.
+    ``preferences`` maps an apprentice id to department ids, most wanted
+    first. ``per_apprentice`` defaults to one rotation per department.
+    Existing assignments count against capacity and apprentice timelines.
+    """
+    preferences = preferences or {}
+    apprentice_ids = list(dict.fromkeys(apprentice_ids))
+    slots = defaultdict(list)
+    capacity = {}
+    for rotation in rotations:
+        slots[rotation.department_id].append(rotation)
+        capacity[rotation.department_id] = rotation.department.capacity
+    for department_slots in slots.values():
+        department_slots.sort(key=lambda rotation: (rotation.start_date, str(rotation.pk)))
+    if per_apprentice is None:
+        per_apprentice = len(slots)
+
+    timelines = defaultdict(ApprenticeTimeline)
+    visited = defaultdict(set)
+    loads = defaultdict(DepartmentLoad)
+    existing = ApprenticeRotation.objects.filter(
+        Q(apprentice_id__in=apprentice_ids) | Q(rotation__department_id__in=list(slots))
+    ).values_list(
+        "apprentice_id",
+        "rotation__department_id",
+        "rotation__start_date",
+        "rotation__end_date",
+    )
+    cohort = set(apprentice_ids)
+    for apprentice_id, department_id, start, end in existing:
+        loads[department_id].add(start, end)
+        if apprentice_id in cohort:
+            timelines[apprentice_id].add(start, end)
+            visited[apprentice_id].add(department_id)
+
+    def first_fit(apprentice_id, department_id):
+        timeline = timelines[apprentice_id]
+        limit = capacity[department_id]
+        for rotation in slots[department_id]:
+            if timeline.overlaps(rotation.start_date, rotation.end_date):
+                continue
+            if limit is not None and (
+                loads[department_id].count(rotation.start_date, rotation.end_date) >= limit
+            ):
+                continue
+            return rotation
+        return None
+
+    def pick(apprentice_id):
+        candidates = [d for d in slots if d not in visited[apprentice_id]]
+        for department_id in preferences.get(apprentice_id, ()):
+            if department_id in candidates:
+                rotation = first_fit(apprentice_id, department_id)
+                if rotation is not None:
+                    return rotation
+        fits = (first_fit(apprentice_id, d) for d in candidates)
+        return min(
+            (rotation for rotation in fits if rotation is not None),
+            key=lambda rotation: (rotation.start_date, str(rotation.pk)),
+            default=None,
+        )
+
+    assignments = []
+    placed = defaultdict(int)
+    active = list(apprentice_ids)
+    for round_number in range(per_apprentice):
+        if not active:
+            break
+        # rotate the order each round so the same apprentices do not always pick first
+        offset = round_number % len(active)
+        still_active = set()
+        for apprentice_id in active[offset:] + active[:offset]:
+            rotation = pick(apprentice_id)
+            if rotation is None:
+                continue
+            department_id = rotation.department_id
+            timelines[apprentice_id].add(rotation.start_date, rotation.end_date)
+            loads[department_id].add(rotation.start_date, rotation.end_date)
+            visited[apprentice_id].add(department_id)
+            placed[apprentice_id] += 1
+            assignments.append(
+                ApprenticeRotation(rotation=rotation, apprentice_id=apprentice_id)
+            )
+            still_active.add(apprentice_id)
+        active = [a for a in apprentice_ids if a in still_active]
+
+    shortfall = [a for a in apprentice_ids if placed[a] < per_apprentice]
+    return SchedulePlan(assignments, shortfall)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from apps.rotation.models import ApprenticeRotation, Rotation
+from apps.rotation.occupancy import invalidate_occupancy
+
+# Sent by progress_rotations once per changed assignment, after its batch
+# commits, with ``assignment_id``, ``old_status`` and ``new_status``.
+rotation_status_changed = Signal()
+
+
+@receiver(post_save, sender=ApprenticeRotation)
+@receiver(post_delete, sender=ApprenticeRotation)
+@receiver(post_save, sender=Rotation)
+@receiver(post_delete, sender=Rotation)
+def invalidate_cached_occupancy(sender, **kwargs):
+    invalidate_occupancy()
@@ -1,5 +1,10 @@
+from django.db import transaction
 from rest_framework import serializers
-from apps.tasks.models import Task
+from apps.projects.models import Project
+from apps.tasks.graph import find_blocking_path, invalidate_task_graphs
+from apps.tasks.models import ApprenticeWorkload, RecurringTask, Task, TaskDependency
+from apps.tasks.services import create_tasks, update_tasks
+from apps.user.models import Apprentice
 import datetime
 
 class TaskReadSerializer(serializers.ModelSerializer):
@@ -18,6 +23,8 @@ class TaskReadSerializer(serializers.ModelSerializer):
             "completed_at",
             "created_at",
             "updated_at",
+            "is_overdue",
+            "recurrence",
         ]
 
 
@@ -35,7 +42,7 @@ class TaskWriteSerializer(TaskReadSerializer):
         ]
     
     def create(self, validated_data):
-        validated_data["assigned_by"] = self.context["request"].user
+        validated_data["assigned_by"] = self.context["request"].user.mentor_profile
         validated_data["created_at"] = datetime.date.today()
         validated_data["assigned_at"] = datetime.date.today()
         return super().create(validated_data)
@@ -43,3 +50,303 @@ class TaskWriteSerializer(TaskReadSerializer):
     def update(self, instance, validated_data):
         validated_data["updated_at"] = datetime.date.today()
         return super().update(instance, validated_data)
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """Query parameters accepted by the task list."""
+
+    project = serializers.UUIDField(required=False)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    assigned_to = serializers.UUIDField(required=False)
+    due_after = serializers.DateField(required=False)
+    due_before = serializers.DateField(required=False)
+    overdue = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def filter(self, queryset):
+        data = self.validated_data
+        if "project" in data:
+            queryset = queryset.filter(project_id=data["project"])
+        if "status" in data:
+            queryset = queryset.filter(status=data["status"])
+        if "assigned_to" in data:
+            queryset = queryset.filter(assigned_to_id=data["assigned_to"])
+        if "due_after" in data:
+            queryset = queryset.filter(due_date__gte=data["due_after"])
+        if "due_before" in data:
+            queryset = queryset.filter(due_date__lte=data["due_before"])
+        if data.get("overdue") is not None:
+            queryset = queryset.filter(is_overdue=data["overdue"])
+        return queryset
+
+
+class TaskBulkAssignSerializer(serializers.Serializer):
+    """One task template fanned out to a set of apprentices on a project."""
+
+    TARGET_CHOICES = [
+        ("apprentices", "Listed apprentices"),
+        ("project", "All apprentices on the project"),
+        ("mentor", "All of the mentor's apprentices on the project"),
+    ]
+
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField()
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    due_date = serializers.DateField()
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, default="pending")
+    target = serializers.ChoiceField(choices=TARGET_CHOICES)
+    apprentices = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False
+    )
+
+    def validate(self, data):
+        mentor = self.context["request"].user.mentor_profile
+        project = data["project"]
+        if mentor.project_id != project.id:
+            raise serializers.ValidationError(
+                "You can only assign tasks on a project you mentor."
+            )
+
+        apprentices = Apprentice.objects.filter(project=project)
+        if data["target"] == "mentor":
+            apprentices = apprentices.filter(mentor=mentor)
+        elif data["target"] == "apprentices":
+            requested = set(data.get("apprentices", []))
+            if not requested:
+                raise serializers.ValidationError(
+                    {"apprentices": "This field is required for this target."}
+                )
+            apprentices = apprentices.filter(user_id__in=requested)
+
+        # Membership is resolved with this single query for the whole batch.
+        assignee_ids = list(apprentices.values_list("user_id", flat=True))
+        if data["target"] == "apprentices":
+            missing = requested - set(assignee_ids)
+            if missing:
+                raise serializers.ValidationError(
+                    {
+                        "apprentices": [
+                            f"Apprentice {pk} is not on this project." for pk in missing
+                        ]
+                    }
+                )
+        if not assignee_ids:
+            raise serializers.ValidationError("No apprentices match the target.")
+        data["assignee_ids"] = assignee_ids
+        data["mentor"] = mentor
+        return data
+
+    def create(self, validated_data):
+        tasks = [
+            Task(
+                title=validated_data["title"],
+                description=validated_data["description"],
+                status=validated_data["status"],
+                due_date=validated_data["due_date"],
+                project=validated_data["project"],
+                assigned_by=validated_data["mentor"],
+                assigned_to_id=assignee_id,
+            )
+            for assignee_id in validated_data["assignee_ids"]
+        ]
+        return create_tasks(tasks)
+
+
+class TaskCycleTimeQuerySerializer(serializers.Serializer):
+    GROUP_BY_CHOICES = [
+        ("project", "Project"),
+        ("mentor", "Mentor"),
+        ("apprentice", "Apprentice"),
+    ]
+
+    group_by = serializers.ChoiceField(choices=GROUP_BY_CHOICES, default="project")
+    project = serializers.UUIDField(required=False)
+
+
+class TaskCycleTimeSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    completed = serializers.IntegerField()
+    avg_lead_time_hours = serializers.FloatField()
+    avg_cycle_time_hours = serializers.FloatField(allow_null=True)
+
+
+class ApprenticeWorkloadSerializer(serializers.ModelSerializer):
+    completion_rate = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = ApprenticeWorkload
+        fields = [
+            "apprentice",
+            "project",
+            "pending_count",
+            "in_progress_count",
+            "completed_count",
+            "open_count",
+            "completion_rate",
+        ]
+
+
+class ApprenticeWorkloadQuerySerializer(serializers.Serializer):
+    ORDERING_CHOICES = [
+        ("open_count", "Least loaded first"),
+        ("-open_count", "Most loaded first"),
+    ]
+
+    project = serializers.UUIDField(required=False)
+    min_open = serializers.IntegerField(required=False, min_value=0)
+    max_open = serializers.IntegerField(required=False, min_value=0)
+    ordering = serializers.ChoiceField(choices=ORDERING_CHOICES, default="open_count")
+
+    def filter(self, queryset):
+        data = self.validated_data
+        if "project" in data:
+            queryset = queryset.filter(project_id=data["project"])
+        if "min_open" in data:
+            queryset = queryset.filter(open_count__gte=data["min_open"])
+        if "max_open" in data:
+            queryset = queryset.filter(open_count__lte=data["max_open"])
+        return queryset
+
+
+class TaskBatchFieldsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Task
+        fields = ["title", "description", "status", "due_date"]
+        extra_kwargs = {field: {"required": False} for field in fields}
+
+
+class TaskBatchItemSerializer(serializers.Serializer):
+    APPRENTICE_FIELDS = {"status"}
+
+    id = serializers.UUIDField()
+    fields = TaskBatchFieldsSerializer()
+
+    def validate_fields(self, fields):
+        if not fields:
+            raise serializers.ValidationError("At least one field must be changed.")
+        user = self.context["request"].user
+        if user.is_apprentice and not user.is_mentor:
+            forbidden = set(fields) - self.APPRENTICE_FIELDS
+            if forbidden:
+                raise serializers.ValidationError(
+                    f"Apprentices may only change: {', '.join(sorted(self.APPRENTICE_FIELDS))}."
+                )
+        return fields
+
+
+class TaskBatchUpdateSerializer(serializers.ListSerializer):
+    """``[{"id": ..., "fields": {...}}, ...]`` applied with one bulk_update."""
+
+    MAX_ITEMS = 500
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("child", TaskBatchItemSerializer())
+        kwargs.setdefault("allow_empty", False)
+        kwargs.setdefault("max_length", self.MAX_ITEMS)
+        super().__init__(*args, **kwargs)
+
+    def validate(self, items):
+        ids = [item["id"] for item in items]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each task may appear only once.")
+        return items
+
+    def apply(self, tasks):
+        """Apply the validated changes to ``tasks`` (a dict of id -> Task)."""
+        changed_fields = set()
+        for item in self.validated_data:
+            task = tasks[item["id"]]
+            for field, value in item["fields"].items():
+                setattr(task, field, value)
+                changed_fields.add(field)
+        return update_tasks(list(tasks.values()), sorted(changed_fields))
+
+
+class TaskBoardQuerySerializer(serializers.Serializer):
+    project = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class TaskDependencySerializer(serializers.ModelSerializer):
+    """Adds a blocked-by edge to ``context["task"]``, refusing cycles."""
+
+    class Meta:
+        model = TaskDependency
+        fields = ["task", "blocked_by", "created_at"]
+        read_only_fields = ["task", "created_at"]
+
+    def validate_blocked_by(self, blocked_by):
+        task = self.context["task"]
+        if blocked_by.pk == task.pk:
+            raise serializers.ValidationError("A task cannot block itself.")
+        if blocked_by.project_id != task.project_id:
+            raise serializers.ValidationError(
+                "Dependencies must be between tasks of the same project."
+            )
+        return blocked_by
+
+    def create(self, validated_data):
+        task = self.context["task"]
+        blocked_by = validated_data["blocked_by"]
+        with transaction.atomic():
+            # Serialise edge inserts per project so two requests cannot
+            # together close a cycle that neither sees alone.
+            list(Project.objects.select_for_update().filter(pk=task.project_id))
+            path = find_blocking_path(task.project_id, blocked_by.pk, task.pk)
+            if path:
+                raise serializers.ValidationError(
+                    {
+                        "blocked_by": "This dependency would create a cycle.",
+                        "cycle": [str(pk) for pk in [task.pk, *path]],
+                    }
+                )
+            dependency, _ = TaskDependency.objects.get_or_create(
+                task=task, blocked_by=blocked_by
+            )
+        invalidate_task_graphs([task.project_id])
+        return dependency
+
+
+class TaskGraphQuerySerializer(serializers.Serializer):
+    project = serializers.UUIDField()
+
+
+class RecurringTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RecurringTask
+        fields = [
+            "id",
+            "title",
+            "description",
+            "assigned_by",
+            "assigned_to",
+            "project",
+            "frequency",
+            "interval",
+            "starts_on",
+            "ends_on",
+            "materialized_until",
+            "created_at",
+        ]
+        read_only_fields = ["assigned_by", "materialized_until", "created_at"]
+        extra_kwargs = {"interval": {"min_value": 1}}
+
+    def validate(self, data):
+        if data.get("ends_on") and data["ends_on"] < data["starts_on"]:
+            raise serializers.ValidationError(
+                {"ends_on": "The end date must not be before the start date."}
+            )
+        mentor = self.context["request"].user.mentor_profile
+        if mentor.project_id != data["project"].id:
+            raise serializers.ValidationError(
+                "You can only assign tasks on a project you mentor."
+            )
+        if data["assigned_to"].project_id != data["project"].id:
+            raise serializers.ValidationError(
+                {"assigned_to": "This apprentice is not on this project."}
+            )
+        return data
+
+    def create(self, validated_data):
+        validated_data["assigned_by"] = self.context["request"].user.mentor_profile
+        return super().create(validated_data)
@@ -1,3 +1,614 @@
+import base64
+import datetime
+import io
+import json
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.graph import CACHE_KEY, TaskGraph, load_task_graph
+from apps.tasks.models import (
+    ApprenticeWorkload,
+    RecurringTask,
+    Task,
+    TaskCycleStats,
+    TaskDependency,
+    TaskStatusTransition,
+)
+from apps.tasks.signals import tasks_overdue
+from apps.user.models import Apprentice, Mentor, Trainer, User
+
+
+class TaskAPITestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer_user = self.create_user("trainer", is_trainer=True)
+        self.trainer = Trainer.objects.create(user=self.trainer_user)
+        self.project = Project.objects.create(name="Project", description="Project")
+        self.other_project = Project.objects.create(name="Other", description="Other")
+        self.mentor = Mentor.objects.create(
+            user=self.create_user("mentor", is_mentor=True),
+            trainer=self.trainer,
+            project=self.project,
+        )
+        self.other_mentor = Mentor.objects.create(
+            user=self.create_user("other-mentor", is_mentor=True),
+            trainer=self.trainer,
+            project=self.other_project,
+        )
+        self.apprentice = self.create_apprentice("apprentice", self.mentor, self.project)
+        self.other_apprentice = self.create_apprentice(
+            "other-apprentice", self.other_mentor, self.other_project
+        )
+
+    def create_user(self, name, **flags):
+        return User.objects.create_user(
+            email=f"{name}@example.com",
+            first_name=name,
+            last_name="User",
+            password="password123",
+            **flags,
+        )
+
+    def create_apprentice(self, name, mentor, project):
+        return Apprentice.objects.create(
+            user=self.create_user(name, is_apprentice=True),
+            trainer=self.trainer,
+            mentor=mentor,
+            project=project,
+        )
+
+    def create_task(self, apprentice=None, mentor=None, project=None, days=1, **fields):
+        return Task.objects.create(
+            title=fields.pop("title", "Task"),
+            description="Description",
+            assigned_by=mentor or self.mentor,
+            assigned_to=apprentice or self.apprentice,
+            project=project or self.project,
+            due_date=datetime.date.today() + datetime.timedelta(days=days),
+            **fields,
+        )
+
+
+class TaskListTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.own_tasks = [self.create_task(days=day) for day in range(5)]
+        self.foreign_task = self.create_task(
+            apprentice=self.other_apprentice,
+            mentor=self.other_mentor,
+            project=self.other_project,
+        )
+
+    def test_list_is_scoped_per_role(self):
+        for user, expected in (
+            (self.trainer_user, 6),
+            (self.mentor.user, 5),
+            (self.apprentice.user, 5),
+            (self.other_apprentice.user, 1),
+        ):
+            self.client.force_authenticate(user)
+            response = self.client.get("/api/v1/tasks/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), expected)
+
+    def test_keyset_pages_follow_due_date(self):
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.get("/api/v1/tasks/", {"page_size": 2})
+        seen = [task["id"] for task in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen.extend(task["id"] for task in response.data["results"])
+        self.assertEqual(seen, [str(task.id) for task in self.own_tasks])
+
+    def test_tampered_cursor_is_not_found(self):
+        self.client.force_authenticate(self.mentor.user)
+        for values in (["not-a-date", "x"], ["2026-01-01", "not-a-uuid"], [1, 2], ["a"]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            response = self.client.get("/api/v1/tasks/", {"cursor": cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filters(self):
+        self.own_tasks[0].status = "completed"
+        self.own_tasks[0].save()
+        self.client.force_authenticate(self.trainer_user)
+
+        response = self.client.get(
+            "/api/v1/tasks/", {"project": self.project.id, "status": "pending"}
+        )
+        self.assertEqual(len(response.data["results"]), 4)
+
+        today = datetime.date.today()
+        response = self.client.get(
+            "/api/v1/tasks/",
+            {
+                "due_after": today + datetime.timedelta(days=1),
+                "due_before": today + datetime.timedelta(days=2),
+            },
+        )
+        self.assertEqual(len(response.data["results"]), 3)
+
+        response = self.client.get("/api/v1/tasks/", {"status": "unknown"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail_hides_foreign_tasks(self):
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.get(f"/api/v1/tasks/{self.foreign_task.id}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f"/api/v1/tasks/{self.own_tasks[0].id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TaskBulkAssignTests(TaskAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.second_apprentice = self.create_apprentice(
+            "second-apprentice", self.other_mentor, self.project
+        )
+        self.client.force_authenticate(self.mentor.user)
+        self.payload = {
+            "title": "Weekly report",
+            "description": "Write it",
+            "project": str(self.project.id),
+            "due_date": str(datetime.date.today()),
+        }
+
+    def test_assigns_every_apprentice_on_project(self):
+        response = self.client.post(
+            "/api/v1/tasks/bulk-assign/",
+            {**self.payload, "target": "project"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(Task.objects.values_list("assigned_to_id", flat=True)),
+            {self.apprentice.pk, self.second_apprentice.pk},
+        )
+
+    def test_mentor_target_only_includes_own_apprentices(self):
+        response = self.client.post(
+            "/api/v1/tasks/bulk-assign/",
+            {**self.payload, "target": "mentor"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 1)
+
+    def test_rejects_apprentices_outside_project(self):
+        response = self.client.post(
+            "/api/v1/tasks/bulk-assign/",
+            {
+                **self.payload,
+                "target": "apprentices",
+                "apprentices": [
+                    str(self.apprentice.pk),
+                    str(self.other_apprentice.pk),
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.exists())
+
+
+class OverdueTaskTests(TaskAPITestCase):
+    def test_sweeper_flags_and_list_filters(self):
+        late = self.create_task(days=5)
+        on_time = self.create_task(days=5)
+        done = self.create_task(days=5, status="completed")
+        # Time passes without the tasks being saved again.
+        Task.objects.filter(pk__in=[late.pk, done.pk]).update(
+            due_date=datetime.date.today() - datetime.timedelta(days=1)
+        )
+        events = []
+
+        def receiver(task_ids, **kwargs):
+            events.extend(task_ids)
+
+        tasks_overdue.connect(receiver)
+        self.addCleanup(tasks_overdue.disconnect, receiver)
+
+        call_command("flag_overdue_tasks", stdout=io.StringIO())
+
+        self.assertEqual(events, [late.pk])
+        self.client.force_authenticate(self.trainer_user)
+        response = self.client.get("/api/v1/tasks/", {"overdue": "true"})
+        self.assertEqual([t["id"] for t in response.data["results"]], [str(late.pk)])
+        response = self.client.get("/api/v1/tasks/")
+        self.assertEqual(len(response.data["results"]), 3)
+        on_time.refresh_from_db()
+        self.assertFalse(on_time.is_overdue)
+
+    def test_completing_clears_flag(self):
+        task = self.create_task(days=-1)
+        self.assertTrue(task.is_overdue)
+        task.status = "completed"
+        task.save(update_fields=["status"])
+        task.refresh_from_db()
+        self.assertFalse(task.is_overdue)
+
+
+class TaskStatusHistoryTests(TaskAPITestCase):
+    def test_transitions_and_cycle_time(self):
+        task = self.create_task()
+        self.client.force_authenticate(self.mentor.user)
+        for new_status in ("in_progress", "in_progress", "completed"):
+            response = self.client.put(
+                f"/api/v1/tasks/{task.id}",
+                {
+                    "title": task.title,
+                    "description": task.description,
+                    "status": new_status,
+                    "assigned_to": str(self.apprentice.pk),
+                    "project": str(self.project.pk),
+                    "due_date": str(task.due_date),
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            list(
+                TaskStatusTransition.objects.filter(task=task)
+                .order_by("changed_at", "id")
+                .values_list("from_status", "to_status")
+            ),
+            [("", "pending"), ("pending", "in_progress"), ("in_progress", "completed")],
+        )
+        stats = TaskCycleStats.objects.get()
+        self.assertEqual((stats.completed_count, stats.cycle_count), (1, 1))
+
+        response = self.client.get(
+            "/api/v1/tasks/metrics/cycle-time/", {"group_by": "apprentice"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["key"], str(self.apprentice.pk))
+        self.assertEqual(response.data[0]["completed"], 1)
+        self.assertIsNotNone(response.data[0]["avg_cycle_time_hours"])
+
+        self.client.force_authenticate(self.other_mentor.user)
+        response = self.client.get("/api/v1/tasks/metrics/cycle-time/")
+        self.assertEqual(response.data, [])
+
+    def test_rebuild_matches_incremental(self):
+        started, direct, reopened = self.create_task(), self.create_task(), self.create_task()
+        self.create_task(apprentice=self.other_apprentice, status="completed")
+        for task, steps in (
+            (started, ["in_progress", "completed"]),
+            (direct, ["completed"]),
+            (reopened, ["completed", "in_progress", "completed"]),
+        ):
+            for new_status in steps:
+                task.status = new_status
+                task.save()
+        columns = ("completed_count", "lead_time_seconds", "cycle_count", "cycle_time_seconds")
+        incremental = set(TaskCycleStats.objects.values_list("apprentice_id", *columns))
+        self.assertEqual(
+            {row[:2] for row in incremental},
+            {(self.apprentice.pk, 3), (self.other_apprentice.pk, 1)},
+        )
+
+        call_command("rebuild_task_cycle_stats", stdout=io.StringIO())
+        self.assertEqual(
+            set(TaskCycleStats.objects.values_list("apprentice_id", *columns)), incremental
+        )
+
+
+class ApprenticeWorkloadTests(TaskAPITestCase):
+    def counts(self):
+        return {
+            (w.apprentice_id, w.project_id): (
+                w.pending_count,
+                w.in_progress_count,
+                w.completed_count,
+                w.open_count,
+            )
+            for w in ApprenticeWorkload.objects.all()
+        }
+
+    def test_rollup_follows_task_writes_and_matches_rebuild(self):
+        tasks = [self.create_task() for _ in range(3)]
+        self.create_task(
+            apprentice=self.other_apprentice,
+            mentor=self.other_mentor,
+            project=self.other_project,
+        )
+        tasks[0].status = "completed"
+        tasks[0].save()
+        tasks[1].assigned_to = self.other_apprentice
+        tasks[1].save()
+        tasks[2].delete()
+
+        incremental = self.counts()
+        self.assertEqual(
+            incremental[(self.apprentice.pk, self.project.pk)], (0, 0, 1, 0)
+        )
+        self.assertEqual(
+            incremental[(self.other_apprentice.pk, self.project.pk)], (1, 0, 0, 1)
+        )
+
+        call_command("rebuild_apprentice_workloads", stdout=io.StringIO())
+        rebuilt = self.counts()
+        self.assertEqual(
+            {key: value for key, value in incremental.items() if any(value)}, rebuilt
+        )
+
+    def test_deleting_an_apprentice_drops_its_rollup(self):
+        self.create_task()
+        self.create_task(status="completed")
+        self.apprentice.user.delete()
+        self.assertFalse(
+            ApprenticeWorkload.objects.filter(apprentice_id=self.apprentice.pk).exists()
+        )
+        self.assertFalse(Task.objects.filter(assigned_to_id=self.apprentice.pk).exists())
+
+    def test_deleting_a_project_drops_its_rollup(self):
+        self.create_task(apprentice=self.other_apprentice, project=self.other_project)
+        self.create_task()
+        self.other_project.delete()
+        self.assertEqual(set(self.counts()), {(self.apprentice.pk, self.project.pk)})
+
+    def test_endpoint_sorts_by_open_count(self):
+        for _ in range(3):
+            self.create_task()
+        self.create_task(
+            apprentice=self.other_apprentice,
+            mentor=self.other_mentor,
+            project=self.other_project,
+        )
+        self.client.force_authenticate(self.trainer_user)
+        response = self.client.get("/api/v1/tasks/workload/", {"ordering": "-open_count"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["open_count"] for row in response.data["results"]], [3, 1]
+        )
+        response = self.client.get("/api/v1/tasks/workload/", {"min_open": 2})
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class TaskBatchUpdateTests(TaskAPITestCase):
+    def patch_statuses(self, tasks, new_status):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                "/api/v1/tasks/batch/",
+                [{"id": str(task.id), "fields": {"status": new_status}} for task in tasks],
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_batch_completes_tasks(self):
+        tasks = [self.create_task() for _ in range(4)]
+        self.client.force_authenticate(self.apprentice.user)
+        single = self.patch_statuses(tasks[:1], "completed")
+        self.assertEqual(self.patch_statuses(tasks[1:], "completed"), single)
+        for task in tasks:
+            task.refresh_from_db()
+            self.assertEqual(task.status, "completed")
+            self.assertEqual(task.completed_at, datetime.date.today())
+        workload = ApprenticeWorkload.objects.get(apprentice=self.apprentice)
+        self.assertEqual((workload.open_count, workload.completed_count), (0, 4))
+        self.assertEqual(TaskCycleStats.objects.get().completed_count, 4)
+
+    def test_apprentice_cannot_change_other_fields(self):
+        task = self.create_task()
+        self.client.force_authenticate(self.apprentice.user)
+        response = self.client.patch(
+            "/api/v1/tasks/batch/",
+            [{"id": str(task.id), "fields": {"title": "Renamed"}}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_foreign_tasks_reject_whole_batch(self):
+        own = self.create_task()
+        foreign = self.create_task(
+            apprentice=self.other_apprentice,
+            mentor=self.other_mentor,
+            project=self.other_project,
+        )
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.patch(
+            "/api/v1/tasks/batch/",
+            [
+                {"id": str(task.id), "fields": {"status": "in_progress"}}
+                for task in (own, foreign)
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["missing"], [str(foreign.id)])
+        own.refresh_from_db()
+        self.assertEqual(own.status, "pending")
+
+
+class TaskBoardTests(TaskAPITestCase):
+    def test_board_columns_and_column_cursor(self):
+        pending = [self.create_task(days=day) for day in range(3)]
+        self.create_task(status="in_progress")
+        self.client.force_authenticate(self.mentor.user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/v1/tasks/board/", {"project": self.project.id, "limit": 2}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        columns = {column["status"]: column for column in response.data["columns"]}
+        self.assertEqual(
+            {value: column["total"] for value, column in columns.items()},
+            {"pending": 3, "in_progress": 1, "completed": 0},
+        )
+        self.assertEqual(
+            [task["id"] for task in columns["pending"]["results"]],
+            [str(task.id) for task in pending[:2]],
+        )
+        self.assertIsNone(columns["in_progress"]["next"])
+
+        response = self.client.get(columns["pending"]["next"])
+        self.assertEqual(response.data["status"], "pending")
+        self.assertEqual(
+            [task["id"] for task in response.data["results"]], [str(pending[2].id)]
+        )
+        self.assertIsNone(response.data["next"])
+
+
+class TaskGraphTests(TestCase):
+    def setUp(self):
+        start = datetime.date(2026, 1, 1)
+        self.graph = TaskGraph(
+            {
+                "design": ("completed", start, start + datetime.timedelta(days=3)),
+                "build": ("pending", start, start + datetime.timedelta(days=10)),
+                "docs": ("pending", start, start + datetime.timedelta(days=2)),
+                "ship": ("pending", start, start + datetime.timedelta(days=1)),
+            },
+            [("build", "design"), ("docs", "design"), ("ship", "build"), ("ship", "docs")],
+        )
+
+    def test_order_unblocked_and_critical_path(self):
+        order = self.graph.topological_order()
+        self.assertEqual(order[0], "design")
+        self.assertEqual(order[-1], "ship")
+        self.assertEqual(self.graph.unblocked(), ["docs", "build"])
+
+        today = datetime.date(2026, 1, 1)
+        path = self.graph.critical_path(today, end_date=datetime.date(2026, 1, 20))
+        self.assertEqual(path["tasks"], ["build", "ship"])
+        self.assertEqual(path["remaining_days"], 11)
+        self.assertEqual(path["slack_days"], 8)
+
+    def test_find_path_detects_cycle(self):
+        # Making design blocked by ship would close ship -> build -> design.
+        path = self.graph.find_path("ship", "design")
+        self.assertIn(path, (["ship", "build", "design"], ["ship", "docs", "design"]))
+        self.assertIsNone(self.graph.find_path("design", "ship"))
+
+
+class TaskDependencyAPITests(TaskAPITestCase):
+    def test_cycle_is_rejected(self):
+        first, second = self.create_task(), self.create_task()
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.post(
+            f"/api/v1/tasks/{second.id}/dependencies/",
+            {"blocked_by": str(first.id)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get("/api/v1/tasks/graph/", {"project": self.project.id})
+        self.assertEqual(response.data["order"], [first.id, second.id])
+        self.assertEqual(response.data["unblocked"], [first.id])
+
+        response = self.client.post(
+            f"/api/v1/tasks/{first.id}/dependencies/",
+            {"blocked_by": str(second.id)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cycle", response.data)
+
+        # the cached graph is dropped once the status changes commit
+        with self.captureOnCommitCallbacks(execute=True):
+            second.status = "completed"
+            second.save()
+            first.status = "completed"
+            first.save()
+        response = self.client.get("/api/v1/tasks/graph/", {"project": self.project.id})
+        self.assertEqual(response.data["unblocked"], [])
+
+    def test_cycle_check_ignores_a_stale_cached_graph(self):
+        first, second = self.create_task(), self.create_task()
+        # another worker's cached graph, from before the first edge was added
+        stale = load_task_graph(self.project.id)
+        TaskDependency.objects.create(task=second, blocked_by=first)
+        cache.set(CACHE_KEY.format(self.project.id), stale)
+
+        self.client.force_authenticate(self.mentor.user)
+        response = self.client.post(
+            f"/api/v1/tasks/{first.id}/dependencies/",
+            {"blocked_by": str(second.id)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["cycle"], [str(first.id), str(second.id), str(first.id)])
+
+
+class RecurringTaskTests(TaskAPITestCase):
+    def create_rule(self, **fields):
+        return RecurringTask.objects.create(
+            title="Check-in",
+            description="Weekly check-in",
+            assigned_by=self.mentor,
+            assigned_to=self.apprentice,
+            project=self.project,
+            **fields,
+        )
+
+    def test_create_is_limited_to_the_mentors_project(self):
+        self.client.force_authenticate(self.mentor.user)
+        rule = {
+            "title": "Check-in",
+            "description": "Weekly check-in",
+            "frequency": "weekly",
+            "starts_on": datetime.date.today(),
+        }
+        for assigned_to, project in (
+            (self.other_apprentice, self.other_project),
+            (self.other_apprentice, self.project),
+        ):
+            response = self.client.post(
+                "/api/v1/tasks/recurring/",
+                {**rule, "assigned_to": assigned_to.pk, "project": project.pk},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(RecurringTask.objects.exists())
+
+        response = self.client.post(
+            "/api/v1/tasks/recurring/",
+            {**rule, "assigned_to": self.apprentice.pk, "project": self.project.pk},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_occurrence_dates(self):
+        weekly = self.create_rule(frequency="weekly", starts_on=datetime.date(2026, 1, 5))
+        self.assertEqual(
+            weekly.occurrence_dates(datetime.date(2026, 1, 10), datetime.date(2026, 1, 26)),
+            [datetime.date(2026, 1, 12), datetime.date(2026, 1, 19), datetime.date(2026, 1, 26)],
+        )
+        monthly = self.create_rule(
+            frequency="monthly",
+            starts_on=datetime.date(2026, 1, 31),
+            ends_on=datetime.date(2026, 4, 1),
+        )
+        self.assertEqual(
+            monthly.occurrence_dates(datetime.date(2026, 1, 1), datetime.date(2026, 12, 31)),
+            [datetime.date(2026, 1, 31), datetime.date(2026, 2, 28), datetime.date(2026, 3, 31)],
+        )
+
+    def test_list_materializes_only_the_queried_window(self):
+        today = datetime.date.today()
+        rule = self.create_rule(frequency="weekly", starts_on=today)
+        self.assertFalse(Task.objects.exists())
+
+        self.client.force_authenticate(self.apprentice.user)
+        window = {"due_before": today + datetime.timedelta(days=20)}
+        response = self.client.get("/api/v1/tasks/", window)
+        self.assertEqual(len(response.data["results"]), 3)
+        rule.refresh_from_db()
+        self.assertEqual(rule.materialized_until, window["due_before"])
 
-# Create your tests here.
+        # A second query over the same window creates nothing new.
+        with self.assertNumQueries(4):
+            self.client.get("/api/v1/tasks/", window)
+        self.assertEqual(Task.objects.filter(recurrence=rule).count(), 3)
+        self.assertEqual(
+            ApprenticeWorkload.objects.get(apprentice=self.apprentice).pending_count, 3
+        )
@@ -1,7 +1,48 @@
 from django.urls import path
-from .views import TaskListCreateAPIView, TaskDetailAPIView
+from .views import (
+    TaskListCreateAPIView,
+    TaskDetailAPIView,
+    TaskBulkAssignAPIView,
+    TaskCycleTimeAPIView,
+    ApprenticeWorkloadAPIView,
+    TaskBatchUpdateAPIView,
+    TaskBoardAPIView,
+    TaskDependencyCreateAPIView,
+    TaskDependencyDetailAPIView,
+    TaskGraphAPIView,
+    RecurringTaskListCreateAPIView,
+    RecurringTaskDetailAPIView,
+)
 
 urlpatterns = [
     path("", TaskListCreateAPIView.as_view(), name="task-list-create"),
-    path("<int:pk>", TaskDetailAPIView.as_view(), name="task-detail"),
+    path("bulk-assign/", TaskBulkAssignAPIView.as_view(), name="task-bulk-assign"),
+    path(
+        "metrics/cycle-time/", TaskCycleTimeAPIView.as_view(), name="task-cycle-time"
+    ),
+    path("batch/", TaskBatchUpdateAPIView.as_view(), name="task-batch-update"),
+    path("board/", TaskBoardAPIView.as_view(), name="task-board"),
+    path("graph/", TaskGraphAPIView.as_view(), name="task-graph"),
+    path(
+        "recurring/",
+        RecurringTaskListCreateAPIView.as_view(),
+        name="recurring-task-list-create",
+    ),
+    path(
+        "recurring/<uuid:pk>/",
+        RecurringTaskDetailAPIView.as_view(),
+        name="recurring-task-detail",
+    ),
+    path("workload/", ApprenticeWorkloadAPIView.as_view(), name="task-workload"),
+    path("<uuid:pk>", TaskDetailAPIView.as_view(), name="task-detail"),
+    path(
+        "<uuid:pk>/dependencies/",
+        TaskDependencyCreateAPIView.as_view(),
+        name="task-dependency-create",
+    ),
+    path(
+        "<uuid:pk>/dependencies/<uuid:blocked_by>/",
+        TaskDependencyDetailAPIView.as_view(),
+        name="task-dependency-detail",
+    ),
 ]
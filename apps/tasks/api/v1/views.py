@@ -1,55 +1,221 @@
+import datetime
+from django.db import transaction
+from django.db.models import Count, F, Sum, Window
+from django.db.models.functions import RowNumber
+from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from .serializers import TaskReadSerializer, TaskWriteSerializer
-from apps.tasks.models import Task
+from rest_framework.utils.urls import replace_query_param
+from .serializers import (
+    TaskReadSerializer,
+    TaskWriteSerializer,
+    TaskFilterSerializer,
+    TaskBulkAssignSerializer,
+    TaskCycleTimeQuerySerializer,
+    TaskCycleTimeSerializer,
+    ApprenticeWorkloadSerializer,
+    ApprenticeWorkloadQuerySerializer,
+    TaskBatchUpdateSerializer,
+    TaskBoardQuerySerializer,
+    TaskDependencySerializer,
+    TaskGraphQuerySerializer,
+    RecurringTaskSerializer,
+)
+from apps.projects.models import Project
+from apps.tasks.graph import invalidate_task_graphs, load_task_graph
+from apps.core.pagination import KeysetPagination
+from apps.core.permissions import IsMentor, IsMentorOrTrainerOrAdmin, IsTrainerOrAdmin
+from apps.tasks.models import (
+    ApprenticeWorkload,
+    RecurringTask,
+    Task,
+    TaskCycleStats,
+    TaskDependency,
+)
+from apps.tasks.services import materialize_occurrences
 from drf_yasg.utils import swagger_auto_schema
 
 
+# Furthest ahead a task list query may materialize recurring occurrences.
+RECURRENCE_HORIZON = datetime.timedelta(days=366)
+
+
+class TaskPagination(KeysetPagination):
+    ordering = ("due_date", "id")
+
+
+class TaskBoardPagination(TaskPagination):
+    page_size = 20
+    page_size_query_param = "limit"
+    max_page_size = 100
+
+
 class TaskListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated]
     @swagger_auto_schema(
         operation_summary="Get all tasks",
-        operation_description="Get all tasks (Apprentice, Mentor, Trainer)",
+        operation_description="Get all tasks (Apprentice, Mentor, Trainer), ordered by due date and keyset-paginated",
+        query_serializer=TaskFilterSerializer,
         responses={200: TaskReadSerializer(many=True)}
     )
     def get(self, request):
-        if request.user.is_trainer:
-            tasks = Task.objects.all()
-        elif request.user.is_mentor:
-            tasks = Task.objects.filter(assigned_by=request.user)
-        elif request.user.is_apprentice:
-            tasks = Task.objects.filter(assigned_to=request.user)
-        serializer = TaskReadSerializer(tasks, many=True)
-        return Response(serializer.data)
+        filters = TaskFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        self.materialize_recurring(request.user, filters.validated_data)
+        tasks = filters.filter(Task.objects.visible_to(request.user))
+        paginator = TaskPagination()
+        page = paginator.paginate_queryset(tasks, request, view=self)
+        serializer = TaskReadSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def materialize_recurring(self, user, filters):
+        """Expand recurring tasks only as far as the requested window."""
+        today = datetime.date.today()
+        until = min(filters.get("due_before", today), today + RECURRENCE_HORIZON)
+        rules = RecurringTask.objects.visible_to(user)
+        if "project" in filters:
+            rules = rules.filter(project_id=filters["project"])
+        if "assigned_to" in filters:
+            rules = rules.filter(assigned_to_id=filters["assigned_to"])
+        materialize_occurrences(rules, until)
 
     @swagger_auto_schema(
         operation_summary="Create a task",
         operation_description="Create a task (Mentor only)",
         request_body=TaskWriteSerializer, responses={201: TaskReadSerializer}
     )
+    @transaction.atomic
     def post(self, request):
-        if request.user.is_apprentice:
+        if not request.user.is_mentor:
             return Response(status=status.HTTP_403_FORBIDDEN)
-        serializer = TaskWriteSerializer(data=request.data)
+        serializer = TaskWriteSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class TaskBulkAssignAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsMentor]
+
+    @swagger_auto_schema(
+        operation_summary="Assign a task to many apprentices",
+        operation_description="Create one task per apprentice from a single template, targeting listed apprentices, every apprentice on the project, or the mentor's own apprentices on it (Mentor only)",
+        request_body=TaskBulkAssignSerializer,
+        responses={201: TaskReadSerializer(many=True)}
+    )
+    def post(self, request):
+        serializer = TaskBulkAssignSerializer(
+            data=request.data, context={"request": request}
+        )
+        if serializer.is_valid():
+            tasks = serializer.save()
+            return Response(
+                TaskReadSerializer(tasks, many=True).data,
+                status=status.HTTP_201_CREATED,
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TaskBatchUpdateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Update many tasks",
+        operation_description="Partially update a list of tasks in one transaction; apprentices may only change status (Apprentice, Mentor, Trainer)",
+        request_body=TaskBatchUpdateSerializer,
+        responses={200: TaskReadSerializer(many=True), 404: "Unknown or foreign task ids"}
+    )
+    @transaction.atomic
+    def patch(self, request):
+        serializer = TaskBatchUpdateSerializer(
+            data=request.data, context={"request": request}
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = [item["id"] for item in serializer.validated_data]
+        tasks = (
+            Task.objects.visible_to(request.user)
+            .select_for_update()
+            .in_bulk(ids)
+        )
+        missing = [str(pk) for pk in ids if pk not in tasks]
+        if missing:
+            return Response(
+                {"detail": "Tasks not found.", "missing": missing},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        updated = serializer.apply(tasks)
+        return Response(TaskReadSerializer(updated, many=True).data)
+
+
+class TaskBoardAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Task board for a project",
+        operation_description="First `limit` tasks of each status column with column totals; pass `status` and that column's `cursor` to load more of one column (Apprentice, Mentor, Trainer)",
+        query_serializer=TaskBoardQuerySerializer,
+    )
+    def get(self, request):
+        query = TaskBoardQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = query.validated_data
+        tasks = Task.objects.visible_to(request.user).filter(project_id=params["project"])
+        paginator = TaskBoardPagination()
+
+        if "status" in params:
+            page = paginator.paginate_queryset(
+                tasks.filter(status=params["status"]), request, view=self
+            )
+            return Response(
+                {
+                    "status": params["status"],
+                    "results": TaskReadSerializer(page, many=True).data,
+                    "next": paginator.get_next_link(),
+                }
+            )
+
+        # One query: rank tasks within each status and keep the first `limit`.
+        ranked = tasks.annotate(
+            position=Window(
+                RowNumber(),
+                partition_by=[F("status")],
+                order_by=[F(field).asc() for field in TaskPagination.ordering],
+            ),
+            column_total=Window(Count("id"), partition_by=[F("status")]),
+        ).filter(position__lte=params["limit"])
+        columns = {
+            value: {"status": value, "total": 0, "results": [], "next": None}
+            for value, _ in Task.STATUS_CHOICES
+        }
+        rows = {value: [] for value in columns}
+        for task in ranked.order_by("status", "position"):
+            rows[task.status].append(task)
+            columns[task.status]["total"] = task.column_total
+
+        base_url = request.build_absolute_uri()
+        for value, column in columns.items():
+            column["results"] = TaskReadSerializer(rows[value], many=True).data
+            if column["total"] > len(rows[value]):
+                url = replace_query_param(base_url, "status", value)
+                column["next"] = replace_query_param(
+                    url,
+                    paginator.cursor_query_param,
+                    paginator.encode_cursor(paginator.position_of(rows[value][-1])),
+                )
+        return Response({"columns": list(columns.values())})
+
+
 class TaskDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
     def get_object(self, pk):
         try:
-            if self.request.user.is_apprentice:
-                return Task.objects.get(pk=pk, assigned_to=self.request.user)
-            elif self.request.user.is_mentor:
-                return Task.objects.get(pk=pk, assigned_by=self.request.user)
-            elif self.request.user.is_trainer:
-                return Task.objects.get(pk=pk)
-            return None
+            return Task.objects.visible_to(self.request.user).get(pk=pk)
         except Task.DoesNotExist:
             return None
 
@@ -70,6 +236,7 @@ class TaskDetailAPIView(APIView):
         operation_description="Update a task (Mentor only)",
         request_body=TaskWriteSerializer, responses={200: TaskReadSerializer}
     )
+    @transaction.atomic
     def put(self, request, pk):
         task = self.get_object(pk)
         if not task:
@@ -85,6 +252,7 @@ class TaskDetailAPIView(APIView):
         operation_description="Delete a task (Mentor only)",
         responses={204: "No Content"}
     )
+    @transaction.atomic
     def delete(self, request, pk):
         if request.user.is_apprentice:
             return Response(status=status.HTTP_403_FORBIDDEN)
@@ -93,3 +261,179 @@ class TaskDetailAPIView(APIView):
             return Response(status=status.HTTP_404_NOT_FOUND)
         task.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TaskCycleTimeAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Task lead and cycle time",
+        operation_description="Average lead time (created to completed) and cycle time (started to completed) grouped by project, mentor or apprentice, read from incrementally maintained totals",
+        query_serializer=TaskCycleTimeQuerySerializer,
+        responses={200: TaskCycleTimeSerializer(many=True)}
+    )
+    def get(self, request):
+        query = TaskCycleTimeQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        stats = TaskCycleStats.objects.visible_to(request.user)
+        if "project" in query.validated_data:
+            stats = stats.filter(project_id=query.validated_data["project"])
+        group_field = query.validated_data["group_by"] + "_id"
+        rows = (
+            stats.values(group_field)
+            .annotate(
+                completed=Sum("completed_count"),
+                lead=Sum("lead_time_seconds"),
+                cycles=Sum("cycle_count"),
+                cycle=Sum("cycle_time_seconds"),
+            )
+            .order_by(group_field)
+        )
+        data = [
+            {
+                "key": row[group_field],
+                "completed": row["completed"],
+                "avg_lead_time_hours": round(row["lead"] / row["completed"] / 3600, 2),
+                "avg_cycle_time_hours": (
+                    round(row["cycle"] / row["cycles"] / 3600, 2) if row["cycles"] else None
+                ),
+            }
+            for row in rows
+            if row["completed"]
+        ]
+        return Response(TaskCycleTimeSerializer(data, many=True).data)
+
+
+class ApprenticeWorkloadAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Apprentice workload",
+        operation_description="Open, in-progress and completed task counts per apprentice and project, sorted and filtered by open load (Trainer only)",
+        query_serializer=ApprenticeWorkloadQuerySerializer,
+        responses={200: ApprenticeWorkloadSerializer(many=True)}
+    )
+    def get(self, request):
+        query = ApprenticeWorkloadQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        workloads = query.filter(ApprenticeWorkload.objects.all())
+        paginator = KeysetPagination(ordering=(query.validated_data["ordering"], "id"))
+        page = paginator.paginate_queryset(workloads, request, view=self)
+        serializer = ApprenticeWorkloadSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class TaskDependencyCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsMentorOrTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Add a blocked-by dependency",
+        operation_description="Mark the task as blocked by another task of the same project; rejected if it would create a cycle (Mentor, Trainer)",
+        request_body=TaskDependencySerializer,
+        responses={201: TaskDependencySerializer, 400: "Bad Request or cycle"}
+    )
+    def post(self, request, pk):
+        task = get_object_or_404(Task.objects.visible_to(request.user), pk=pk)
+        serializer = TaskDependencySerializer(data=request.data, context={"task": task})
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TaskDependencyDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsMentorOrTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Remove a blocked-by dependency",
+        operation_description="Remove a blocked-by dependency (Mentor, Trainer)",
+        responses={204: "No Content"}
+    )
+    def delete(self, request, pk, blocked_by):
+        task = get_object_or_404(Task.objects.visible_to(request.user), pk=pk)
+        deleted, _ = TaskDependency.objects.filter(
+            task=task, blocked_by_id=blocked_by
+        ).delete()
+        if not deleted:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        invalidate_task_graphs([task.project_id])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TaskGraphAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Task dependency graph for a project",
+        operation_description="Topological order, currently unblocked tasks and the critical path to the project end date (Apprentice, Mentor, Trainer)",
+        query_serializer=TaskGraphQuerySerializer,
+    )
+    def get(self, request):
+        query = TaskGraphQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        project = get_object_or_404(Project, pk=query.validated_data["project"])
+        if not Task.objects.visible_to(request.user).filter(project=project).exists():
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        graph = load_task_graph(project.pk)
+        return Response(
+            {
+                "order": graph.topological_order(),
+                "unblocked": graph.unblocked(),
+                "critical_path": graph.critical_path(end_date=project.end_date),
+            }
+        )
+
+
+class RecurringTaskListCreateAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="List recurring tasks",
+        operation_description="List recurring task rules (Apprentice, Mentor, Trainer)",
+        responses={200: RecurringTaskSerializer(many=True)}
+    )
+    def get(self, request):
+        rules = RecurringTask.objects.visible_to(request.user)
+        paginator = KeysetPagination(ordering=("starts_on", "id"))
+        page = paginator.paginate_queryset(rules, request, view=self)
+        return paginator.get_paginated_response(
+            RecurringTaskSerializer(page, many=True).data
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Create a recurring task",
+        operation_description="Create a recurring task rule; occurrences are created as they are queried (Mentor only)",
+        request_body=RecurringTaskSerializer,
+        responses={201: RecurringTaskSerializer}
+    )
+    def post(self, request):
+        if not request.user.is_mentor:
+            return Response(status=status.HTTP_403_FORBIDDEN)
+        serializer = RecurringTaskSerializer(
+            data=request.data, context={"request": request}
+        )
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RecurringTaskDetailAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsMentorOrTrainerOrAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Delete a recurring task",
+        operation_description="Delete a recurring task rule and its pending occurrences that are not yet due; past occurrences are kept (Mentor, Trainer)",
+        responses={204: "No Content"}
+    )
+    @transaction.atomic
+    def delete(self, request, pk):
+        rule = get_object_or_404(RecurringTask.objects.visible_to(request.user), pk=pk)
+        rule.occurrences.filter(
+            status="pending", due_date__gt=datetime.date.today()
+        ).delete()
+        rule.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,167 @@
+import datetime
+import heapq
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.tasks.models import Task, TaskDependency
+
+CACHE_KEY = "tasks:graph:{}"
+# The default cache is per process: invalidation only reaches this worker,
+# so entries expire on their own to bound how stale another worker can be.
+GRAPH_TIMEOUT = 60
+
+
+class TaskGraph:
+    """Blocked-by graph of one project's tasks.
+
+    ``nodes`` maps task id to ``(status, assigned_at, due_date)`` and
+    ``blockers`` maps task id to the ids it is blocked by.
+    """
+
+    def __init__(self, nodes, edges):
+        self.nodes = nodes
+        self.blockers = defaultdict(set)
+        self.dependents = defaultdict(set)
+        for task_id, blocked_by_id in edges:
+            self.blockers[task_id].add(blocked_by_id)
+            self.dependents[blocked_by_id].add(task_id)
+
+    def find_path(self, start, target):
+        """Blocked-by chain from ``start`` to ``target`` or ``None``.
+
+        Only the upstream subgraph of ``start`` is visited, so checking a new
+        edge costs time proportional to what it could affect.
+        """
+        parents = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                return path[::-1]
+            for blocker in self.blockers.get(node, ()):
+                if blocker not in parents:
+                    parents[blocker] = node
+                    stack.append(blocker)
+        return None
+
+    def _sort_key(self, task_id):
+        return (self.nodes[task_id][2], str(task_id))
+
+    def topological_order(self):
+        """Kahn's algorithm; ties are broken by due date so output is stable."""
+        remaining = {task_id: len(self.blockers.get(task_id, ())) for task_id in self.nodes}
+        ready = [(self._sort_key(t), t) for t, count in remaining.items() if not count]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, task_id = heapq.heappop(ready)
+            order.append(task_id)
+            for dependent in self.dependents.get(task_id, ()):
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    heapq.heappush(ready, (self._sort_key(dependent), dependent))
+        return order
+
+    def unblocked(self):
+        """Open tasks whose blockers are all completed."""
+        return sorted(
+            (
+                task_id
+                for task_id, (status, _, _) in self.nodes.items()
+                if status != "completed"
+                and all(
+                    self.nodes[blocker][0] == "completed"
+                    for blocker in self.blockers.get(task_id, ())
+                )
+            ),
+            key=self._sort_key,
+        )
+
+    def duration(self, task_id):
+        status, assigned_at, due_date = self.nodes[task_id]
+        if status == "completed":
+            return 0
+        return max(1, (due_date - assigned_at).days)
+
+    def critical_path(self, today=None, end_date=None):
+        """Longest chain of remaining work, measured in planned task days."""
+        today = today or datetime.date.today()
+        finish = {}
+        previous = {}
+        for task_id in self.topological_order():
+            start = 0
+            for blocker in self.blockers.get(task_id, ()):
+                if finish[blocker] > start:
+                    start, previous[task_id] = finish[blocker], blocker
+            finish[task_id] = start + self.duration(task_id)
+
+        path = []
+        if finish:
+            node = max(finish, key=lambda task_id: (finish[task_id], self._sort_key(task_id)))
+            remaining_days = finish[node]
+            while node is not None:
+                path.append(node)
+                node = previous.get(node)
+        else:
+            remaining_days = 0
+        projected_finish = today + datetime.timedelta(days=remaining_days)
+        return {
+            "tasks": path[::-1],
+            "remaining_days": remaining_days,
+            "projected_finish": projected_finish,
+            "end_date": end_date,
+            "slack_days": (end_date - projected_finish).days if end_date else None,
+        }
+
+
+def load_task_graph(project_id):
+    """Project graph from the cache, or built with a single joined query.
+
+    Entries live ``GRAPH_TIMEOUT`` seconds, so another worker's writes show
+    up within that time.
+    """
+    key = CACHE_KEY.format(project_id)
+    graph = cache.get(key)
+    if graph is None:
+        nodes = {}
+        edges = []
+        rows = Task.objects.filter(project_id=project_id).values_list(
+            "id", "status", "assigned_at", "due_date", "dependencies__blocked_by_id"
+        )
+        for task_id, status, assigned_at, due_date, blocked_by_id in rows:
+            nodes[task_id] = (status, assigned_at, due_date)
+            if blocked_by_id is not None:
+                edges.append((task_id, blocked_by_id))
+        graph = TaskGraph(nodes, edges)
+        cache.set(key, graph, timeout=GRAPH_TIMEOUT)
+    return graph
+
+
+def find_blocking_path(project_id, start, target):
+    """``TaskGraph.find_path`` over edges read from the database.
+
+    The cached graph may be up to ``GRAPH_TIMEOUT`` seconds old in another
+    worker, and is only dropped here once the writing transaction commits.
+    Checks that must hold under the project lock read the edges instead.
+    """
+    edges = TaskDependency.objects.filter(task__project_id=project_id).values_list(
+        "task_id", "blocked_by_id"
+    )
+    return TaskGraph({}, edges).find_path(start, target)
+
+
+def invalidate_task_graphs(project_ids):
+    """Drop the cached graphs of ``project_ids`` once the transaction commits.
+
+    Deleting earlier would let a concurrent read cache the pre-commit graph
+    again before the write becomes visible.
+    """
+    keys = [CACHE_KEY.format(pk) for pk in set(project_ids) if pk]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
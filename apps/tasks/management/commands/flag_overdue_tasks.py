@@ -0,0 +1,55 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from apps.tasks.models import Task
+from apps.tasks.signals import tasks_overdue
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag open tasks whose due date has passed and clear stale flags. "
+        "Meant to be run periodically (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        today = datetime.date.today()
+        batch_size = options["batch_size"]
+
+        # Matches the task_open_due_idx partial index predicate.
+        newly_overdue = Task.objects.filter(
+            Q(is_overdue=False) & ~Q(status="completed"), due_date__lt=today
+        )
+        flagged = 0
+        while True:
+            ids = list(
+                newly_overdue.order_by("due_date").values_list("id", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                Task.objects.filter(id__in=ids).update(is_overdue=True)
+            tasks_overdue.send(sender=Task, task_ids=ids)
+            flagged += len(ids)
+
+        # Flags left behind by queryset updates that bypassed Task.save().
+        stale = Task.objects.filter(is_overdue=True).filter(
+            Q(status="completed") | Q(due_date__gte=today)
+        )
+        cleared = 0
+        while True:
+            ids = list(stale.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            cleared += Task.objects.filter(id__in=ids).update(is_overdue=False)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Flagged {flagged} overdue tasks, cleared {cleared}.")
+        )
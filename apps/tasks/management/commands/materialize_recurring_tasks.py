@@ -0,0 +1,37 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.models import RecurringTask
+from apps.tasks.services import materialize_occurrences
+
+
+class Command(BaseCommand):
+    help = (
+        "Create recurring task occurrences due within the next --days days. "
+        "Meant to run daily so the rolling window stays ahead of clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=14)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        until = datetime.date.today() + datetime.timedelta(days=options["days"])
+        batch_size = options["batch_size"]
+        created = 0
+        while True:
+            # Rules are claimed a batch at a time to keep transactions short.
+            ids = list(
+                RecurringTask.objects.needing_materialization(until)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            created += materialize_occurrences(
+                RecurringTask.objects.filter(pk__in=ids), until, batch_size
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Materialized {created} occurrences through {until}.")
+        )
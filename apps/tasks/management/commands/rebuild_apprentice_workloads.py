@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks.services import rebuild_workloads
+
+
+class Command(BaseCommand):
+    help = "Rebuild the apprentice workload rollups from scratch (run nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_workloads(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} workload rows."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks.services import rebuild_cycle_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the task lead/cycle time totals from the status transition log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_cycle_stats(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} cycle stats rows."))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_projectmembership'),
+        ('tasks', '0004_task_task_assignee_status_due_idx_and_more'),
+        ('user', '0003_remove_apprentice_project_remove_mentor_project_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='is_overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_overdue', False), models.Q(('status', 'completed'), _negated=True)), fields=['due_date'], name='task_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_overdue', True)), fields=['due_date', 'id'], name='task_overdue_due_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_projectmembership'),
+        ('tasks', '0005_task_is_overdue_task_task_open_due_idx_and_more'),
+        ('user', '0003_remove_apprentice_project_remove_mentor_project_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCycleStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('lead_time_seconds', models.BigIntegerField(default=0)),
+                ('cycle_count', models.PositiveIntegerField(default=0)),
+                ('cycle_time_seconds', models.BigIntegerField(default=0)),
+                ('apprentice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_cycle_stats', to='user.apprentice')),
+                ('mentor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_cycle_stats', to='user.mentor')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_cycle_stats', to='projects.project')),
+            ],
+            options={
+                'unique_together': {('project', 'mentor', 'apprentice')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed')], max_length=20)),
+                ('changed_at', models.DateTimeField()),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='tasks.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'changed_at'], name='transition_task_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_projectmembership'),
+        ('tasks', '0006_taskcyclestats_taskstatustransition'),
+        ('user', '0003_remove_apprentice_project_remove_mentor_project_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApprenticeWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pending_count', models.IntegerField(default=0)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('open_count', models.IntegerField(default=0)),
+                ('apprentice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workloads', to='user.apprentice')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workloads', to='projects.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'open_count', 'id'], name='workload_project_open_idx'), models.Index(fields=['open_count', 'id'], name='workload_open_idx')],
+                'unique_together': {('apprentice', 'project')},
+            },
+        ),
+    ]
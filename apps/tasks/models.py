@@ -1,8 +1,28 @@
+from calendar import monthrange
 from django.db import models
+import datetime
 import uuid
 
 
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Tasks a user may see: all for trainers, own for mentors/apprentices."""
+        if user.is_trainer or user.is_staff:
+            return self
+        if user.is_mentor:
+            return self.filter(assigned_by_id=user.pk)
+        if user.is_apprentice:
+            return self.filter(assigned_to_id=user.pk)
+        return self.none()
+
+
 class Task(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("in_progress", "In Progress"),
+        ("completed", "Completed"),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=255)
     description = models.TextField()
@@ -22,17 +42,272 @@ class Task(models.Model):
     updated_at = models.DateField(auto_now=True)
     status = models.CharField(
         max_length=20,
-        choices=[
-            ("pending", "Pending"),
-            ("in_progress", "In Progress"),
-            ("completed", "Completed"),
-        ],
+        choices=STATUS_CHOICES,
         default="pending",
     )
+    is_overdue = models.BooleanField(default=False)
+    recurrence = models.ForeignKey(
+        "tasks.RecurringTask",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="occurrences",
+    )
+
+    objects = TaskQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
+    DERIVED_FIELDS = ("is_overdue", "completed_at")
+
+    def sync_derived_fields(self, today=None):
+        """Recompute fields derived from status and due date."""
+        today = today or datetime.date.today()
+        self.is_overdue = self.status != "completed" and self.due_date < today
+        if self.status != "completed":
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = today
+
+    def save(self, *args, **kwargs):
+        self.sync_derived_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"status", "due_date"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, *self.DERIVED_FIELDS}
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
+        indexes = [
+            models.Index(
+                fields=["assigned_to", "status", "due_date"],
+                name="task_assignee_status_due_idx",
+            ),
+            models.Index(fields=["project", "status"], name="task_project_status_idx"),
+            models.Index(fields=["due_date", "id"], name="task_due_id_idx"),
+            # Only open, not-yet-flagged tasks: what the overdue sweeper scans.
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(is_overdue=False) & ~models.Q(status="completed"),
+                name="task_open_due_idx",
+            ),
+            models.Index(
+                fields=["due_date", "id"],
+                condition=models.Q(is_overdue=True),
+                name="task_overdue_due_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recurrence", "due_date"],
+                condition=models.Q(recurrence__isnull=False),
+                name="task_unique_occurrence",
+            ),
+        ]
+
+
+class TaskStatusTransition(models.Model):
+    """Append-only log of status changes; ``from_status`` is blank on creation."""
+
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="status_transitions"
+    )
+    from_status = models.CharField(
+        max_length=20, choices=Task.STATUS_CHOICES, blank=True
+    )
+    to_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.task_id}: {self.from_status or '-'} -> {self.to_status}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "changed_at"], name="transition_task_time_idx"),
+        ]
+
+
+class TaskCycleStatsQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        if user.is_trainer or user.is_staff:
+            return self
+        if user.is_mentor:
+            return self.filter(mentor_id=user.pk)
+        if user.is_apprentice:
+            return self.filter(apprentice_id=user.pk)
+        return self.none()
+
+
+class TaskCycleStats(models.Model):
+    """Running lead/cycle time totals, updated as tasks are first completed.
+
+    Lead time runs from creation to completion, cycle time from the first
+    move to in_progress to completion. Totals are kept in seconds so
+    averages for any grouping are a ``SUM`` over this small table.
+    """
+
+    project = models.ForeignKey(
+        "projects.Project", on_delete=models.CASCADE, related_name="task_cycle_stats"
+    )
+    mentor = models.ForeignKey(
+        "user.Mentor", on_delete=models.CASCADE, related_name="task_cycle_stats"
+    )
+    apprentice = models.ForeignKey(
+        "user.Apprentice", on_delete=models.CASCADE, related_name="task_cycle_stats"
+    )
+    completed_count = models.PositiveIntegerField(default=0)
+    lead_time_seconds = models.BigIntegerField(default=0)
+    cycle_count = models.PositiveIntegerField(default=0)
+    cycle_time_seconds = models.BigIntegerField(default=0)
+
+    objects = TaskCycleStatsQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ["project", "mentor", "apprentice"]
+
+
+class ApprenticeWorkload(models.Model):
+    """Per-apprentice, per-project task counts kept in step with task writes."""
+
+    apprentice = models.ForeignKey(
+        "user.Apprentice", on_delete=models.CASCADE, related_name="workloads"
+    )
+    project = models.ForeignKey(
+        "projects.Project", on_delete=models.CASCADE, related_name="workloads"
+    )
+    pending_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    open_count = models.IntegerField(default=0)
+
+    @property
+    def completion_rate(self):
+        total = self.open_count + self.completed_count
+        return round(self.completed_count / total, 4) if total else None
+
+    class Meta:
+        unique_together = ["apprentice", "project"]
+        indexes = [
+            models.Index(
+                fields=["project", "open_count", "id"],
+                name="workload_project_open_idx",
+            ),
+            models.Index(fields=["open_count", "id"], name="workload_open_idx"),
+        ]
+
+
+class TaskDependency(models.Model):
+    """``task`` cannot start until ``blocked_by`` is completed."""
+
+    task = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="dependencies"
+    )
+    blocked_by = models.ForeignKey(
+        Task, on_delete=models.CASCADE, related_name="dependents"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.task_id} blocked by {self.blocked_by_id}"
+
+    class Meta:
+        unique_together = ["task", "blocked_by"]
+
+
+class RecurringTaskQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        if user.is_trainer or user.is_staff:
+            return self
+        if user.is_mentor:
+            return self.filter(assigned_by_id=user.pk)
+        if user.is_apprentice:
+            return self.filter(assigned_to_id=user.pk)
+        return self.none()
+
+    def needing_materialization(self, until):
+        return self.filter(starts_on__lte=until).filter(
+            models.Q(materialized_until__isnull=True)
+            | models.Q(materialized_until__lt=until)
+        )
+
+
+class RecurringTask(models.Model):
+    """Template that yields one Task per occurrence, created on demand.
+
+    Occurrences up to ``materialized_until`` exist as Task rows; later ones
+    are only generated when a client asks for that window or the rolling
+    materialization job reaches it.
+    """
+
+    FREQUENCY_CHOICES = [
+        ("daily", "Daily"),
+        ("weekly", "Weekly"),
+        ("monthly", "Monthly"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    assigned_by = models.ForeignKey(
+        "user.Mentor", on_delete=models.CASCADE, related_name="recurring_tasks"
+    )
+    assigned_to = models.ForeignKey(
+        "user.Apprentice", on_delete=models.CASCADE, related_name="recurring_tasks"
+    )
+    project = models.ForeignKey(
+        "projects.Project", on_delete=models.CASCADE, related_name="recurring_tasks"
+    )
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)
+    interval = models.PositiveSmallIntegerField(default=1)
+    starts_on = models.DateField()
+    ends_on = models.DateField(null=True, blank=True)
+    materialized_until = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = RecurringTaskQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.title} ({self.frequency})"
+
+    def occurrence_dates(self, start, end):
+        """Due dates of occurrences falling in ``[start, end]``."""
+        start = max(start, self.starts_on)
+        if self.ends_on:
+            end = min(end, self.ends_on)
+        if start > end:
+            return []
+        if self.frequency == "monthly":
+            dates = []
+            step = 0
+            while True:
+                due = _add_months(self.starts_on, step * self.interval)
+                if due > end:
+                    return dates
+                if due >= start:
+                    dates.append(due)
+                step += 1
+        days = self.interval * (7 if self.frequency == "weekly" else 1)
+        # Jump straight to the first occurrence on or after ``start``.
+        skipped = -(-(start - self.starts_on).days // days)
+        due = self.starts_on + datetime.timedelta(days=skipped * days)
+        dates = []
+        while due <= end:
+            dates.append(due)
+            due += datetime.timedelta(days=days)
+        return dates
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["materialized_until"], name="recurring_materialized_idx"
+            ),
+        ]
+
+
+def _add_months(date, months):
+    month_index = date.month - 1 + months
+    year, month = date.year + month_index // 12, month_index % 12 + 1
+    day = min(date.day, monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
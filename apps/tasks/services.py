@@ -0,0 +1,323 @@
+import datetime
+from collections import Counter, defaultdict
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from apps.tasks.graph import invalidate_task_graphs
+from apps.tasks.models import (
+    ApprenticeWorkload,
+    RecurringTask,
+    Task,
+    TaskCycleStats,
+    TaskStatusTransition,
+)
+
+WORKLOAD_COLUMNS = {
+    "pending": "pending_count",
+    "in_progress": "in_progress_count",
+    "completed": "completed_count",
+}
+
+
+def create_tasks(tasks, batch_size=500):
+    """Insert many tasks in one transaction.
+
+    ``bulk_create`` skips model signals, so anything hooked to task writes
+    must also be applied here.
+    """
+    for task in tasks:
+        task.sync_derived_fields()
+    with transaction.atomic():
+        created = Task.objects.bulk_create(tasks, batch_size=batch_size)
+        record_status_changes([(task, None) for task in created])
+        apply_workload_changes([(None, workload_state(task)) for task in created])
+    invalidate_task_graphs(task.project_id for task in created)
+    return created
+
+
+def update_tasks(tasks, fields, batch_size=500):
+    """Write ``fields`` of already-modified tasks with one ``bulk_update``.
+
+    The ``bulk_update`` counterpart of ``Task.save()``: derived fields,
+    the status log and workload rollups are updated in the same transaction.
+    Tasks must have been loaded from the database so their previous state
+    is known.
+    """
+    today = datetime.date.today()
+    changes = []
+    for task in tasks:
+        task.sync_derived_fields(today)
+        task.updated_at = today
+        changes.append((task._loaded_state, workload_state(task)))
+    with transaction.atomic():
+        Task.objects.bulk_update(
+            tasks,
+            [*fields, *Task.DERIVED_FIELDS, "updated_at"],
+            batch_size=batch_size,
+        )
+        record_status_changes(
+            [(task, before[2]) for task, (before, _) in zip(tasks, changes)]
+        )
+        apply_workload_changes(changes)
+    for task, (_, after) in zip(tasks, changes):
+        task._loaded_state = after
+    invalidate_task_graphs(
+        state[1] for change in changes for state in change if state is not None
+    )
+    return tasks
+
+
+def materialize_occurrences(rules, until, batch_size=500):
+    """Create the Task rows of ``rules`` due on or before ``until``.
+
+    Only rules not yet materialized that far are touched; each rule's
+    ``materialized_until`` marks how far it has been expanded, so repeated
+    calls for the same window are a single indexed lookup.
+    """
+    with transaction.atomic():
+        pending = list(
+            rules.needing_materialization(until).select_for_update().order_by("pk")
+        )
+        if not pending:
+            return 0
+        tasks = []
+        for rule in pending:
+            start = (
+                rule.materialized_until + datetime.timedelta(days=1)
+                if rule.materialized_until
+                else rule.starts_on
+            )
+            tasks.extend(
+                Task(
+                    title=rule.title,
+                    description=rule.description,
+                    assigned_by_id=rule.assigned_by_id,
+                    assigned_to_id=rule.assigned_to_id,
+                    project_id=rule.project_id,
+                    due_date=due_date,
+                    recurrence=rule,
+                )
+                for due_date in rule.occurrence_dates(start, until)
+            )
+            rule.materialized_until = until
+        create_tasks(tasks, batch_size=batch_size)
+        RecurringTask.objects.bulk_update(
+            pending, ["materialized_until"], batch_size=batch_size
+        )
+    return len(tasks)
+
+
+def record_status_changes(changes, moment=None):
+    """Log status transitions and fold first completions into TaskCycleStats.
+
+    ``changes`` is an iterable of ``(task, previous_status)`` pairs, with
+    ``previous_status`` ``None`` for newly created tasks.
+    """
+    moment = moment or timezone.now()
+    changes = [(task, previous) for task, previous in changes if previous != task.status]
+    if not changes:
+        return
+    completed = [task for task, _ in changes if task.status == "completed"]
+    with transaction.atomic():
+        history = defaultdict(list)
+        if completed:
+            rows = TaskStatusTransition.objects.filter(
+                task_id__in=[task.pk for task in completed]
+            ).values_list("task_id", "from_status", "to_status", "changed_at")
+            for task_id, from_status, to_status, changed_at in rows:
+                history[task_id].append((from_status, to_status, changed_at))
+        TaskStatusTransition.objects.bulk_create(
+            [
+                TaskStatusTransition(
+                    task_id=task.pk,
+                    from_status=previous or "",
+                    to_status=task.status,
+                    changed_at=moment,
+                )
+                for task, previous in changes
+            ]
+        )
+        _add_cycle_times(completed, history, moment)
+
+
+def _add_cycle_times(completed, history, moment):
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    for task in completed:
+        transitions = sorted(history[task.pk], key=lambda row: row[2])
+        if any(to_status == "completed" for _, to_status, _ in transitions):
+            continue  # only the first completion counts
+        _fold_cycle_time(
+            totals[(task.project_id, task.assigned_by_id, task.assigned_to_id)],
+            transitions,
+            task.created_at or moment.date(),
+            moment,
+        )
+
+    if not totals:
+        return
+    TaskCycleStats.objects.bulk_create(
+        [
+            TaskCycleStats(project_id=project, mentor_id=mentor, apprentice_id=apprentice)
+            for project, mentor, apprentice in totals
+        ],
+        ignore_conflicts=True,
+    )
+    for (project, mentor, apprentice), (count, lead, cycles, cycle) in totals.items():
+        TaskCycleStats.objects.filter(
+            project_id=project, mentor_id=mentor, apprentice_id=apprentice
+        ).update(
+            completed_count=F("completed_count") + count,
+            lead_time_seconds=F("lead_time_seconds") + lead,
+            cycle_count=F("cycle_count") + cycles,
+            cycle_time_seconds=F("cycle_time_seconds") + cycle,
+        )
+
+
+def _fold_cycle_time(total, transitions, created_on, moment):
+    """Add a task first completed at ``moment`` to a running total.
+
+    ``total`` is ``[count, lead, cycles, cycle]``; ``transitions`` are the
+    task's earlier ones, oldest first.
+    """
+    # Tasks created before the log existed fall back to their creation day.
+    created_at = next(
+        (at for from_status, _, at in transitions if not from_status),
+        None,
+    ) or _start_of(created_on)
+    started_at = next(
+        (at for _, to_status, at in transitions if to_status == "in_progress"), None
+    )
+    total[0] += 1
+    total[1] += int((moment - created_at).total_seconds())
+    if started_at is not None:
+        total[2] += 1
+        total[3] += int((moment - started_at).total_seconds())
+
+
+def rebuild_cycle_stats(batch_size=1000):
+    """Recompute TaskCycleStats from the status transition log.
+
+    Totals are keyed by each task's current project, mentor and apprentice.
+    """
+    rows = TaskStatusTransition.objects.order_by(
+        "task_id", "changed_at", "id"
+    ).values_list(
+        "task_id",
+        "task__project_id",
+        "task__assigned_by_id",
+        "task__assigned_to_id",
+        "task__created_at",
+        "from_status",
+        "to_status",
+        "changed_at",
+    )
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    by_task = groupby(rows.iterator(chunk_size=batch_size), key=lambda row: row[0])
+    for _, task_rows in by_task:
+        transitions = []
+        for row in task_rows:
+            _, project, mentor, apprentice, created_on, from_status, to_status, at = row
+            if to_status == "completed":
+                _fold_cycle_time(
+                    totals[(project, mentor, apprentice)], transitions, created_on, at
+                )
+                break
+            transitions.append((from_status, to_status, at))
+    stats = [
+        TaskCycleStats(
+            project_id=project,
+            mentor_id=mentor,
+            apprentice_id=apprentice,
+            completed_count=done,
+            lead_time_seconds=lead,
+            cycle_count=cycles,
+            cycle_time_seconds=cycle,
+        )
+        for (project, mentor, apprentice), (done, lead, cycles, cycle) in totals.items()
+    ]
+    with transaction.atomic():
+        TaskCycleStats.objects.all().delete()
+        TaskCycleStats.objects.bulk_create(stats, batch_size=batch_size)
+    return len(stats)
+
+
+def _start_of(date):
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def workload_state(task):
+    return (task.assigned_to_id, task.project_id, task.status)
+
+
+def apply_workload_changes(changes):
+    """Move counts in ApprenticeWorkload for ``(before, after)`` task states.
+
+    Each state is ``(apprentice_id, project_id, status)`` or ``None`` for a
+    task that did not exist before / no longer exists after the change.
+    Call inside the transaction that writes the tasks. Rows are only created
+    for pairs that gain a task; a pair that only loses tasks already has its
+    row, or is being deleted along with its apprentice or project.
+    """
+    deltas = defaultdict(Counter)
+    for before, after in changes:
+        if before == after:
+            continue
+        if before is not None:
+            deltas[before[:2]][before[2]] -= 1
+        if after is not None:
+            deltas[after[:2]][after[2]] += 1
+    deltas = {key: counts for key, counts in deltas.items() if any(counts.values())}
+    if not deltas:
+        return
+    with transaction.atomic():
+        ApprenticeWorkload.objects.bulk_create(
+            [
+                ApprenticeWorkload(apprentice_id=apprentice, project_id=project)
+                for (apprentice, project), counts in deltas.items()
+                if any(count > 0 for count in counts.values())
+            ],
+            ignore_conflicts=True,
+        )
+        for (apprentice, project), counts in deltas.items():
+            updates = {
+                column: F(column) + counts[status]
+                for status, column in WORKLOAD_COLUMNS.items()
+                if counts[status]
+            }
+            open_delta = counts["pending"] + counts["in_progress"]
+            if open_delta:
+                updates["open_count"] = F("open_count") + open_delta
+            ApprenticeWorkload.objects.filter(
+                apprentice_id=apprentice, project_id=project
+            ).update(**updates)
+
+
+def rebuild_workloads(batch_size=1000):
+    """Recompute ApprenticeWorkload from the task table."""
+    rows = (
+        Task.objects.values("assigned_to_id", "project_id")
+        .annotate(
+            pending=Count("id", filter=Q(status="pending")),
+            in_progress=Count("id", filter=Q(status="in_progress")),
+            completed=Count("id", filter=Q(status="completed")),
+        )
+        .order_by()
+    )
+    workloads = [
+        ApprenticeWorkload(
+            apprentice_id=row["assigned_to_id"],
+            project_id=row["project_id"],
+            pending_count=row["pending"],
+            in_progress_count=row["in_progress"],
+            completed_count=row["completed"],
+            open_count=row["pending"] + row["in_progress"],
+        )
+        for row in rows.iterator()
+    ]
+    with transaction.atomic():
+        ApprenticeWorkload.objects.all().delete()
+        ApprenticeWorkload.objects.bulk_create(workloads, batch_size=batch_size)
+    return len(workloads)
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from apps.tasks.graph import invalidate_task_graphs
+from apps.tasks.models import Task
+from apps.tasks.services import (
+    apply_workload_changes,
+    record_status_changes,
+    workload_state,
+)
+
+# Sent by the overdue sweeper after each batch, with ``task_ids``.
+tasks_overdue = Signal()
+
+
+@receiver(post_init, sender=Task)
+def remember_loaded_state(sender, instance, **kwargs):
+    # Read __dict__ directly so deferred fields are not fetched one by one.
+    loaded = instance.__dict__
+    instance._loaded_state = (
+        loaded.get("assigned_to_id"),
+        loaded.get("project_id"),
+        loaded.get("status"),
+    )
+
+
+@receiver(post_save, sender=Task)
+def track_task_save(sender, instance, created, **kwargs):
+    before = None if created else instance._loaded_state
+    after = workload_state(instance)
+    record_status_changes([(instance, before[2] if before else None)])
+    apply_workload_changes([(before, after)])
+    invalidate_task_graphs([before[1] if before else None, after[1]])
+    instance._loaded_state = after
+
+
+@receiver(post_delete, sender=Task)
+def track_task_delete(sender, instance, **kwargs):
+    apply_workload_changes([(instance._loaded_state, None)])
+    invalidate_task_graphs([instance._loaded_state[1]])
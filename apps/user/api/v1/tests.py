@@ -5,6 +5,8 @@ from apps.user.models import User, Apprentice, Mentor, Trainer
 import uuid
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.core.testing import constant_queries
+
 
 class UsersTests(TestCase):
     def setUp(self):
@@ -166,3 +168,31 @@ class UsersTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("access", response.data)
         self.assertIn("refresh", response.data)
+
+
+class ApprenticeListQueryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.trainer_user = User.objects.create_user(
+            email="list-trainer@example.com",
+            first_name="Trainer",
+            last_name="User",
+            is_trainer=True,
+        )
+        self.trainer = Trainer.objects.create(user=self.trainer_user)
+        self.client.force_authenticate(self.trainer_user)
+
+    def create_apprentices(self, count):
+        for _ in range(count):
+            user = User.objects.create_user(
+                email=f"apprentice-{uuid.uuid4().hex}@example.com",
+                first_name="Apprentice",
+                last_name="User",
+                is_apprentice=True,
+            )
+            Apprentice.objects.create(user=user, trainer=self.trainer)
+
+    @constant_queries(seed="create_apprentices")
+    def test_list_apprentices_is_constant(self):
+        response = self.client.get("/api/v1/user/apprentices/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
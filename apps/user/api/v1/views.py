@@ -37,7 +37,7 @@ class ApprenticeListCreateAPIView(APIView):
         },
     )
     def get(self, request):
-        apprentices = Apprentice.objects.all()
+        apprentices = Apprentice.objects.select_related("user")
         serializer = ApprenticeReadSerializer(apprentices, many=True)
         return Response(serializer.data)
 
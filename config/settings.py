@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     "drf_yasg",
     "corsheaders",
     # local apps
+    "apps.core",
     "apps.user",
     "apps.projects",
     "apps.tasks",
@@ -53,6 +54,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so latency covers the rest of the stack
+    "apps.core.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -156,3 +159,6 @@ SWAGGER_SETTINGS = {
         "jwt": {"type": "apiKey", "name": "Authorization", "in": "header"}
     }
 }
+
+# Clients allowed to scrape /metrics without a staff session
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
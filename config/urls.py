@@ -3,6 +3,8 @@ from django.urls import include, path
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from apps.core.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/user/", include("apps.user.api.v1.urls"), name="v1"),
@@ -10,6 +12,7 @@ urlpatterns = [
     path("api/v1/requests/", include("apps.request.api.v1.urls"), name="v1"),
     path("api/v1/projects/", include("apps.projects.api.v1.urls"), name="v1"),
     path("api/v1/feedback/", include("apps.feedback.api.v1.urls"), name="v1"),
+    path("api/v1/rotation/", include("apps.rotation.api.v1.urls"), name="v1"),
 ]
 
 schema_view = get_schema_view(
@@ -22,8 +25,9 @@ schema_view = get_schema_view(
     patterns=urlpatterns,  # ← safest: lock it to these patterns
 )
 
-# finally expose the docs
+# finally expose the docs and metrics (kept out of the schema)
 urlpatterns += [
+    path("metrics", metrics_view, name="metrics"),
     path(
         "swagger/",
         schema_view.with_ui("swagger", cache_timeout=0),